@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+여러 사용자 나이틀리 워크플로우
+
+nightly_flow.py는 프로세스 하나가 .env의 사용자 한 명을 처리한다.
+여기서는 명단(roster)의 사용자 전원을 한 프로세스에서 동시에 돌린다.
+
+    - 사용자마다 스레드 하나 (NIGHTLY_MAX_WORKERS개까지), 대부분 답장을 기다리는 시간
+    - 토큰/캘린더 ID/스냅샷/Focus Block 기록은 사용자별 컨텍스트로 분리
+      (user_context.py, 상태 파일은 ~/.daily-focus/users/{id}/)
+    - 답장 대기는 ChatMultiplexer 하나가 모든 채팅을 함께 처리
+    - HTTP는 lark_client의 공용 세션/요청 속도 제한을 그대로 공유
+    - 한 사용자가 실패해도 나머지는 계속 진행, 끝나면 사용자별 결과 요약
+
+날짜 계산(내일 근무일, 빈 시간)은 프로세스 로컬 시간대를 쓰므로, 시간대가 다른
+사용자는 시간대별로 TZ를 지정한 하위 프로세스에서 돌린다. 하위 프로세스는
+callback 수신 포트가 겹치지 않도록 폴링으로 답장을 기다린다.
+
+명단 형식 (JSON):
+    {"users": [
+        {"id": "alice", "chat_id": "oc_xxx", "open_id": "ou_xxx",
+         "refresh_token_env": "ALICE_LARK_REFRESH_TOKEN", "timezone": "Asia/Seoul"},
+        {"id": "bob", "chat_id": "oc_yyy", "open_id": "ou_yyy",
+         "refresh_token": "...", "timezone": "America/Los_Angeles"}
+    ]}
+    open_id와 refresh_token(_env)은 필수 (없는 항목은 실행하지 않음).
+    refresh_token은 저장된 토큰이 없을 때만 쓰이고, 갱신된 토큰은 사용자 상태 디렉토리에 저장된다.
+    env 키로 그 사용자에게만 적용할 환경변수를 더 줄 수 있다.
+
+사용법:
+    python3 multi_user_flow.py --roster users.json
+    python3 multi_user_flow.py --roster users.json --workers 64
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# 스크립트 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+# .env 파일 로드 (앱 ID/시크릿 등 공용 설정)
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent / ".env")
+
+from nightly_flow import run_nightly
+from lark_chat_multiplexer import ChatMultiplexer
+from user_context import UserContext, PrefixedStdout, use
+
+# 동시에 처리하는 사용자 수 (스레드는 대부분 답장 대기, HTTP는 lark_client가 따로 제한)
+MAX_WORKERS = int(os.getenv("NIGHTLY_MAX_WORKERS", "256"))
+
+
+def _refresh_token(entry: dict):
+    """명단 항목의 refresh token (refresh_token 또는 refresh_token_env 환경변수)"""
+    refresh_token = entry.get("refresh_token")
+    if not refresh_token and entry.get("refresh_token_env"):
+        refresh_token = os.getenv(entry["refresh_token_env"])
+    return refresh_token
+
+
+def load_roster(path: Path) -> list:
+    """명단 파일 읽기
+
+    id/chat_id가 없는 항목, open_id나 refresh token이 없는 항목은 건너뜀
+    (사용자 설정이 비면 .env의 다른 사람 토큰/캘린더를 쓰게 되므로 실행하지 않음).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        users = json.load(f).get("users", [])
+
+    valid = []
+    for entry in users:
+        if not entry.get("id") or not entry.get("chat_id"):
+            print(f"⚠️ id/chat_id가 없는 명단 항목 건너뜀: {entry}")
+            continue
+        if not entry.get("open_id") or not _refresh_token(entry):
+            print(f"❌ [{entry['id']}] open_id 또는 refresh token이 없어 건너뜀")
+            continue
+        valid.append(entry)
+    return valid
+
+
+def _utc_offset(timezone: str = None):
+    """시간대의 현재 UTC 오프셋 (None이면 이 프로세스의 로컬 시간대)"""
+    if timezone is None:
+        return datetime.now().astimezone().utcoffset()
+    from zoneinfo import ZoneInfo
+    return datetime.now(ZoneInfo(timezone)).utcoffset()
+
+
+def split_by_timezone(entries: list):
+    """이 프로세스에서 돌릴 사용자와 시간대별로 하위 프로세스에서 돌릴 사용자 분리
+
+    Returns:
+        (local, {timezone: [entry, ...]}, invalid)
+    """
+    local_offset = _utc_offset()
+    local, remote, invalid = [], {}, []
+    for entry in entries:
+        timezone = entry.get("timezone")
+        if not timezone:
+            local.append(entry)
+            continue
+        try:
+            offset = _utc_offset(timezone)
+        except Exception as e:
+            print(f"❌ [{entry['id']}] 알 수 없는 시간대 {timezone}: {e}")
+            invalid.append(entry["id"])
+            continue
+        if offset == local_offset:
+            local.append(entry)
+        else:
+            remote.setdefault(timezone, []).append(entry)
+    return local, remote, invalid
+
+
+def build_context(entry: dict, waiter) -> UserContext:
+    """명단 항목 → 사용자 컨텍스트"""
+    env = dict(entry.get("env", {}))
+    env.update({
+        "LARK_CHAT_ID": entry["chat_id"],
+        "LARK_USER_OPEN_ID": entry.get("open_id"),
+        "LARK_REFRESH_TOKEN": _refresh_token(entry),
+    })
+    return UserContext(entry["id"], env, entry.get("state_dir"), waiter=waiter)
+
+
+def run_user(user: UserContext) -> bool:
+    """사용자 한 명의 나이틀리 실행 (예외는 그 사용자 실패로만 처리)"""
+    with use(user):
+        try:
+            run_nightly()
+            return True
+        except Exception as e:
+            print(f"❌ 나이틀리 실행 실패: {e}")
+            return False
+
+
+def run_users(entries: list, workers: int = MAX_WORKERS) -> dict:
+    """사용자들을 스레드 풀에서 동시에 실행
+
+    Returns:
+        dict: {user_id: 성공 여부}
+    """
+    if not entries:
+        return {}
+
+    waiter = ChatMultiplexer()
+    waiter.start_background()
+    users = [build_context(entry, waiter) for entry in entries]
+
+    stdout = sys.stdout
+    sys.stdout = PrefixedStdout(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(users)))) as executor:
+            results = dict(zip((u.user_id for u in users), executor.map(run_user, users)))
+    finally:
+        sys.stdout = stdout
+        waiter.stop_background()
+    return results
+
+
+def _start_timezone_group(roster: Path, timezone: str, workers: int) -> subprocess.Popen:
+    """시간대가 다른 사용자 묶음을 TZ를 지정한 하위 프로세스로 실행"""
+    env = dict(os.environ, TZ=timezone)
+    if env.get("LARK_LISTENER_MODE", "poll").lower() == "callback":
+        env["LARK_LISTENER_MODE"] = "poll"
+    command = [sys.executable, str(Path(__file__).resolve()),
+               "--roster", str(roster), "--only-timezone", timezone, "--workers", str(workers)]
+    return subprocess.Popen(command, env=env)
+
+
+def print_summary(results: dict, groups: dict) -> None:
+    """사용자별 결과 요약"""
+    print("\n" + "=" * 60)
+    print("📊 사용자별 결과")
+    print("=" * 60)
+    for user_id, ok in sorted(results.items()):
+        print(f"{'✅' if ok else '❌'} {user_id}")
+    for timezone, (user_ids, ok) in sorted(groups.items()):
+        print(f"{'✅' if ok else '❌'} [{timezone}] {', '.join(user_ids)}")
+
+    failed = [user_id for user_id, ok in results.items() if not ok]
+    failed += [user_id for user_ids, ok in groups.values() if not ok for user_id in user_ids]
+    total = len(results) + sum(len(user_ids) for user_ids, _ in groups.values())
+    print(f"\n완료 {total - len(failed)}/{total}명" + (f" (실패: {', '.join(failed)})" if failed else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 사용자 나이틀리 워크플로우")
+    parser.add_argument("--roster", type=Path, required=True, help="사용자 명단 JSON")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"동시에 처리할 사용자 수 (기본: NIGHTLY_MAX_WORKERS={MAX_WORKERS})")
+    parser.add_argument("--only-timezone", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        entries = load_roster(args.roster)
+    except (OSError, ValueError) as e:
+        print(f"❌ 명단 읽기 실패: {e}")
+        sys.exit(1)
+
+    if args.only_timezone:
+        # 하위 프로세스: TZ가 이미 그 시간대이므로 전부 여기서 실행
+        entries = [e for e in entries if e.get("timezone") == args.only_timezone]
+        results = run_users(entries, args.workers)
+        sys.exit(0 if all(results.values()) else 1)
+
+    print("=" * 60)
+    print(f"🌙 여러 사용자 나이틀리 워크플로우 시작 ({len(entries)}명)")
+    print("=" * 60)
+
+    local, remote, invalid = split_by_timezone(entries)
+    processes = {tz: _start_timezone_group(args.roster, tz, args.workers) for tz in remote}
+
+    results = run_users(local, args.workers)
+    results.update({user_id: False for user_id in invalid})
+
+    groups = {}
+    for timezone, process in processes.items():
+        user_ids = [entry["id"] for entry in remote[timezone]]
+        groups[timezone] = (user_ids, process.wait() == 0)
+
+    print_summary(results, groups)
+    ok = all(results.values()) and all(ok for _, ok in groups.values())
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,17 +18,27 @@ from pathlib import Path
 # 스크립트 디렉토리 추가
 sys.path.insert(0, str(Path(__file__).parent / "scripts"))
 
-from lark_im import send_message
+from lark_im import send_message, chat_id_configured
 from lark_event_listener import start_listener, wait_for_message, clear_queue
 from scope_analyzer import analyze_scope
 from lark_calendar import (
-    find_free_slots_for_date, create_focus_block,
+    find_free_slots_for_days, reconcile_focus_blocks,
     list_events_for_date, get_next_workday
 )
+from availability import NIGHTLY_POLICY, IgnoreIntervals
+from focus_block_store import busy_intervals
+from busy_source import default_busy_source
+from focus_planner import plan_spillover
+from user_context import getenv, state_path
 # .env 파일 로드
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent / ".env")
 
+# 내일 빈 시간이 부족하면 이어서 배치할 근무일 수 (내일 포함, 기본 1 = 내일만)
+SPILLOVER_DAYS = int(os.getenv("FOCUS_SPILLOVER_DAYS", "1"))
+# 하루에 배치할 Focus Block 최대 시간 (기본: 제한 없음)
+DAILY_CAP_HOURS = float(os.getenv("FOCUS_DAILY_CAP_HOURS") or 0) or None
+
 
 def check_lark_token():
     """Lark 토큰 유효성 체크 (캘린더용)"""
@@ -52,7 +62,7 @@ python3 ~/dev/my-first-skill/daily-focus/scripts/lark_oauth.py
             return False
     except Exception as e:
         print(f"⚠️ 토큰 체크 중 오류: {e}")
-        token = os.getenv("LARK_USER_TOKEN")
+        token = getenv("LARK_USER_TOKEN")
         if token:
             print("⚠️ 토큰 매니저 오류, 환경변수 토큰으로 진행")
             return True
@@ -80,7 +90,7 @@ def run_reflection():
     send_message(reflection_message)
     print("✅ 회고 질문 발송 완료")
 
-    # 사용자 응답 대기 (그룹 채팅 폴링)
+    # 사용자 응답 대기 (그룹 채팅)
     user_response = wait_for_message(timeout_minutes=15)
 
     if not user_response:
@@ -116,7 +126,7 @@ def run_tomorrow_focus(target_date):
     send_message(focus_message)
     print("✅ Focus 질문 발송 완료")
 
-    # 사용자 응답 대기 (그룹 채팅 폴링)
+    # 사용자 응답 대기 (그룹 채팅)
     user_response = wait_for_message(timeout_minutes=15)
 
     if not user_response:
@@ -169,11 +179,23 @@ def run_tomorrow_focus(target_date):
 
     send_message(analysis_message)
 
-    # 내일 캘린더 빈 시간 찾기
-    print("\n🔍 내일 캘린더 빈 시간 찾기...")
-    free_slots = find_free_slots_for_date(target_date, needed_minutes)
+    # 내일부터 SPILLOVER_DAYS 근무일의 빈 시간을 한 번에 찾기
+    plan_days = [target_date]
+    while len(plan_days) < SPILLOVER_DAYS:
+        plan_days.append(get_next_workday(plan_days[-1]))
+
+    # 같은 밤을 다시 실행하면 지난번에 만든 이 계획의 블록은 바쁜 시간에서 빼고 다시 계획
+    plan_key = target_date.strftime("%Y-%m-%d")
+    policy = NIGHTLY_POLICY.with_ignore_rules(IgnoreIntervals(busy_intervals(plan_key)))
+
+    print(f"\n🔍 캘린더 빈 시간 찾기 (내일부터 근무일 {len(plan_days)}일)...")
+    # 무시 규칙(내 블록, 8시간 이상, free 등)은 일정 단위라 일정을 구분할 수 있는 소스를 쓴다
+    slots_by_date = find_free_slots_for_days(plan_days, policy=policy,
+                                             source=default_busy_source(policy))
+    slots_by_day = [(day, slots_by_date.get(day.strftime("%Y-%m-%d"), [])) for day in plan_days]
+    free_slot_count = sum(len(slots) for _, slots in slots_by_day)
 
-    if not free_slots:
+    if not free_slot_count:
         message = f"""😔 내일({day_name}요일) 캘린더에 빈 시간이 부족해요.
 
 필요한 시간: {needed_hours}시간
@@ -188,27 +210,27 @@ def run_tomorrow_focus(target_date):
             "focus_blocks": []
         }
 
-    print(f"✅ {len(free_slots)}개 빈 시간 발견")
+    print(f"✅ {free_slot_count}개 빈 시간 발견")
 
     # Focus Block 생성
     print("\n🔒 Focus Block 생성 중...")
     created_blocks = []
     remaining_minutes = needed_minutes
 
-    for free_start, free_end, gap_minutes in free_slots:
-        if remaining_minutes <= 0:
-            break
-
-        block_minutes = min(remaining_minutes, gap_minutes)
-        start_iso = free_start.isoformat()
-        success = create_focus_block(task_text, start_iso, block_minutes)
-
-        if success:
-            created_blocks.append({
-                "start": start_iso,
-                "duration": block_minutes
-            })
-            remaining_minutes -= block_minutes
+    # 내일 우선, 하루 상한(FOCUS_DAILY_CAP_HOURS, 설정 시)까지 채우고 남으면 다음 근무일로
+    # 하루 안에서는 블록 수 최소 + 선호 시각 우선 (FOCUS_MAX_BLOCKS, FOCUS_PREFERRED_TIME)
+    daily_cap_minutes = int(DAILY_CAP_HOURS * 60) if DAILY_CAP_HOURS else None
+    planned = plan_spillover(slots_by_day, needed_minutes, daily_cap_minutes)
+
+    # 지난 실행 기록과 비교해서 필요한 생성/삭제만 동시에 실행 (다시 실행해도 중복 없음)
+    reconciled = reconcile_focus_blocks(plan_key, [(task_text, start, minutes) for start, minutes in planned])
+    blocks = reconciled["kept"] + [r for r in reconciled["created"] if r["success"]]
+    for block in blocks:
+        created_blocks.append({
+            "start": block["start"],
+            "duration": block["duration"]
+        })
+        remaining_minutes -= block["duration"]
 
     # 요약 메시지 발송
     remaining_hours = remaining_minutes / 60 if remaining_minutes > 0 else 0
@@ -250,10 +272,20 @@ def format_focus_summary(task, scope_result, created_blocks, needed_hours, remai
         else:
             summary += f"\n🔒 Focus Block 생성 완료!\n"
 
-        summary += f"\n📋 내일({target_date.strftime('%m/%d')} {day_name}) 블록:\n"
-        for block in created_blocks:
+        # 날짜별로 묶어서 표시 (내일 다음 근무일로 이어진 블록 포함)
+        weekday_names = ['월', '화', '수', '목', '금', '토', '일']
+        current_date = None
+        for block in sorted(created_blocks, key=lambda b: b['start']):
             start_dt = datetime.fromisoformat(block['start'])
             end_dt = start_dt + timedelta(minutes=block['duration'])
+
+            if start_dt.date() != current_date:
+                current_date = start_dt.date()
+                if current_date == target_date.date():
+                    summary += f"\n📋 내일({target_date.strftime('%m/%d')} {day_name}) 블록:\n"
+                else:
+                    summary += f"\n📋 {start_dt.strftime('%m/%d')}({weekday_names[start_dt.weekday()]}) 블록 (이어서 배치):\n"
+
             summary += f"- {start_dt.strftime('%H:%M')}-{end_dt.strftime('%H:%M')} ({block['duration']/60:.1f}시간)\n"
 
         if remaining_hours > 0:
@@ -263,25 +295,25 @@ def format_focus_summary(task, scope_result, created_blocks, needed_hours, remai
             summary += "\n이 시간엔 다른 미팅이 끼어들 수 없어요! 집중해봐요 💪"
     else:
         summary += f"\n⚠️ Focus Block을 생성하지 못했습니다\n"
-        summary += "내일 빈 시간이 없어요. 일정 조정이 필요할 것 같아요.\n"
+        summary += "내일부터 며칠간 빈 시간이 없어요. 일정 조정이 필요할 것 같아요.\n"
 
     return summary
 
 
-def main():
-    """메인 함수"""
-    print("=" * 60)
-    print("🌙 나이틀리 워크플로우 시작 (21:00)")
-    print("=" * 60)
+def run_nightly():
+    """회고 + 내일 Focus 한 번 실행 (현재 사용자 컨텍스트 기준)
 
+    Returns:
+        dict: 저장한 로그 데이터
+    """
     # 0. 내일 근무일 계산
     target_date = get_next_workday()
     weekday_names = ['월', '화', '수', '목', '금', '토', '일']
     day_name = weekday_names[target_date.weekday()]
     print(f"\n📅 내일: {target_date.strftime('%Y-%m-%d')} ({day_name}요일)")
 
-    # 1. 그룹 채팅 폴링 리스너 시작
-    print("\n🔌 폴링 리스너 시작 중...")
+    # 1. 그룹 채팅 메시지 리스너 시작 (LARK_LISTENER_MODE)
+    print("\n🔌 메시지 리스너 시작 중...")
     start_listener()
 
     # 2. Lark 토큰 체크
@@ -306,11 +338,9 @@ def main():
     # 로그 저장
     # ============================
     print("\n💾 로그 저장 중...")
-    log_dir = Path.home() / ".daily-focus"
-    log_dir.mkdir(exist_ok=True)
-
     today = datetime.now().strftime("%Y-%m-%d")
-    log_file = log_dir / f"{today}.json"
+    log_file = state_path(Path.home() / ".daily-focus" / f"{today}.json")
+    log_file.parent.mkdir(exist_ok=True)
 
     log_data = {
         "date": today,
@@ -323,6 +353,19 @@ def main():
         json.dump(log_data, f, ensure_ascii=False, indent=2)
 
     print(f"💾 로그 저장 완료: {log_file}")
+    return log_data
+
+
+def main():
+    """메인 함수"""
+    if not chat_id_configured():
+        sys.exit(1)
+
+    print("=" * 60)
+    print("🌙 나이틀리 워크플로우 시작 (21:00)")
+    print("=" * 60)
+
+    run_nightly()
 
     print("\n" + "=" * 60)
     print("✅ 나이틀리 워크플로우 완료!")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+빈 시간 계산 엔진
+
+일정(CalendarEvent)을 시작 시각 순으로 정렬한 구간 인덱스(IntervalIndex)에 담고,
+날짜마다 근무시간과 겹치는 일정만 bisect로 꺼내 병합한 뒤 그 사이 빈 시간을 구한다.
+인덱스 구축 O(n log n), 날짜별 조회 O(log n + k).
+
+근무시간 / 점심 같은 고정 일정 / 무시 규칙 / 최소 블록 크기는
+AvailabilityPolicy로 조합한다.
+
+사용법:
+    from availability import IntervalIndex, NIGHTLY_POLICY, free_slots_for_day
+
+    index = IntervalIndex(events)
+    slots = free_slots_for_day(index, target_date, NIGHTLY_POLICY)
+"""
+
+from bisect import bisect_left
+from datetime import datetime, time
+
+
+class IgnoreInsideWindow:
+    """해당 날짜의 [start, end] 시간대 안에 완전히 포함된 일정 무시"""
+
+    def __init__(self, start: time, end: time):
+        self.start = start
+        self.end = end
+
+    def __call__(self, event, day: datetime) -> bool:
+        window_start = epoch_at(day, self.start)
+        window_end = epoch_at(day, self.end)
+        return event.start >= window_start and event.end <= window_end
+
+
+class IgnoreLongerThan:
+    """hours시간 이상인 일정 무시 (재택, WFH 등 배경 일정)"""
+
+    def __init__(self, hours: float):
+        self.seconds = hours * 3600
+
+    def __call__(self, event, day: datetime) -> bool:
+        return event.duration_seconds >= self.seconds
+
+
+class IgnoreFree:
+    """free_busy_status가 "free"인 일정 무시"""
+
+    def __call__(self, event, day: datetime) -> bool:
+        return not event.busy
+
+
+class IgnoreKinds:
+    """특정 kind(focus, mirror, all_day, event)의 일정 무시"""
+
+    def __init__(self, *kinds):
+        self.kinds = set(kinds)
+
+    def __call__(self, event, day: datetime) -> bool:
+        return event.kind in self.kinds
+
+
+class IgnoreIntervals:
+    """시작/종료 시각이 정확히 일치하는 일정 무시 (예: 다시 계획할 내 Focus Block)
+
+    Args:
+        intervals: {(start_ts, end_ts), ...}
+    """
+
+    def __init__(self, intervals):
+        self.intervals = set(intervals)
+
+    def __call__(self, event, day: datetime) -> bool:
+        return (event.start, event.end) in self.intervals
+
+
+class AvailabilityPolicy:
+    """빈 시간 계산 규칙
+
+    Args:
+        work_start, work_end: 근무시간 (time)
+        blocked: 매일 바쁜 시간으로 취급할 고정 구간 [(time, time), ...] (예: 점심)
+        ignore_rules: rule(event, day) -> True면 그 일정은 바쁜 시간에서 제외
+        min_block_minutes: 이보다 짧은 빈 시간은 버림
+        same_day_only: True면 그 날짜에 시작한 일정만 반영 (기존 동작),
+            False면 전날부터 이어지는 일정도 겹치는 만큼 반영
+    """
+
+    def __init__(self, work_start: time = time(10), work_end: time = time(19),
+                 blocked=(), ignore_rules=(), min_block_minutes: int = 30,
+                 same_day_only: bool = True):
+        self.work_start = work_start
+        self.work_end = work_end
+        self.blocked = list(blocked)
+        self.ignore_rules = list(ignore_rules)
+        self.min_block_minutes = min_block_minutes
+        self.same_day_only = same_day_only
+
+    def with_min_block(self, min_block_minutes: int):
+        """최소 블록 크기만 바꾼 새 정책"""
+        return AvailabilityPolicy(self.work_start, self.work_end, self.blocked,
+                                  self.ignore_rules, min_block_minutes, self.same_day_only)
+
+    def with_ignore_rules(self, *rules):
+        """무시 규칙을 덧붙인 새 정책"""
+        return AvailabilityPolicy(self.work_start, self.work_end, self.blocked,
+                                  self.ignore_rules + list(rules), self.min_block_minutes,
+                                  self.same_day_only)
+
+    def is_ignored(self, event, day: datetime) -> bool:
+        return any(rule(event, day) for rule in self.ignore_rules)
+
+
+LUNCH = (time(11), time(12))
+
+# 이번 주 빈 시간 (lark_calendar.py --find-gaps): 10:00-19:00, 점심 제외
+WEEK_POLICY = AvailabilityPolicy(blocked=[LUNCH])
+
+# 내일 빈 시간 (nightly_flow.py): 위 규칙 + 9:30-11:00 Focus 윈도우 안 일정,
+# 8시간 이상 일정, free 일정 무시
+NIGHTLY_POLICY = AvailabilityPolicy(
+    blocked=[LUNCH],
+    ignore_rules=[
+        IgnoreInsideWindow(time(9, 30), time(11)),
+        IgnoreLongerThan(8),
+        IgnoreFree(),
+    ]
+)
+
+
+def epoch_at(day: datetime, at: time) -> int:
+    """day 날짜의 at 시각 → epoch 초 (day의 tzinfo 기준)"""
+    return int(day.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0).timestamp())
+
+
+class IntervalIndex:
+    """시작 시각 순으로 정렬된 일정 구간 인덱스
+
+    [start, end) 구간과 겹치는 일정을 bisect로 찾는다. 가장 긴 일정 길이만큼
+    앞쪽을 더 보면 되므로 조회는 O(log n + k).
+    """
+
+    def __init__(self, events=()):
+        timed = sorted((e for e in events if e.is_timed), key=lambda e: e.start)
+        self.events = timed
+        self.starts = [e.start for e in timed]
+        self.max_duration = max((e.duration_seconds for e in timed), default=0)
+
+    def __len__(self):
+        return len(self.events)
+
+    def overlapping(self, start: int, end: int) -> list:
+        """[start, end) 구간과 겹치는 일정 목록 (시작 시각 순)"""
+        lo = bisect_left(self.starts, start - self.max_duration)
+        hi = bisect_left(self.starts, end)
+        return [e for e in self.events[lo:hi] if e.end > start]
+
+
+def merge_intervals(intervals: list) -> list:
+    """정렬된 [(start, end), ...]의 겹치거나 맞닿은 구간 병합"""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def busy_intervals_for_day(index: IntervalIndex, day: datetime, policy: AvailabilityPolicy) -> list:
+    """해당 날짜 근무시간 안의 바쁜 구간 (병합·정렬된 epoch 초 [[start, end], ...])"""
+    work_start = epoch_at(day, policy.work_start)
+    work_end = epoch_at(day, policy.work_end)
+
+    busy = [(epoch_at(day, start), epoch_at(day, end)) for start, end in policy.blocked]
+    for event in index.overlapping(work_start, work_end):
+        if policy.same_day_only and event.day != day.date():
+            continue
+        if policy.is_ignored(event, day):
+            continue
+        busy.append((event.start, event.end))
+
+    clipped = [(max(s, work_start), min(e, work_end)) for s, e in busy]
+    clipped = [(s, e) for s, e in clipped if s < e]
+    clipped.sort()
+    return merge_intervals(clipped)
+
+
+def free_slots_for_day(index: IntervalIndex, day: datetime, policy: AvailabilityPolicy) -> list:
+    """해당 날짜의 빈 시간
+
+    Returns:
+        list: (start_dt, end_dt, gap_minutes) 튜플의 리스트
+    """
+    work_start = epoch_at(day, policy.work_start)
+    work_end = epoch_at(day, policy.work_end)
+    min_seconds = policy.min_block_minutes * 60
+    tz = day.tzinfo
+
+    slots = []
+    cursor = work_start
+    for busy_start, busy_end in busy_intervals_for_day(index, day, policy) + [[work_end, work_end]]:
+        if busy_start - cursor >= min_seconds:
+            slots.append((datetime.fromtimestamp(cursor, tz=tz),
+                          datetime.fromtimestamp(busy_start, tz=tz),
+                          (busy_start - cursor) // 60))
+        cursor = max(cursor, busy_end)
+
+    return slots
+
+
+def free_slots_for_days(events, days, policy: AvailabilityPolicy) -> list:
+    """여러 날짜의 빈 시간 (일정 목록으로 인덱스를 한 번만 만든다)"""
+    index = events if isinstance(events, IntervalIndex) else IntervalIndex(events)
+    slots = []
+    for day in days:
+        slots.extend(free_slots_for_day(index, day, policy))
+    return slots
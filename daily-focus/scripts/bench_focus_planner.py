@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Focus Block 배치 벤치마크 (합성 캘린더)
+
+무작위 미팅으로 채운 캘린더에서 빈 시간을 구하고, 기존 greedy 방식과
+plan_focus_blocks()의 블록 수 / 확보 시간 / 실행 시간을 비교한다.
+Lark API는 호출하지 않는다.
+
+사용법:
+    python3 scripts/bench_focus_planner.py
+    python3 scripts/bench_focus_planner.py --calendars 500 --days 5 --meetings 8 --needed 240
+"""
+
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from calendar_event import CalendarEvent
+from availability import IntervalIndex, NIGHTLY_POLICY, free_slots_for_days
+from focus_planner import plan_focus_blocks, plan_greedy
+
+
+def synthetic_events(days: list, meetings_per_day: int, rng: random.Random) -> list:
+    """근무시간(9~19시) 안에 15분 단위로 무작위 미팅 생성"""
+    events = []
+    for day in days:
+        for _ in range(meetings_per_day):
+            start = day + timedelta(hours=9, minutes=15 * rng.randrange(36))
+            minutes = rng.choice([15, 30, 30, 45, 60, 60, 90])
+            start_ts = int(start.timestamp())
+            events.append(CalendarEvent.from_busy(start_ts, start_ts + minutes * 60))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Focus Block 배치 벤치마크")
+    parser.add_argument("--calendars", type=int, default=200, help="합성 캘린더 수 (기본: 200)")
+    parser.add_argument("--days", type=int, default=1, help="캘린더당 날짜 수 (기본: 1)")
+    parser.add_argument("--meetings", type=int, default=6, help="하루 미팅 수 (기본: 6)")
+    parser.add_argument("--needed", type=int, default=240, help="필요 시간 (분, 기본: 240)")
+    parser.add_argument("--max-blocks", type=int, default=3, help="최대 블록 수 (기본: 3)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    first_day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    days = [first_day + timedelta(days=i) for i in range(args.days)]
+
+    calendars = []
+    for _ in range(args.calendars):
+        index = IntervalIndex(synthetic_events(days, args.meetings, rng))
+        calendars.append(free_slots_for_days(index, days, NIGHTLY_POLICY))
+
+    results = {}
+    for name, plan in (
+        ("greedy", lambda slots: plan_greedy(slots, args.needed)),
+        ("planner", lambda slots: plan_focus_blocks(slots, args.needed, max_blocks=args.max_blocks)),
+    ):
+        started = time.perf_counter()
+        plans = [plan(slots) for slots in calendars]
+        elapsed = time.perf_counter() - started
+        results[name] = (plans, elapsed)
+
+    avg_slots = sum(len(slots) for slots in calendars) / len(calendars)
+    print(f"📊 캘린더 {args.calendars}개 × {args.days}일, 하루 미팅 {args.meetings}개, "
+          f"필요 {args.needed}분 (평균 빈 시간 {avg_slots:.1f}개)")
+    print(f"{'방식':<8} {'평균 블록':>8} {'평균 확보(분)':>12} {'캘린더당(ms)':>12}")
+    for name, (plans, elapsed) in results.items():
+        avg_blocks = sum(len(p) for p in plans) / len(plans)
+        avg_minutes = sum(min(args.needed, sum(m for _, m in p)) for p in plans) / len(plans)
+        per_calendar_ms = elapsed * 1000 / len(plans)
+        print(f"{name:<8} {avg_blocks:>8.2f} {avg_minutes:>12.1f} {per_calendar_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
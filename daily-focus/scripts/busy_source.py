@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+바쁜 시간 소스
+
+빈 시간 계산(availability.py, team_focus.py)에 필요한 건 "언제 바쁜가"뿐이므로,
+일정 전체(설명, 참석자 등)를 내려받지 않고 시각만 받아오는 소스를 고를 수 있게 한다.
+
+    FreeBusySource     — freebusy/batch로 FREEBUSY_BATCH_SIZE명씩 묶어 조회,
+                         batch가 실패한 묶음만 freebusy/list로 한 명씩 조회
+    OwnCalendarSource  — 내 캘린더 일정 전체(instance_view, 스냅샷) 조회 (일정 제목/종류가 필요할 때)
+    StubBusySource     — 미리 넣어 둔 구간을 그대로 반환 (테스트/오프라인용)
+
+모든 소스는 fetch(user_ids, range_start, range_end) → (busy_by_user, failed)를 구현한다.
+    busy_by_user: {user_id: [CalendarEvent, ...]}
+    failed: 조회에 실패한 user_id 목록 (호출부가 "비어 있음"으로 취급하지 않도록)
+
+per_event가 False인 소스(freebusy)는 맞닿은 일정을 하나로 합친 구간을 돌려주므로,
+일정 단위 무시 규칙(AvailabilityPolicy.ignore_rules)과 함께 쓰면 안 된다.
+"""
+
+from calendar_event import CalendarEvent
+from user_context import getenv
+from lark_calendar import (
+    FREEBUSY_BATCH_SIZE, batch_freebusy, list_freebusy, events_between
+)
+
+
+def intervals_to_events(intervals) -> list:
+    """[(start_ts, end_ts), ...] → 바쁜 CalendarEvent 목록"""
+    return [CalendarEvent.from_busy(start_ts, end_ts) for start_ts, end_ts in intervals]
+
+
+class FreeBusySource:
+    """freebusy API 기반 소스 (시작/종료 시각만 받음, 맞닿은 일정은 합쳐진 구간)"""
+
+    per_event = False
+
+    def __init__(self, batch_size: int = FREEBUSY_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def fetch(self, user_ids, range_start, range_end):
+        busy_by_user = {}
+        failed = []
+        user_ids = list(user_ids)
+
+        for i in range(0, len(user_ids), self.batch_size):
+            chunk = user_ids[i:i + self.batch_size]
+            batch = batch_freebusy(chunk, range_start, range_end)
+            if batch is None:
+                print(f"⚠️ freebusy 일괄 조회 실패 - {len(chunk)}명 개별 조회로 대체")
+                batch = {}
+
+            for user_id in chunk:
+                intervals = batch.get(user_id)
+                if intervals is None:
+                    intervals = list_freebusy(user_id, range_start, range_end)
+                if intervals is None:
+                    failed.append(user_id)
+                else:
+                    busy_by_user[user_id] = intervals_to_events(intervals)
+
+        return busy_by_user, failed
+
+
+class OwnCalendarSource:
+    """내 캘린더 일정 전체 조회 (user_ids 중 LARK_USER_OPEN_ID만 지원)"""
+
+    per_event = True
+
+    def fetch(self, user_ids, range_start, range_end):
+        own_id = getenv("LARK_USER_OPEN_ID")
+        busy_by_user = {}
+        failed = []
+        for user_id in user_ids:
+            events = events_between(range_start, range_end) if user_id == own_id else None
+            if events is None:
+                failed.append(user_id)
+            else:
+                busy_by_user[user_id] = events
+        return busy_by_user, failed
+
+
+class StubBusySource:
+    """고정된 바쁜 구간을 반환하는 소스 (테스트용)
+
+    Args:
+        busy_by_user: {user_id: [(start_ts, end_ts), ...]}
+            목록에 없는 사용자는 failed로 돌려준다. 구간 하나를 일정 하나로 취급한다.
+    """
+
+    per_event = True
+
+    def __init__(self, busy_by_user: dict):
+        self.busy_by_user = busy_by_user
+        self.calls = []
+
+    def fetch(self, user_ids, range_start, range_end):
+        self.calls.append((list(user_ids), range_start, range_end))
+        start_ts = int(range_start.timestamp())
+        end_ts = int(range_end.timestamp())
+
+        busy_by_user = {}
+        failed = []
+        for user_id in user_ids:
+            if user_id not in self.busy_by_user:
+                failed.append(user_id)
+                continue
+            busy_by_user[user_id] = intervals_to_events(
+                (s, e) for s, e in self.busy_by_user[user_id] if s < end_ts and e > start_ts
+            )
+        return busy_by_user, failed
+
+
+def default_busy_source(policy=None):
+    """기본 소스: LARK_USER_OPEN_ID가 있으면 freebusy, 없으면 내 캘린더 일정 조회
+
+    policy에 일정 단위 무시 규칙이 있으면 일정을 하나씩 구분할 수 있는 내 캘린더 조회.
+    """
+    if policy is not None and policy.ignore_rules:
+        return OwnCalendarSource()
+    if getenv("LARK_USER_OPEN_ID"):
+        return FreeBusySource()
+    return OwnCalendarSource()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Lark 일정 한 건을 담는 가벼운 레코드
+
+Lark 응답(dict)을 조회 시점에 한 번만 파싱해 두고, 빈 시간 계산 /
+Focus Block 정리 / 미러링 동기화가 같은 객체를 그대로 쓴다.
+(매번 event.get("start_time", {}) → int() → datetime.fromtimestamp() 반복 방지)
+
+kind:
+    focus    — daily-focus가 만든 Focus Block (🔒 접두사)
+    mirror   — gcal_sync.py가 만든 Google 미러링 이벤트 (🔄 접두사)
+    all_day  — 날짜 단위(종일) 일정
+    event    — 그 밖의 일반 일정
+"""
+
+from datetime import datetime, date
+
+FOCUS_BLOCK_PREFIX = "🔒"
+MIRROR_PREFIX = "🔄"
+
+
+class CalendarEvent:
+    """파싱된 Lark 일정
+
+    start / end는 epoch 초(int). 종일 일정은 해당 날짜 00:00(로컬) 기준.
+    day는 시작 시각의 로컬 날짜(date).
+    """
+
+    __slots__ = ("event_id", "summary", "description", "start", "end", "busy", "kind", "day")
+
+    def __init__(self, event_id, summary, description, start, end, busy, kind, day):
+        self.event_id = event_id
+        self.summary = summary
+        self.description = description
+        self.start = start
+        self.end = end
+        self.busy = busy
+        self.kind = kind
+        self.day = day
+
+    @classmethod
+    def from_lark(cls, event: dict):
+        """Lark 일정 dict → CalendarEvent (시작/종료 시각이 없으면 None)"""
+        start = event.get("start_time") or {}
+        end = event.get("end_time") or {}
+        summary = event.get("summary") or ""
+
+        if "timestamp" in start and "timestamp" in end:
+            start_ts = int(start["timestamp"])
+            end_ts = int(end["timestamp"])
+            day = datetime.fromtimestamp(start_ts).date()
+            kind = None
+        elif "date" in start:
+            day = date.fromisoformat(start["date"])
+            start_ts = int(datetime(day.year, day.month, day.day).timestamp())
+            end_day = date.fromisoformat(end["date"]) if "date" in end else day
+            end_ts = int(datetime(end_day.year, end_day.month, end_day.day).timestamp())
+            kind = "all_day"
+        else:
+            return None
+
+        if kind is None:
+            if MIRROR_PREFIX in summary:
+                kind = "mirror"
+            elif FOCUS_BLOCK_PREFIX in summary:
+                kind = "focus"
+            else:
+                kind = "event"
+
+        return cls(
+            event.get("event_id"), summary, event.get("description") or "",
+            start_ts, end_ts, event.get("free_busy_status") != "free", kind, day
+        )
+
+    @classmethod
+    def from_busy(cls, start_ts: int, end_ts: int):
+        """freebusy 구간 → CalendarEvent (제목/ID 없이 바쁜 시간만)"""
+        return cls(None, "", "", start_ts, end_ts, True, "event",
+                   datetime.fromtimestamp(start_ts).date())
+
+    @property
+    def is_timed(self) -> bool:
+        """시각이 지정된 일정인지 (종일 일정이 아닌지)"""
+        return self.kind != "all_day"
+
+    @property
+    def start_dt(self) -> datetime:
+        return datetime.fromtimestamp(self.start)
+
+    @property
+    def end_dt(self) -> datetime:
+        return datetime.fromtimestamp(self.end)
+
+    @property
+    def duration_seconds(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"CalendarEvent({self.kind}, {self.summary!r}, {self.start}-{self.end})"
+
+
+def parse_events(events) -> list:
+    """Lark 일정 dict 목록 → CalendarEvent 목록 (시각 정보가 없는 일정은 제외)"""
+    parsed = []
+    for event in events:
+        record = CalendarEvent.from_lark(event)
+        if record is not None:
+            parsed.append(record)
+    return parsed
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+프로세스 내 캘린더 스냅샷
+
+한 번 실행하는 동안 여러 곳(빈 시간 계산, gcal_sync, Focus Block 정리)이
+겹치는 기간을 반복 조회하지 않도록, 주(월~일) 단위로 한 번 받아 온 일정을
+시작 시각 순 배열에 담아 두고 bisect로 기간 조회에 답한다.
+
+- 조회 기간이 이미 받아 온 창 안이면 API 호출 없이 메모리에서 반환
+- 이 프로세스가 일정을 만들거나 지우면 invalidate()로 통째로 버림
+- 조회(HTTP)는 락 밖에서, 같은 창은 한 스레드만 받아 오고 나머지는 그 결과를 기다림
+- LARK_SNAPSHOT_TTL_MINUTES > 0이면 디스크(~/.daily-focus/calendar_snapshot.json)에도
+  저장해서 TTL 동안 다음 실행에서도 재사용 (기본 0 = 메모리만)
+"""
+
+import os
+import json
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from datetime import datetime, timedelta, date
+
+from calendar_event import CalendarEvent
+from state_files import atomic_write_json
+
+SNAPSHOT_FILE = Path.home() / '.daily-focus' / 'calendar_snapshot.json'
+SNAPSHOT_TTL = timedelta(minutes=float(os.getenv("LARK_SNAPSHOT_TTL_MINUTES", "0")))
+
+
+def week_window(range_start: datetime, range_end: datetime):
+    """기간을 감싸는 주 단위 창 (range_start 주 월요일 00:00 ~ range_end 주 일요일 23:59:59)"""
+    start = range_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    start -= timedelta(days=start.weekday())
+    end = range_end.replace(hour=23, minute=59, second=59, microsecond=0)
+    end += timedelta(days=6 - end.weekday())
+    return start, end
+
+
+def _event_to_row(event: CalendarEvent) -> list:
+    return [event.event_id, event.summary, event.description, event.start, event.end,
+            event.busy, event.kind, event.day.isoformat()]
+
+
+def _row_to_event(row: list) -> CalendarEvent:
+    event_id, summary, description, start, end, busy, kind, day = row
+    return CalendarEvent(event_id, summary, description, start, end, busy, kind, date.fromisoformat(day))
+
+
+class _Fetch:
+    """창 하나를 받아 오는 중 (기다리는 스레드는 done을 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = False
+
+
+class CalendarSnapshot:
+    """주 단위로 채워지는 일정 스냅샷 (스레드 간 공유 가능)
+
+    Args:
+        fetch: fetch(range_start, range_end) -> [CalendarEvent, ...] | None (실패)
+        owner: 디스크 스냅샷을 다른 사용자 것과 구분하는 키 (예: open_id)
+        ttl: 디스크 스냅샷 유효 시간 (0이면 디스크 사용 안 함)
+    """
+
+    def __init__(self, fetch, owner: str = None, ttl: timedelta = SNAPSHOT_TTL,
+                 path: Path = SNAPSHOT_FILE):
+        self._fetch = fetch
+        self._owner = owner
+        self._ttl = ttl
+        self._path = Path(path)
+        self._lock = threading.RLock()
+        self._clear()
+        self._disk_checked = False
+        self._generation = 0
+        self._inflight = {}     # (window_start, window_end) → _Fetch (같은 창은 한 번만 조회)
+
+    def _clear(self) -> None:
+        self._windows = []      # 받아 온 [start_ts, end_ts] (병합, 정렬)
+        self._by_key = {}       # (event_id, start) → CalendarEvent (창이 겹쳐도 중복 없음)
+        self._events = []
+        self._starts = []
+        self._max_duration = 0
+        self._fetched_at = None  # 가장 먼저 받아 온 창의 조회 시각 (디스크 TTL 기준)
+
+    def _rebuild(self) -> None:
+        self._events = sorted(self._by_key.values(), key=lambda e: e.start)
+        self._starts = [e.start for e in self._events]
+        self._max_duration = max((e.duration_seconds for e in self._events), default=0)
+
+    def _covers(self, start_ts: int, end_ts: int) -> bool:
+        for window_start, window_end in self._windows:
+            if window_start <= start_ts and end_ts <= window_end:
+                return True
+        return False
+
+    def _add_window(self, start_ts: int, end_ts: int) -> None:
+        windows = sorted(self._windows + [[start_ts, end_ts]])
+        merged = []
+        for window_start, window_end in windows:
+            if merged and window_start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], window_end)
+            else:
+                merged.append([window_start, window_end])
+        self._windows = merged
+
+    def query(self, range_start: datetime, range_end: datetime):
+        """[range_start, range_end]와 겹치는 일정 (시작 시각 순), 조회 실패 시 None
+
+        락은 메모리 조회/저장에만 잡는다. 같은 창을 이미 다른 스레드가 받아 오는 중이면
+        그 결과를 기다리고, 조회하는 사이 invalidate()됐으면 결과를 저장하지 않는다.
+        """
+        window = week_window(range_start, range_end)
+        while True:
+            with self._lock:
+                events = self.peek(range_start, range_end)
+                if events is not None:
+                    return events
+                pending = self._inflight.get(window)
+                if pending is None:
+                    pending = self._inflight[window] = _Fetch()
+                    generation = self._generation
+                    break
+
+            # 다른 스레드가 받아 오는 중: 끝나면 다시 peek (그 사이 버려졌으면 직접 조회)
+            pending.done.wait()
+            if pending.failed:
+                return None
+
+        events = None
+        try:
+            events = self._fetch(*window)
+        finally:
+            with self._lock:
+                if events is not None:
+                    self.store(*window, events, generation=generation)
+                del self._inflight[window]
+            pending.failed = events is None
+            pending.done.set()
+
+        if events is None:
+            return None
+        start_ts, end_ts = int(range_start.timestamp()), int(range_end.timestamp())
+        return sorted((e for e in events if e.start <= end_ts and e.end > start_ts), key=lambda e: e.start)
+
+    def peek(self, range_start: datetime, range_end: datetime):
+        """이미 받아 둔 창 안이면 겹치는 일정, 아니면 None (API 호출 없음)"""
+        start_ts = int(range_start.timestamp())
+        end_ts = int(range_end.timestamp())
+
+        with self._lock:
+            if not self._disk_checked:
+                self._disk_checked = True
+                self._load_from_disk()
+
+            if not self._covers(start_ts, end_ts):
+                return None
+
+            lo = bisect_left(self._starts, start_ts - self._max_duration)
+            hi = bisect_left(self._starts, end_ts + 1)
+            return [e for e in self._events[lo:hi] if e.end > start_ts]
+
+    @property
+    def generation(self) -> int:
+        """invalidate()할 때마다 1씩 증가"""
+        return self._generation
+
+    def store(self, window_start: datetime, window_end: datetime, events: list,
+              generation: int = None) -> None:
+        """창 하나의 일정을 스냅샷에 추가 (query 밖에서 직접 받아 온 경우, 예: asyncio)
+
+        generation을 주면 조회하는 사이 invalidate()된 경우 버린다 (이미 낡은 결과).
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            for event in events:
+                self._by_key[(event.event_id, event.start)] = event
+            self._add_window(int(window_start.timestamp()), int(window_end.timestamp()))
+            self._fetched_at = self._fetched_at or datetime.now()
+            self._rebuild()
+            self._save_to_disk()
+
+    def invalidate(self) -> None:
+        """스냅샷 폐기 (메모리 + 디스크)"""
+        with self._lock:
+            self._clear()
+            self._generation += 1
+            self._disk_checked = True
+            if self._ttl.total_seconds() > 0:
+                try:
+                    self._path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _load_from_disk(self) -> None:
+        if self._ttl.total_seconds() <= 0 or not self._path.exists():
+            return
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("owner") != self._owner:
+                return
+            fetched_at = datetime.fromisoformat(data["fetched_at"])
+            if datetime.now() - fetched_at >= self._ttl:
+                return
+            self._windows = data["windows"]
+            self._by_key = {}
+            for row in data["events"]:
+                event = _row_to_event(row)
+                self._by_key[(event.event_id, event.start)] = event
+            self._rebuild()
+            self._fetched_at = fetched_at
+        except (OSError, ValueError, KeyError, TypeError):
+            self._clear()
+
+    def _save_to_disk(self) -> None:
+        if self._ttl.total_seconds() <= 0:
+            return
+        atomic_write_json(self._path, {
+            "owner": self._owner,
+            "fetched_at": self._fetched_at.isoformat(),
+            "windows": self._windows,
+            "events": [_event_to_row(e) for e in self._events],
+        })
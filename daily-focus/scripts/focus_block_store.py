@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+내가 만든 Focus Block 기록 (~/.daily-focus/focus_blocks.json)
+
+Focus Block을 만들 때마다 이벤트 ID를 남겨 두고, 다시 실행할 때
+캘린더를 훑지 않고 기록만으로 원하는 블록과 비교(생성/삭제/유지)한다.
+
+블록은 plan 키로 묶인다.
+    - nightly_flow.py: 대상 날짜 ('YYYY-MM-DD') — 같은 밤을 다시 실행하면 그 계획만 교체
+    - lark_calendar.py --create-block: 'cli'
+
+형식:
+    {"blocks": [{"event_id", "plan", "title", "start", "duration"}, ...]}
+"""
+
+import json
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from state_files import atomic_write_json, file_lock
+from user_context import state_path
+
+FOCUS_BLOCKS_FILE = Path.home() / '.daily-focus' / 'focus_blocks.json'
+FOCUS_BLOCKS_LOCK = Path.home() / '.daily-focus' / 'focus_blocks.lock'
+
+# 이보다 오래 지난 블록 기록은 저장할 때 정리
+RETENTION = timedelta(days=14)
+
+
+def block_key(title: str, start: str, duration: int) -> tuple:
+    """블록 비교 키 (제목, 시작 시각, 길이)"""
+    return title, datetime.fromisoformat(start).isoformat(), int(duration)
+
+
+def _load() -> list:
+    blocks_file = state_path(FOCUS_BLOCKS_FILE)
+    if not blocks_file.exists():
+        return []
+    try:
+        with open(blocks_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get("blocks", [])
+    except (OSError, ValueError):
+        return []
+
+
+def _save(blocks: list) -> None:
+    cutoff = datetime.now() - RETENTION
+    blocks = [b for b in blocks if datetime.fromisoformat(b["start"]) >= cutoff]
+    atomic_write_json(state_path(FOCUS_BLOCKS_FILE), {"blocks": blocks, "updated_at": datetime.now().isoformat()})
+
+
+def has_records() -> bool:
+    """기록 파일이 있는지 (없으면 예전 방식으로 만든 블록만 있을 수 있음)"""
+    return state_path(FOCUS_BLOCKS_FILE).exists()
+
+
+def load_blocks(plan: str = None) -> list:
+    """기록된 블록 목록 (plan을 주면 그 계획의 블록만)"""
+    blocks = _load()
+    if plan is not None:
+        blocks = [b for b in blocks if b.get("plan") == plan]
+    return blocks
+
+
+def record_changes(added: list = (), removed_ids=()) -> None:
+    """생성한 블록 추가 / 삭제한 블록 제거 (프로세스 간 락으로 보호)"""
+    removed_ids = set(removed_ids)
+    with file_lock(state_path(FOCUS_BLOCKS_LOCK)):
+        blocks = [b for b in _load() if b["event_id"] not in removed_ids]
+        blocks.extend(added)
+        _save(blocks)
+
+
+def busy_intervals(plan: str) -> set:
+    """해당 계획 블록의 (start_ts, end_ts) 집합 (다시 계획할 때 바쁜 시간에서 제외)"""
+    intervals = set()
+    for block in load_blocks(plan):
+        start_dt = datetime.fromisoformat(block["start"])
+        end_dt = start_dt + timedelta(minutes=block["duration"])
+        intervals.add((int(start_dt.timestamp()), int(end_dt.timestamp())))
+    return intervals
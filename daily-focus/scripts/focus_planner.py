@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Focus Block 배치 최적화
+
+빈 시간 목록에서 필요한 시간을 채울 블록 조합을 고른다. 앞에서부터 채우는
+greedy 방식은 4시간 작업을 30~60분짜리 틈 네 개에 흩뿌리곤 했는데,
+여기서는 아래 순서로 가장 좋은 조합을 찾는다.
+
+    1. 확보 시간 최대 (필요 시간까지)
+    2. 블록 수 최소 (컨텍스트 스위칭 최소화, max_blocks 이하)
+    3. 선호 시각(FOCUS_PREFERRED_TIME)에 가까울수록 좋음 (여러 날이면 이른 날 우선)
+
+블록은 빈 시간의 앞이나 뒤 끝에 붙여서 남는 빈 시간이 쪼개지지 않게 한다.
+
+풀이는 (사용 블록 수, 확보 분) 상태에 대한 DP. 한 빈 시간에서 쓸 길이는
+min(빈 시간, 남은 필요 시간)뿐이므로 상태 수는 max_blocks × 필요 분 이하.
+
+사용법:
+    from focus_planner import plan_focus_blocks
+
+    blocks = plan_focus_blocks(free_slots, needed_minutes=240)
+    for start_dt, minutes in blocks:
+        create_focus_block(title, start_dt.isoformat(), minutes)
+"""
+
+import os
+from datetime import datetime, time, timedelta
+
+# 하루에 만들 Focus Block 최대 개수
+DEFAULT_MAX_BLOCKS = int(os.getenv("FOCUS_MAX_BLOCKS", "4"))
+
+# 선호 시각 (HH:MM, 블록 시작이 이 시각에 가까울수록 좋음)
+DEFAULT_PREFERRED_TIME = os.getenv("FOCUS_PREFERRED_TIME", "10:00")
+
+# Focus Block 최소 길이 (분)
+MIN_BLOCK_MINUTES = 30
+
+# 하루 늦어질 때마다 더하는 선호도 비용 (분 단위, 같은 날 안의 어떤 차이보다 큼)
+DAY_PENALTY = 24 * 60
+
+
+def _parse_time(value) -> time:
+    if isinstance(value, time):
+        return value
+    hour, minute = value.split(":")
+    return time(int(hour), int(minute))
+
+
+def _placements(slot_start: datetime, slot_end: datetime, minutes: int,
+                preferred: time, first_day) -> tuple:
+    """빈 시간 안에 minutes 길이 블록을 앞/뒤 끝에 붙였을 때 더 나은 쪽 → (비용, 시작 시각)"""
+    day_offset = (slot_start.date() - first_day).days
+    target = slot_start.replace(hour=preferred.hour, minute=preferred.minute, second=0, microsecond=0)
+
+    best = None
+    for start in (slot_start, slot_end - timedelta(minutes=minutes)):
+        cost = day_offset * DAY_PENALTY + abs((start - target).total_seconds()) / 60
+        if best is None or cost < best[0]:
+            best = (cost, start)
+    return best
+
+
+def plan_focus_blocks(free_slots: list, needed_minutes: int,
+                      max_blocks: int = DEFAULT_MAX_BLOCKS,
+                      preferred_time=DEFAULT_PREFERRED_TIME,
+                      min_block_minutes: int = MIN_BLOCK_MINUTES) -> list:
+    """필요 시간을 채울 Focus Block 조합 선택
+
+    Args:
+        free_slots: [(start_dt, end_dt, gap_minutes), ...] (availability / find_free_slots_for_date 결과)
+        needed_minutes: 필요한 총 시간 (분)
+        max_blocks: 최대 블록 수
+        preferred_time: 선호 시각 ("HH:MM" 또는 time)
+        min_block_minutes: 이보다 짧은 빈 시간은 쓰지 않음 (블록은 남은 필요 시간보다 길게 잡지 않음)
+
+    Returns:
+        list: [(start_dt, minutes), ...] 시작 시각 순
+    """
+    slots = [s for s in free_slots if s[2] >= min_block_minutes]
+    if not slots or needed_minutes <= 0 or max_blocks <= 0:
+        return []
+
+    preferred = _parse_time(preferred_time)
+    first_day = min(s[0] for s in slots).date()
+
+    # dp[(blocks, covered)] = (preference_cost, chosen)  chosen: ((slot_index, minutes, start), ...)
+    dp = {(0, 0): (0.0, ())}
+
+    for i, (slot_start, slot_end, gap_minutes) in enumerate(slots):
+        for (blocks, covered), (cost, chosen) in list(dp.items()):
+            if blocks >= max_blocks or covered >= needed_minutes:
+                continue
+
+            # 빈 시간을 다 쓰거나, 남은 필요 시간만큼만
+            minutes = min(gap_minutes, needed_minutes - covered)
+            placement_cost, start = _placements(slot_start, slot_end, minutes, preferred, first_day)
+
+            key = (blocks + 1, min(needed_minutes, covered + minutes))
+            candidate = (cost + placement_cost, chosen + ((i, minutes, start),))
+            if key not in dp or candidate[0] < dp[key][0]:
+                dp[key] = candidate
+
+    # 1. 확보 시간 최대 → 2. 블록 수 최소 → 3. 선호도 비용 최소
+    (blocks, covered), (cost, chosen) = min(
+        dp.items(), key=lambda item: (-item[0][1], item[0][0], item[1][0])
+    )
+
+    return sorted((start, minutes) for _, minutes, start in chosen)
+
+
+def plan_spillover(slots_by_day: list, needed_minutes: int, daily_cap_minutes: int = None,
+                   max_blocks: int = DEFAULT_MAX_BLOCKS,
+                   preferred_time=DEFAULT_PREFERRED_TIME,
+                   min_block_minutes: int = MIN_BLOCK_MINUTES) -> list:
+    """여러 근무일에 걸쳐 필요 시간 배치 (앞 날짜 우선, 하루 상한 적용)
+
+    Args:
+        slots_by_day: [(day, free_slots), ...] 날짜 순 (첫 날 = 내일)
+        needed_minutes: 필요한 총 시간 (분)
+        daily_cap_minutes: 하루에 배치할 최대 시간 (없으면 제한 없음)
+        max_blocks: 하루 최대 블록 수
+
+    Returns:
+        list: [(start_dt, minutes), ...] 시작 시각 순
+    """
+    blocks = []
+    remaining = needed_minutes
+
+    for _, free_slots in slots_by_day:
+        if remaining <= 0:
+            break
+
+        day_need = remaining if daily_cap_minutes is None else min(remaining, daily_cap_minutes)
+        day_blocks = plan_focus_blocks(free_slots, day_need, max_blocks, preferred_time, min_block_minutes)
+        blocks.extend(day_blocks)
+        remaining -= min(day_need, sum(minutes for _, minutes in day_blocks))
+
+    return blocks
+
+
+def plan_greedy(free_slots: list, needed_minutes: int) -> list:
+    """기존 방식 (앞에서부터 채우기) - 비교용"""
+    blocks = []
+    remaining = needed_minutes
+    for free_start, free_end, gap_minutes in free_slots:
+        if remaining <= 0:
+            break
+        minutes = min(remaining, gap_minutes)
+        blocks.append((free_start, minutes))
+        remaining -= minutes
+    return blocks
@@ -3,20 +3,28 @@
 Google Calendar → Lark Calendar 동기화 스크립트
 
 Google Calendar 일정을 Lark Calendar에 미러링한다.
-기존 미러링 이벤트(🔄 접두사)를 삭제 후 재생성하는 전략.
+기본은 비교(reconcile) 전략: Google 이벤트 ID → Lark 이벤트 ID 로컬 인덱스
+(~/.daily-focus/mirror_index.db)로 기존 미러를 찾아, 실제로 달라진 이벤트만
+생성/수정/삭제한다. 인덱스에 없는 날짜는 Lark 일정을 한 번 조회해서
+(설명에 저장된 Google 이벤트 ID로) 인덱스를 채운다.
+--recreate를 주면 기존 미러링 이벤트(🔄 접두사)를 모두 삭제 후 재생성한다.
 
 사용법:
     python3 scripts/gcal_sync.py              # 내일 1일치 동기화
-    python3 scripts/gcal_sync.py --days 7     # 7일치 동기화
+    python3 scripts/gcal_sync.py --days 7     # 7일치 동기화 (Google/Lark 각각 기간 전체를 한 번에 조회)
     python3 scripts/gcal_sync.py --days 3 --dry-run  # 미리보기
+    python3 scripts/gcal_sync.py --recreate   # 전체 삭제 후 재생성
+    python3 scripts/gcal_sync.py --rebuild-index  # 인덱스를 버리고 Lark 조회로 다시 채움
+    python3 scripts/gcal_sync.py --days 7 --incremental  # syncToken으로 바뀐 Google 이벤트만 조회
+    python3 scripts/gcal_sync.py --days 7 --workers 8 --rate 20  # 8개 동시 작업, Lark 초당 20회 제한
 """
 
 import os
+import re
 import sys
 import json
 import argparse
-import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -29,16 +37,31 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from lark_calendar import (
     _get_token, get_primary_calendar_id,
-    list_events_for_date, delete_event, get_next_workday
+    list_events_for_date, list_events_for_range, group_events_by_date,
+    delete_event, get_next_workday, invalidate_snapshot
 )
+from lark_calendar import EVENT_NOT_FOUND_CODES
+from lark_client import lark_request, configure_rate_limit, DEFAULT_RATE_LIMIT
+from mirror_index import MirrorIndex, content_hash
+from gcal_sync_state import GoogleSyncState
+from calendar_event import CalendarEvent, MIRROR_PREFIX
 
 # Google Calendar API
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
-MIRROR_PREFIX = "🔄"
+# 미러링 이벤트 설명에 남기는 원본 Google 이벤트 ID (비교 동기화의 키)
+MIRROR_KEY_PREFIX = "gcal_id:"
+MIRROR_KEY_PATTERN = re.compile(r"^gcal_id:\s*(\S+)", re.MULTILINE)
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 
+# 날짜 단위 / Lark 쓰기 단위 동시 작업 수 기본값
+DEFAULT_WORKERS = 4
+
+# --incremental: 전체 동기화 때 캐시해 둘 기간 (이 범위를 벗어나는 날짜를 요청하면 다시 전체 동기화)
+INCREMENTAL_HORIZON_DAYS = 28
+
 
 def _get_google_credentials():
     """Google Service Account 인증 정보 로드
@@ -78,7 +101,7 @@ def fetch_google_events(service, calendar_id: str, target_date: datetime) -> lis
     """특정 날짜의 Google Calendar 이벤트 조회
 
     Returns:
-        list of dicts: [{summary, start_dt, end_dt, html_link, is_all_day}, ...]
+        list of dicts: [{id, summary, start_dt, end_dt, html_link, is_all_day}, ...]
     """
     # 날짜 범위 (KST 기준 하루)
     day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -87,82 +110,233 @@ def fetch_google_events(service, calendar_id: str, target_date: datetime) -> lis
     time_min = day_start.isoformat() + "+09:00"
     time_max = day_end.isoformat() + "+09:00"
 
-    events_result = service.events().list(
+    items, _ = _list_all_pages(
+        service,
         calendarId=calendar_id,
         timeMin=time_min,
         timeMax=time_max,
         singleEvents=True,
         orderBy="startTime",
         timeZone="Asia/Seoul",
-    ).execute()
+    )
+    return [_parse_google_event(item) for item in items]
+
+
+def fetch_google_events_range(service, calendar_id: str, dates: list) -> dict:
+    """dates 전체 기간을 한 번의 (페이지 단위) 조회로 받아 날짜별로 묶기
+
+    Returns:
+        dict: {'YYYY-MM-DD': [{id, summary, start_dt, end_dt, html_link, is_all_day}, ...]}
+    """
+    range_start = dates[0].replace(hour=0, minute=0, second=0, microsecond=0)
+    range_end = dates[-1].replace(hour=23, minute=59, second=59, microsecond=0)
 
-    items = events_result.get("items", [])
-    parsed = []
+    items, _ = _list_all_pages(
+        service,
+        calendarId=calendar_id,
+        timeMin=range_start.isoformat() + "+09:00",
+        timeMax=range_end.isoformat() + "+09:00",
+        singleEvents=True,
+        orderBy="startTime",
+        timeZone="Asia/Seoul",
+    )
 
+    events_by_date = {target_date.strftime("%Y-%m-%d"): [] for target_date in dates}
     for item in items:
-        summary = item.get("summary", "(제목 없음)")
-        html_link = item.get("htmlLink", "")
-        start = item.get("start", {})
-        end = item.get("end", {})
-
-        # 종일 이벤트 판별
-        if "dateTime" not in start:
-            parsed.append({
-                "summary": summary,
-                "start_dt": None,
-                "end_dt": None,
-                "html_link": html_link,
-                "is_all_day": True,
-            })
-            continue
-
-        start_dt = datetime.fromisoformat(start["dateTime"])
-        end_dt = datetime.fromisoformat(end["dateTime"])
-
-        parsed.append({
+        event_date = _google_event_date(item)
+        if event_date in events_by_date:
+            events_by_date[event_date].append(_parse_google_event(item))
+
+    return events_by_date
+
+
+def _parse_google_event(item: dict) -> dict:
+    """Google Calendar API 이벤트 → {id, summary, start_dt, end_dt, html_link, is_all_day}"""
+    summary = item.get("summary", "(제목 없음)")
+    html_link = item.get("htmlLink", "")
+    start = item.get("start", {})
+    end = item.get("end", {})
+
+    # 종일 이벤트 판별
+    if "dateTime" not in start:
+        return {
+            "id": item.get("id"),
             "summary": summary,
-            "start_dt": start_dt,
-            "end_dt": end_dt,
+            "start_dt": None,
+            "end_dt": None,
             "html_link": html_link,
-            "is_all_day": False,
-        })
+            "is_all_day": True,
+        }
+
+    return {
+        "id": item.get("id"),
+        "summary": summary,
+        "start_dt": datetime.fromisoformat(start["dateTime"]),
+        "end_dt": datetime.fromisoformat(end["dateTime"]),
+        "html_link": html_link,
+        "is_all_day": False,
+    }
+
+
+def _google_event_date(item: dict) -> str:
+    """Google 이벤트의 날짜 (YYYY-MM-DD, timeZone=Asia/Seoul 기준 시작일)"""
+    start = item.get("start", {})
+    return (start.get("dateTime") or start.get("date") or "")[:10]
+
+
+def _sort_parsed_events(events: list) -> list:
+    """종일 이벤트 먼저, 그 다음 시작 시각 순"""
+    return sorted(events, key=lambda e: (not e["is_all_day"], e["start_dt"] or datetime.min))
 
-    return parsed
+
+def _list_all_pages(service, **params):
+    """events().list 전체 페이지 조회
+
+    Returns:
+        (items, next_sync_token)
+    """
+    items = []
+    page_token = None
+    while True:
+        events_result = service.events().list(pageToken=page_token, **params).execute()
+        items.extend(events_result.get("items", []))
+        page_token = events_result.get("nextPageToken")
+        if not page_token:
+            return items, events_result.get("nextSyncToken")
+
+
+def _full_google_sync(service, state: GoogleSyncState, calendar_id: str,
+                      horizon_start: datetime, horizon_end: datetime) -> None:
+    """horizon 범위 전체를 받아 캐시를 교체하고 새 syncToken 저장"""
+    print(f"  📥 Google 전체 동기화 ({horizon_start.strftime('%m/%d')} ~ {horizon_end.strftime('%m/%d')})")
+    items, sync_token = _list_all_pages(
+        service,
+        calendarId=calendar_id,
+        timeMin=horizon_start.isoformat() + "+09:00",
+        timeMax=horizon_end.isoformat() + "+09:00",
+        singleEvents=True,
+        timeZone="Asia/Seoul",
+    )
+    items = [item for item in items if item.get("status") != "cancelled"]
+    state.replace_all(
+        calendar_id, items, sync_token,
+        horizon_start.strftime("%Y-%m-%d"), horizon_end.strftime("%Y-%m-%d"),
+        _google_event_date
+    )
+
+
+def fetch_google_events_incremental(service, state: GoogleSyncState, calendar_id: str,
+                                    dates: list) -> dict:
+    """syncToken으로 바뀐/취소된 이벤트만 받아 캐시에 반영한 뒤 날짜별 이벤트 반환
+
+    저장된 syncToken이 없거나, 요청 날짜가 캐시 범위(horizon)를 벗어나거나,
+    Google이 410 Gone(토큰 만료)을 돌려주면 전체 동기화로 전환한다.
+
+    Returns:
+        dict: {'YYYY-MM-DD': [{id, summary, start_dt, end_dt, html_link, is_all_day}, ...]}
+    """
+    first = dates[0].replace(hour=0, minute=0, second=0, microsecond=0)
+    last = dates[-1].replace(hour=23, minute=59, second=59, microsecond=0)
+    first_str = first.strftime("%Y-%m-%d")
+    last_str = last.strftime("%Y-%m-%d")
+
+    saved = state.get_state(calendar_id)
+    covered = (
+        saved and saved.get("sync_token")
+        and saved["horizon_start"] <= first_str and last_str <= saved["horizon_end"]
+    )
+
+    if not covered:
+        horizon_end = max(last, first.replace(hour=23, minute=59, second=59)
+                          + timedelta(days=INCREMENTAL_HORIZON_DAYS))
+        _full_google_sync(service, state, calendar_id, first, horizon_end)
+    else:
+        try:
+            items, sync_token = _list_all_pages(
+                service,
+                calendarId=calendar_id,
+                syncToken=saved["sync_token"],
+                singleEvents=True,
+                timeZone="Asia/Seoul",
+            )
+        except HttpError as e:
+            if e.resp.status != 410:
+                raise
+            print("  ⚠️ Google syncToken 만료 (410) → 전체 동기화")
+            state.reset(calendar_id)
+            return fetch_google_events_incremental(service, state, calendar_id, dates)
+
+        # 취소됐거나 캐시 범위를 벗어난 이벤트는 캐시에서 제거
+        changed = []
+        removed_ids = []
+        for item in items:
+            event_date = _google_event_date(item)
+            if (item.get("status") == "cancelled"
+                    or not saved["horizon_start"] <= event_date <= saved["horizon_end"]):
+                removed_ids.append(item["id"])
+            else:
+                changed.append(item)
+
+        state.apply_changes(calendar_id, changed, removed_ids, sync_token, _google_event_date)
+        print(f"  📥 Google 증분 동기화: 변경 {len(changed)}개, 취소/범위 밖 {len(removed_ids)}개")
+
+    return {
+        target_date.strftime("%Y-%m-%d"): _sort_parsed_events([
+            _parse_google_event(item)
+            for item in state.items_for_date(calendar_id, target_date.strftime("%Y-%m-%d"))
+        ])
+        for target_date in dates
+    }
 
 
 def find_mirrored_events(events: list) -> list:
-    """Lark 이벤트 목록에서 미러링된 이벤트(🔄 접두사) 필터링"""
-    mirrored = []
-    for event in events:
-        summary = event.get("summary", "")
-        if MIRROR_PREFIX in summary:
-            mirrored.append(event)
-    return mirrored
+    """Lark 이벤트(CalendarEvent) 목록에서 미러링된 이벤트(🔄 접두사) 필터링"""
+    return [event for event in events if event.kind == "mirror"]
 
 
-def delete_mirrored_events(events: list) -> int:
+def _run_writes(executor, fn, items: list) -> list:
+    """Lark 쓰기 작업 실행 (executor가 있으면 동시에, 없으면 순서대로)
+
+    요청 간격은 lark_client의 공용 rate limiter가 맞춘다.
+    """
+    if executor is None or len(items) <= 1:
+        return [fn(item) for item in items]
+    return list(executor.map(fn, items))
+
+
+def _merge_outcomes(result: dict, outcomes: list) -> None:
+    """쓰기 작업 결과({created/updated/deleted: n, errors: [...]})를 날짜 결과에 합산"""
+    for outcome in outcomes:
+        for key, value in outcome.items():
+            if key == "errors":
+                result["errors"].extend(value)
+            else:
+                result[key] += value
+
+
+def delete_mirrored_events(events: list, executor=None) -> int:
     """미러링된 이벤트 일괄 삭제"""
-    deleted = 0
-    for event in events:
-        event_id = event.get("event_id")
-        summary = event.get("summary", "")
-        if event_id and delete_event(event_id):
-            print(f"  🗑️ 삭제: {summary}")
-            deleted += 1
-            time.sleep(0.1)  # Rate limit 방지
-    return deleted
+    def _delete(event):
+        if event.event_id and delete_event(event.event_id):
+            print(f"  🗑️ 삭제: {event.summary}")
+            return True
+        return False
 
+    return sum(_run_writes(executor, _delete, events))
 
-def create_mirrored_event(calendar_id: str, token: str,
-                          summary: str, description: str,
-                          start_dt: datetime, end_dt: datetime) -> bool:
-    """Google 이벤트를 Lark 캘린더에 미러링 생성"""
-    url = f"https://open.larksuite.com/open-apis/calendar/v4/calendars/{calendar_id}/events"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    payload = {
+
+def _build_mirror_description(event: dict) -> str:
+    """미러링 이벤트 설명 (원본 링크 + 비교 동기화용 Google 이벤트 ID)"""
+    description = f"Google Calendar 미러링\n원본: {event['html_link']}"
+    if event.get("id"):
+        description += f"\n{MIRROR_KEY_PREFIX} {event['id']}"
+    return description
+
+
+def _build_mirror_payload(summary: str, description: str,
+                          start_dt: datetime, end_dt: datetime) -> dict:
+    """미러링 이벤트 생성/수정 요청 본문"""
+    return {
         "summary": f"{MIRROR_PREFIX} {summary}",
         "description": description,
         "start_time": {
@@ -175,20 +349,358 @@ def create_mirrored_event(calendar_id: str, token: str,
         "free_busy_status": "busy"
     }
 
-    response = requests.post(url, headers=headers, json=payload)
-    data = response.json()
+
+def get_mirror_key(lark_event: CalendarEvent):
+    """Lark 미러링 이벤트 설명에서 원본 Google 이벤트 ID 추출 (없으면 None)"""
+    match = MIRROR_KEY_PATTERN.search(lark_event.description)
+    return match.group(1) if match else None
+
+
+def _payload_hash(payload: dict) -> str:
+    """미러링 요청 본문(payload)의 내용 해시"""
+    return content_hash(
+        payload["summary"], payload["description"],
+        payload["start_time"]["timestamp"], payload["end_time"]["timestamp"]
+    )
+
+
+def _lark_event_hash(lark_event: CalendarEvent) -> str:
+    """Lark 이벤트의 내용 해시 (_payload_hash와 같은 기준)"""
+    return content_hash(lark_event.summary, lark_event.description,
+                        lark_event.start, lark_event.end)
+
+
+def _event_payload(event: dict) -> dict:
+    """Google 이벤트 → 미러링 요청 본문"""
+    return _build_mirror_payload(
+        event["summary"], _build_mirror_description(event),
+        event["start_dt"], event["end_dt"]
+    )
+
+
+def existing_mirrors_from_lark(mirrored: list):
+    """Lark 미러링 이벤트 목록 → (Google 이벤트 ID별 미러, 키 없는/중복 미러 목록)
+
+    Returns:
+        (existing, orphans)
+        - existing: {google_event_id: {lark_event_id, content_hash, summary}}
+        - orphans: 설명에 키가 없는(레거시) 또는 같은 키가 중복된 Lark 이벤트 목록
+    """
+    existing = {}
+    orphans = []
+    for lark_event in mirrored:
+        key = get_mirror_key(lark_event)
+        if key and key not in existing:
+            existing[key] = {
+                "lark_event_id": lark_event.event_id,
+                "content_hash": _lark_event_hash(lark_event),
+                "summary": lark_event.summary,
+            }
+        else:
+            orphans.append(lark_event)
+    return existing, orphans
+
+
+def existing_mirrors_from_index(index: MirrorIndex, event_date: str) -> dict:
+    """인덱스에 기록된 해당 날짜의 미러 → {google_event_id: {lark_event_id, content_hash, summary}}"""
+    return {row["google_event_id"]: row for row in index.for_date(event_date)}
+
+
+def plan_mirror_changes(timed_events: list, existing: dict):
+    """Google 이벤트와 기존 미러를 Google 이벤트 ID로 맞춰 변경 목록 계산
+
+    Args:
+        timed_events: fetch_google_events()의 시간 지정 이벤트 목록
+        existing: {google_event_id: {lark_event_id, content_hash, summary}}
+
+    Returns:
+        (to_create, to_update, to_delete, unchanged)
+        - to_create: 미러가 없는 Google 이벤트 목록
+        - to_update: (기존 미러, Google 이벤트) 튜플 목록
+        - to_delete: (google_event_id, 기존 미러) 튜플 목록 — 원본이 사라진 미러
+        - unchanged: (기존 미러, Google 이벤트) 튜플 목록
+    """
+    remaining = dict(existing)
+    to_create = []
+    to_update = []
+    unchanged = []
+
+    for event in timed_events:
+        mirror = remaining.pop(event["id"], None) if event.get("id") else None
+        if mirror is None:
+            to_create.append(event)
+        elif mirror["content_hash"] != _payload_hash(_event_payload(event)):
+            to_update.append((mirror, event))
+        else:
+            unchanged.append((mirror, event))
+
+    to_delete = list(remaining.items())
+    return to_create, to_update, to_delete, unchanged
+
+
+def create_mirrored_event(calendar_id: str, token: str,
+                          summary: str, description: str,
+                          start_dt: datetime, end_dt: datetime):
+    """Google 이벤트를 Lark 캘린더에 미러링 생성
+
+    Returns:
+        str: 생성된 Lark 이벤트 ID, 실패 시 None
+    """
+    payload = _build_mirror_payload(summary, description, start_dt, end_dt)
+
+    data = lark_request("POST", f"/calendar/v4/calendars/{calendar_id}/events", token, json=payload)
 
     if data.get("code") != 0:
         print(f"  ❌ 이벤트 생성 실패: {summary} - {data.get('msg')}")
-        return False
+        return None
+    invalidate_snapshot()
 
     print(f"  ✅ 생성: {MIRROR_PREFIX} {summary} ({start_dt.strftime('%H:%M')}-{end_dt.strftime('%H:%M')})")
+    return data.get("data", {}).get("event", {}).get("event_id") or ""
+
+
+def update_mirrored_event(calendar_id: str, token: str, event_id: str,
+                          summary: str, description: str,
+                          start_dt: datetime, end_dt: datetime):
+    """기존 미러링 이벤트를 Google 이벤트 내용으로 수정
+
+    Returns:
+        True: 수정 성공, None: Lark에서 이벤트가 사라짐 (재생성 필요), False: 그 외 실패
+    """
+    payload = _build_mirror_payload(summary, description, start_dt, end_dt)
+
+    data = lark_request("PATCH", f"/calendar/v4/calendars/{calendar_id}/events/{event_id}", token,
+                        json=payload)
+
+    if data.get("code") in EVENT_NOT_FOUND_CODES:
+        print(f"  ⚠️ 미러가 Lark에서 삭제됨: {summary} (재생성)")
+        return None
+
+    if data.get("code") != 0:
+        print(f"  ❌ 이벤트 수정 실패: {summary} - {data.get('msg')}")
+        return False
+    invalidate_snapshot()
+
+    print(f"  ✏️ 수정: {MIRROR_PREFIX} {summary} ({start_dt.strftime('%H:%M')}-{end_dt.strftime('%H:%M')})")
     return True
 
 
+def _create_and_index(index: MirrorIndex, lark_calendar_id: str, token: str,
+                      event: dict, event_date: str) -> dict:
+    """미러 생성 후 인덱스에 기록
+
+    Returns:
+        dict: 쓰기 작업 결과 ({"created": 1} 또는 {"errors": [...]})
+    """
+    try:
+        payload = _event_payload(event)
+        lark_event_id = create_mirrored_event(
+            lark_calendar_id, token,
+            event["summary"], payload["description"],
+            event["start_dt"], event["end_dt"]
+        )
+    except Exception as e:
+        print(f"  ⚠️ 이벤트 생성 실패: {event['summary']} - {e}")
+        return {"errors": [str(e)]}
+
+    if lark_event_id is None:
+        return {"errors": [f"생성 실패: {event['summary']}"]}
+
+    if lark_event_id:
+        index.upsert(event["id"], lark_event_id, _payload_hash(payload), event_date, payload["summary"])
+    return {"created": 1}
+
+
+def _locked_by_event(index: MirrorIndex, google_event_id: str, fn):
+    """같은 Google 이벤트의 미러 쓰기+인덱스 기록을 날짜 스레드 사이에서 직렬화"""
+    if not google_event_id:
+        return fn()
+    with index.event_lock(google_event_id):
+        return fn()
+
+
+def _update_and_index(index: MirrorIndex, lark_calendar_id: str, token: str,
+                      mirror: dict, event: dict, event_date: str) -> dict:
+    """내용이 바뀐 미러 수정 후 인덱스 갱신 (Lark에서 사라졌으면 재생성)"""
+    try:
+        payload = _event_payload(event)
+        success = update_mirrored_event(
+            lark_calendar_id, token, mirror["lark_event_id"],
+            event["summary"], payload["description"],
+            event["start_dt"], event["end_dt"]
+        )
+    except Exception as e:
+        print(f"  ⚠️ 이벤트 수정 실패: {event['summary']} - {e}")
+        return {"errors": [str(e)]}
+
+    if success:
+        index.upsert(event["id"], mirror["lark_event_id"], _payload_hash(payload),
+                     event_date, payload["summary"])
+        return {"updated": 1}
+
+    if success is None:
+        index.remove(event["id"], event_date)
+        return _create_and_index(index, lark_calendar_id, token, event, event_date)
+
+    return {"errors": [f"수정 실패: {event['summary']}"]}
+
+
+def _delete_and_unindex(index: MirrorIndex, google_event_id: str, mirror: dict,
+                        event_date: str) -> dict:
+    """원본이 사라진(또는 다른 날짜로 옮겨진) 미러 삭제 후 그 날짜의 인덱스에서 제거"""
+    if delete_event(mirror["lark_event_id"]):
+        print(f"  🗑️ 삭제: {mirror['summary']}")
+        index.remove(google_event_id, event_date)
+        return {"deleted": 1}
+    return {"errors": [f"삭제 실패: {mirror['summary']}"]}
+
+
+def _index_unchanged(index: MirrorIndex, unchanged: list, event_date: str) -> None:
+    """Lark 조회로 찾은 (변경 없는) 기존 미러를 인덱스에 기록"""
+    for mirror, event in unchanged:
+        index.upsert(event["id"], mirror["lark_event_id"], mirror["content_hash"],
+                     event_date, mirror["summary"])
+
+
+def _recreate_mirrors(index: MirrorIndex, target_date: datetime, timed_events: list,
+                      mirrored: list, result: dict, dry_run: bool, executor=None) -> None:
+    """기존 미러링 이벤트를 모두 삭제하고 Google 이벤트를 전부 다시 생성 (--recreate)"""
+    event_date = target_date.strftime("%Y-%m-%d")
+
+    # 1. Lark Calendar에서 기존 미러링 이벤트 삭제
+    if mirrored:
+        print(f"  🗑️ 기존 미러링 이벤트 {len(mirrored)}개 삭제" + (" 예정" if dry_run else ""))
+        if not dry_run:
+            result["deleted"] = delete_mirrored_events(mirrored, executor)
+    else:
+        print("  🗑️ 기존 미러링 이벤트 없음")
+
+    if not dry_run:
+        index.forget_date(event_date)
+
+    # 2. Google 이벤트 → Lark 이벤트 생성
+    if not timed_events:
+        print("  ➡️ 생성할 이벤트 없음")
+        if not dry_run:
+            index.mark_date_indexed(event_date)
+        return
+
+    lark_calendar_id = get_primary_calendar_id()
+    token = _get_token()
+
+    if not lark_calendar_id or not token:
+        result["errors"].append("Lark 인증 실패")
+        return
+
+    print(f"  ➕ {len(timed_events)}개 이벤트 생성" + (" 예정" if dry_run else ""))
+    if dry_run:
+        return
+
+    _merge_outcomes(result, _run_writes(
+        executor,
+        lambda event: _create_and_index(index, lark_calendar_id, token, event, event_date),
+        timed_events
+    ))
+
+    index.mark_date_indexed(event_date)
+
+
+def _reconcile_mirrors(index: MirrorIndex, target_date: datetime, timed_events: list,
+                       result: dict, dry_run: bool, lark_events: list = None, executor=None) -> None:
+    """Google 이벤트 ID 기준으로 달라진 미러만 생성/수정/삭제 (기본 전략)
+
+    인덱스가 해당 날짜를 알고 있으면 Lark 조회 없이 인덱스만으로 비교하고,
+    모르면 Lark 일정(lark_events, 없으면 여기서 조회)으로 비교한 뒤 인덱스를 채운다.
+    """
+    event_date = target_date.strftime("%Y-%m-%d")
+    orphans = []
+    indexed = index.is_date_indexed(event_date)
+
+    if indexed:
+        existing = existing_mirrors_from_index(index, event_date)
+        print(f"  📇 인덱스의 기존 미러 {len(existing)}개")
+    else:
+        if lark_events is None:
+            lark_events = list_events_for_date(target_date)
+        if lark_events is None:
+            # 조회 실패를 빈 날로 보면 미러를 전부 중복 생성하고 인덱스도 틀리게 기록된다
+            print("  ❌ Lark 일정 조회 실패 - 이 날짜는 건너뜀")
+            result["errors"].append("Lark 일정 조회 실패")
+            return
+        existing, orphans = existing_mirrors_from_lark(find_mirrored_events(lark_events))
+
+    to_create, to_update, to_delete, unchanged = plan_mirror_changes(timed_events, existing)
+    result["unchanged"] = len(unchanged)
+
+    if not (to_create or to_update or to_delete or orphans):
+        print(f"  ✅ 변경 없음 (미러 {len(unchanged)}개 유지)")
+        if not dry_run and not indexed:
+            _index_unchanged(index, unchanged, event_date)
+            index.mark_date_indexed(event_date)
+        return
+
+    suffix = " 예정" if dry_run else ""
+    print(f"  🔁 생성 {len(to_create)} / 수정 {len(to_update)} / "
+          f"삭제 {len(to_delete) + len(orphans)} / 유지 {len(unchanged)}{suffix}")
+    if dry_run:
+        return
+
+    # 1. 키 없는(레거시)/중복 미러 정리
+    if orphans:
+        result["deleted"] += delete_mirrored_events(orphans, executor)
+
+    # 2. 원본이 사라진 미러 삭제
+    _merge_outcomes(result, _run_writes(
+        executor,
+        lambda item: _locked_by_event(
+            index, item[0], lambda: _delete_and_unindex(index, item[0], item[1], event_date)
+        ),
+        to_delete
+    ))
+
+    # 3. Lark 조회로 찾은 기존 미러 기록
+    if not indexed:
+        _index_unchanged(index, unchanged, event_date)
+
+    if to_create or to_update:
+        lark_calendar_id = get_primary_calendar_id()
+        token = _get_token()
+
+        if not lark_calendar_id or not token:
+            result["errors"].append("Lark 인증 실패")
+            return
+
+        # 4. 내용이 바뀐 미러 수정 + 새 미러 생성 (동시에)
+        writes = [("update", item) for item in to_update] + [("create", event) for event in to_create]
+
+        def _write(write):
+            kind, item = write
+            if kind == "update":
+                return _locked_by_event(index, item[1].get("id"), lambda: _update_and_index(
+                    index, lark_calendar_id, token, item[0], item[1], event_date
+                ))
+            return _locked_by_event(index, item.get("id"), lambda: _create_and_index(
+                index, lark_calendar_id, token, item, event_date
+            ))
+
+        _merge_outcomes(result, _run_writes(executor, _write, writes))
+
+    # 실패한 생성은 인덱스에 없으므로 다음 동기화 때 다시 시도된다
+    index.mark_date_indexed(event_date)
+
+
 def sync_date(service, google_calendar_id: str, target_date: datetime,
-              dry_run: bool = False) -> dict:
-    """특정 날짜의 Google → Lark 동기화 실행"""
+              dry_run: bool = False, recreate: bool = False, index: MirrorIndex = None,
+              google_events: list = None, lark_events: list = None, executor=None) -> dict:
+    """특정 날짜의 Google → Lark 동기화 실행
+
+    Args:
+        recreate: True면 기존 미러를 모두 삭제 후 재생성, False면 달라진 것만 반영
+        index: 미러링 인덱스 (없으면 기본 경로의 인덱스 사용)
+        google_events: 미리 조회한 해당 날짜의 Google 이벤트 (없으면 여기서 조회)
+        lark_events: 미리 조회한 해당 날짜의 Lark 일정 (필요할 때만 여기서 조회)
+        executor: Lark 쓰기(생성/수정/삭제)를 동시에 실행할 ThreadPoolExecutor (없으면 순서대로)
+    """
     weekday_names = ['월', '화', '수', '목', '금', '토', '일']
     day_name = weekday_names[target_date.weekday()]
     date_str = target_date.strftime('%m/%d')
@@ -198,6 +710,8 @@ def sync_date(service, google_calendar_id: str, target_date: datetime,
         "google_events": 0,
         "deleted": 0,
         "created": 0,
+        "updated": 0,
+        "unchanged": 0,
         "skipped_all_day": 0,
         "errors": [],
     }
@@ -206,7 +720,8 @@ def sync_date(service, google_calendar_id: str, target_date: datetime,
     print(f"\n{prefix} {date_str}({day_name}) 동기화")
 
     # 1. Google Calendar 이벤트 조회
-    google_events = fetch_google_events(service, google_calendar_id, target_date)
+    if google_events is None:
+        google_events = fetch_google_events(service, google_calendar_id, target_date)
     result["google_events"] = len(google_events)
 
     timed_events = [e for e in google_events if not e["is_all_day"]]
@@ -220,50 +735,21 @@ def sync_date(service, google_calendar_id: str, target_date: datetime,
     for e in all_day_events:
         print(f"    - [종일] {e['summary']} (스킵)")
 
-    # 2. Lark Calendar에서 기존 미러링 이벤트 삭제
-    lark_events = list_events_for_date(target_date)
-    mirrored = find_mirrored_events(lark_events)
-
-    if mirrored:
-        print(f"  🗑️ 기존 미러링 이벤트 {len(mirrored)}개 삭제" + (" 예정" if dry_run else ""))
-        if not dry_run:
-            result["deleted"] = delete_mirrored_events(mirrored)
+    # 2. 반영
+    if index is None:
+        index = MirrorIndex()
+
+    if recreate:
+        if lark_events is None:
+            lark_events = list_events_for_date(target_date)
+        if lark_events is None:
+            print("  ❌ Lark 일정 조회 실패 - 이 날짜는 건너뜀")
+            result["errors"].append("Lark 일정 조회 실패")
+            return result
+        mirrored = find_mirrored_events(lark_events)
+        _recreate_mirrors(index, target_date, timed_events, mirrored, result, dry_run, executor)
     else:
-        print("  🗑️ 기존 미러링 이벤트 없음")
-
-    # 3. Google 이벤트 → Lark 이벤트 생성
-    if not timed_events:
-        print("  ➡️ 생성할 이벤트 없음")
-        return result
-
-    lark_calendar_id = get_primary_calendar_id()
-    token = _get_token()
-
-    if not lark_calendar_id or not token:
-        result["errors"].append("Lark 인증 실패")
-        return result
-
-    print(f"  ➕ {len(timed_events)}개 이벤트 생성" + (" 예정" if dry_run else ""))
-
-    for event in timed_events:
-        if dry_run:
-            continue
-
-        description = f"Google Calendar 미러링\n원본: {event['html_link']}"
-        try:
-            success = create_mirrored_event(
-                lark_calendar_id, token,
-                event["summary"], description,
-                event["start_dt"], event["end_dt"]
-            )
-            if success:
-                result["created"] += 1
-            else:
-                result["errors"].append(f"생성 실패: {event['summary']}")
-            time.sleep(0.1)  # Rate limit 방지
-        except Exception as e:
-            print(f"  ⚠️ 이벤트 생성 실패: {event['summary']} - {e}")
-            result["errors"].append(str(e))
+        _reconcile_mirrors(index, target_date, timed_events, result, dry_run, lark_events, executor)
 
     return result
 
@@ -273,8 +759,20 @@ def main():
     parser = argparse.ArgumentParser(description="Google Calendar → Lark Calendar 동기화")
     parser.add_argument("--days", type=int, default=1, help="동기화할 일수 (기본: 1 = 내일만)")
     parser.add_argument("--dry-run", action="store_true", help="실제 생성/삭제 없이 미리보기만")
+    parser.add_argument("--recreate", action="store_true",
+                        help="달라진 것만 반영하지 않고 기존 미러링 이벤트를 모두 삭제 후 재생성")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="대상 날짜의 미러링 인덱스를 버리고 Lark 조회로 다시 채움")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Google syncToken으로 지난 실행 이후 바뀐 이벤트만 조회")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"날짜/Lark 쓰기 동시 작업 수 (기본: {DEFAULT_WORKERS}, 1 = 순서대로)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_LIMIT,
+                        help=f"Lark API 초당 요청 수 상한 (기본: {DEFAULT_RATE_LIMIT:g}, LARK_RATE_LIMIT)")
     args = parser.parse_args()
 
+    configure_rate_limit(args.rate)
+
     google_calendar_id = os.getenv("GOOGLE_CALENDAR_ID")
     if not google_calendar_id:
         print("❌ GOOGLE_CALENDAR_ID 환경변수가 설정되지 않았습니다.")
@@ -300,24 +798,74 @@ def main():
     print(f"📧 Google Calendar: {google_calendar_id}")
     print(f"{'=' * 50}")
 
-    # 날짜별 동기화
-    results = []
-    for target_date in dates:
+    index = MirrorIndex()
+    if args.rebuild_index:
+        for target_date in dates:
+            index.forget_date(target_date.strftime("%Y-%m-%d"))
+
+    # 기간 전체를 한 번에 조회 (Google 1회 + 필요한 경우 Lark 1회)
+    if args.incremental:
+        events_by_date = fetch_google_events_incremental(
+            service, GoogleSyncState(), google_calendar_id, dates
+        )
+    else:
+        events_by_date = fetch_google_events_range(service, google_calendar_id, dates)
+
+    # 인덱스가 모르는 날짜만 Lark 일정이 필요 (--recreate는 전체)
+    lark_dates = dates if args.recreate else [
+        d for d in dates if not index.is_date_indexed(d.strftime("%Y-%m-%d"))
+    ]
+    lark_by_date = {}
+    if lark_dates:
+        lark_events = list_events_for_range(lark_dates[0], lark_dates[-1])
+        if lark_events is None:
+            # 빈 날로 취급하지 않고 이 날짜들은 건너뜀 (인덱스도 그대로 미색인)
+            print("❌ Lark 일정 조회 실패 - 인덱스에 없는 날짜는 이번 동기화에서 건너뜁니다.")
+            lark_by_date = None
+        else:
+            lark_by_date = group_events_by_date(lark_events)
+
+    # 날짜별 동기화 (날짜 단위 + Lark 쓰기 단위로 동시 실행, 간격은 rate limiter가 조절)
+    workers = max(1, args.workers)
+    if workers > 1:
+        get_primary_calendar_id()  # 캘린더 ID를 먼저 캐시해 두어 스레드마다 조회하지 않게 함
+
+    def _failed(date_key, error):
+        return {
+            "date": date_key,
+            "google_events": 0, "deleted": 0, "created": 0,
+            "updated": 0, "unchanged": 0,
+            "skipped_all_day": 0, "errors": [error]
+        }
+
+    def _sync_one(target_date, write_executor):
+        date_key = target_date.strftime("%Y-%m-%d")
+        if lark_by_date is None and target_date in lark_dates:
+            return _failed(date_key, "Lark 일정 조회 실패")
         try:
-            result = sync_date(service, google_calendar_id, target_date, args.dry_run)
-            results.append(result)
+            return sync_date(service, google_calendar_id, target_date,
+                             args.dry_run, args.recreate, index,
+                             events_by_date.get(date_key, []),
+                             lark_by_date.get(date_key, []) if target_date in lark_dates else None,
+                             write_executor)
         except Exception as e:
             print(f"\n❌ {target_date.strftime('%m/%d')} 동기화 실패: {e}")
-            results.append({
-                "date": target_date.strftime("%Y-%m-%d"),
-                "google_events": 0, "deleted": 0, "created": 0,
-                "skipped_all_day": 0, "errors": [str(e)]
-            })
+            return _failed(date_key, str(e))
+
+    if workers == 1:
+        results = [_sync_one(target_date, None) for target_date in dates]
+    else:
+        # 날짜 스레드가 쓰기 풀을 기다리므로 두 풀을 분리해 교착을 피한다
+        with ThreadPoolExecutor(max_workers=workers) as write_executor, \
+                ThreadPoolExecutor(max_workers=min(workers, len(dates))) as day_executor:
+            results = list(day_executor.map(lambda d: _sync_one(d, write_executor), dates))
 
     # 요약 출력
     total_google = sum(r["google_events"] for r in results)
     total_deleted = sum(r["deleted"] for r in results)
     total_created = sum(r["created"] for r in results)
+    total_updated = sum(r["updated"] for r in results)
+    total_unchanged = sum(r["unchanged"] for r in results)
     total_skipped = sum(r["skipped_all_day"] for r in results)
     total_errors = sum(len(r["errors"]) for r in results)
 
@@ -326,6 +874,8 @@ def main():
     print(f"  Google 이벤트: {total_google}개")
     print(f"  삭제 (기존 미러링): {total_deleted}개")
     print(f"  생성: {total_created}개")
+    print(f"  수정: {total_updated}개")
+    print(f"  유지 (변경 없음): {total_unchanged}개")
     print(f"  스킵 (종일): {total_skipped}개")
     if total_errors:
         print(f"  ⚠️ 에러: {total_errors}건")
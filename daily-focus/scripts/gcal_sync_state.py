@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Google Calendar 증분 동기화 상태 (SQLite)
+
+Calendar API의 nextSyncToken과, 그 토큰 시점까지 받아 둔 Google 이벤트를
+소스 캘린더별로 저장한다. gcal_sync.py --incremental이 다음 실행 때
+syncToken으로 바뀐/취소된 이벤트만 받아 이 캐시에 반영한다.
+
+테이블:
+    sync_state  — calendar_id → sync_token, 캐시가 담고 있는 날짜 범위(horizon)
+    events      — (calendar_id, event_id) → event_date, 원본 이벤트 JSON
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+
+STATE_DB_FILE = Path.home() / '.daily-focus' / 'gcal_sync_state.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    calendar_id   TEXT PRIMARY KEY,
+    sync_token    TEXT,
+    horizon_start TEXT NOT NULL,
+    horizon_end   TEXT NOT NULL,
+    updated_at    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    event_id    TEXT NOT NULL,
+    event_date  TEXT NOT NULL,
+    item_json   TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_events_date ON events (calendar_id, event_date);
+"""
+
+
+class GoogleSyncState:
+    """소스 캘린더별 syncToken + 이벤트 캐시 (스레드 간 공유 가능)"""
+
+    def __init__(self, path: Path = STATE_DB_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_state(self, calendar_id: str):
+        """저장된 상태 {sync_token, horizon_start, horizon_end} (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM sync_state WHERE calendar_id = ?", (calendar_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def replace_all(self, calendar_id: str, items: list, sync_token: str,
+                    horizon_start: str, horizon_end: str, date_of) -> None:
+        """전체 동기화 결과로 캐시를 통째로 교체
+
+        Args:
+            date_of: date_of(item) -> 'YYYY-MM-DD' (이벤트 날짜 계산 함수)
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO events (calendar_id, event_id, event_date, item_json) VALUES (?, ?, ?, ?)",
+                [(calendar_id, item["id"], date_of(item), json.dumps(item, ensure_ascii=False))
+                 for item in items]
+            )
+            self._save_state(calendar_id, sync_token, horizon_start, horizon_end)
+
+    def apply_changes(self, calendar_id: str, changed: list, removed_ids: list, sync_token: str,
+                      date_of) -> None:
+        """증분 결과 반영 (변경 이벤트 upsert, 취소/범위 밖 이벤트 삭제, 새 syncToken 저장)"""
+        state = self.get_state(calendar_id)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM events WHERE calendar_id = ? AND event_id = ?",
+                [(calendar_id, event_id) for event_id in removed_ids]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO events (calendar_id, event_id, event_date, item_json) VALUES (?, ?, ?, ?)",
+                [(calendar_id, item["id"], date_of(item), json.dumps(item, ensure_ascii=False))
+                 for item in changed]
+            )
+            self._save_state(calendar_id, sync_token, state["horizon_start"], state["horizon_end"])
+
+    def items_for_date(self, calendar_id: str, event_date: str) -> list:
+        """캐시된 해당 날짜의 원본 이벤트 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_json FROM events WHERE calendar_id = ? AND event_date = ?",
+                (calendar_id, event_date)
+            ).fetchall()
+        return [json.loads(row["item_json"]) for row in rows]
+
+    def reset(self, calendar_id: str) -> None:
+        """syncToken과 캐시 삭제 (다음 실행 때 전체 동기화)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            self._conn.execute("DELETE FROM sync_state WHERE calendar_id = ?", (calendar_id,))
+
+    def _save_state(self, calendar_id, sync_token, horizon_start, horizon_end) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state (calendar_id, sync_token, horizon_start, horizon_end, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (calendar_id, sync_token, horizon_start, horizon_end, datetime.now().isoformat())
+        )
@@ -8,10 +8,12 @@ Lark 캘린더 관리 스크립트
     python3 lark_calendar.py --create-block --title "PRD 작성" --start "2026-02-06T10:00:00" --duration 180
 """
 
-import os
 import sys
+import json
+import asyncio
 import argparse
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -19,6 +21,40 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from lark_token_manager import get_valid_token
+from lark_client import lark_call, lark_request, async_lark_request
+from state_files import atomic_write_json
+from calendar_event import CalendarEvent, FOCUS_BLOCK_PREFIX
+from calendar_snapshot import CalendarSnapshot, SNAPSHOT_FILE, week_window
+from user_context import PerUser, getenv, propagate, state_path
+import focus_block_store
+from availability import (
+    AvailabilityPolicy, IntervalIndex, WEEK_POLICY, NIGHTLY_POLICY,
+    free_slots_for_day, free_slots_for_days
+)
+
+# Primary 캘린더 ID 캐시 (프로세스 메모리 + 디스크)
+CALENDAR_CACHE_FILE = Path.home() / '.daily-focus' / 'calendar_cache.json'
+CALENDAR_CACHE_TTL = timedelta(days=7)
+
+# Lark가 캘린더를 찾을 수 없을 때 돌려주는 에러 코드 (191000: 캘린더 없음, 191001: 잘못된 캘린더 ID)
+CALENDAR_NOT_FOUND_CODES = {191000, 191001}
+# 이벤트가 없을 때의 에러 코드 (이미 삭제된 이벤트)
+EVENT_NOT_FOUND_CODES = {193001}
+
+# instance_view 한 번에 조회할 수 있는 최대 기간 (일)
+INSTANCE_VIEW_MAX_DAYS = 40
+
+# /events 목록 조회 페이지 크기 (Lark 허용 범위 50~1000)
+DEFAULT_PAGE_SIZE = 500
+
+# freebusy/batch 한 번에 조회할 수 있는 최대 사용자 수
+FREEBUSY_BATCH_SIZE = 10
+
+# Focus Block 여러 개를 만들 때 동시에 보낼 요청 수
+FOCUS_BLOCK_WORKERS = 4
+
+# Primary 캘린더 ID 메모리 캐시 (사용자 컨텍스트마다 따로)
+_calendar_id = PerUser()
 
 
 def _get_token():
@@ -28,7 +64,7 @@ def _get_token():
         return token
 
     # 토큰 매니저 실패 시 환경변수 fallback
-    token = os.getenv("LARK_USER_TOKEN")
+    token = getenv("LARK_USER_TOKEN")
     if not token:
         print("❌ 유효한 Lark 토큰이 없습니다. python3 scripts/lark_oauth.py를 실행해주세요.")
     return token
@@ -58,26 +94,73 @@ def get_remaining_weekdays():
     return start_date, end_date
 
 
-def get_primary_calendar_id():
-    """Primary 캘린더 ID 조회 (type='primary'만 사용, Google 캘린더 제외)"""
-    token = _get_token()
-    if not token:
+def _load_cached_calendar_id():
+    """디스크에 캐시된 Primary 캘린더 ID 불러오기 (만료/다른 사용자면 None)"""
+    cache_file = state_path(CALENDAR_CACHE_FILE)
+    if not cache_file.exists():
+        return None
+
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+
+        if cache.get('open_id') != getenv("LARK_USER_OPEN_ID"):
+            return None
+        if datetime.now() >= datetime.fromisoformat(cache['expires_at']):
+            return None
+
+        return cache.get('calendar_id')
+    except (OSError, ValueError, KeyError):
         return None
 
-    url = "https://open.larksuite.com/open-apis/calendar/v4/calendars"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+
+def _save_cached_calendar_id(calendar_id: str):
+    """Primary 캘린더 ID를 디스크에 캐시"""
+    cache_file = state_path(CALENDAR_CACHE_FILE)
+    cache_file.parent.mkdir(exist_ok=True)
+
+    cache = {
+        'calendar_id': calendar_id,
+        'open_id': getenv("LARK_USER_OPEN_ID"),
+        'expires_at': (datetime.now() + CALENDAR_CACHE_TTL).isoformat(),
+        'updated_at': datetime.now().isoformat()
     }
 
-    response = requests.get(url, headers=headers)
-    data = response.json()
+    atomic_write_json(cache_file, cache)
+
 
-    if data.get("code") != 0:
-        print(f"❌ 캘린더 조회 실패: {data.get('msg')}")
+def invalidate_calendar_cache():
+    """캐시된 Primary 캘린더 ID 삭제 (메모리 + 디스크)"""
+    _calendar_id.set(None)
+    try:
+        state_path(CALENDAR_CACHE_FILE).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def get_primary_calendar_id():
+    """Primary 캘린더 ID 조회 (type='primary'만 사용, Google 캘린더 제외)
+
+    메모리 → 디스크 캐시(CALENDAR_CACHE_TTL) → API 순서로 조회한다.
+    """
+    calendar_id = _calendar_id.get()
+    if calendar_id:
+        return calendar_id
+
+    cached = _load_cached_calendar_id()
+    if cached:
+        _calendar_id.set(cached)
+        return cached
+
+    token = _get_token()
+    if not token:
+        return None
+
+    data = lark_call("GET", "/calendar/v4/calendars", token, action="캘린더 조회")
+    if data is None:
         return None
 
-    calendars = data.get("data", {}).get("calendar_list", [])
+    calendars = data.get("calendar_list", [])
 
     # type='primary'인 캘린더만 사용 (Google 캘린더는 지원 안 됨)
     primary = next((cal for cal in calendars if cal.get("type") == "primary"), None)
@@ -86,7 +169,52 @@ def get_primary_calendar_id():
         print("❌ Primary 캘린더를 찾을 수 없습니다.")
         return None
 
-    return primary["calendar_id"]
+    calendar_id = primary["calendar_id"]
+    _calendar_id.set(calendar_id)
+    _save_cached_calendar_id(calendar_id)
+    return calendar_id
+
+
+def _calendar_call(method: str, path: str, action: str, params: dict = None, json: dict = None,
+                   ignore_codes=()):
+    """Primary 캘린더 하위 API 호출 (path는 /calendars/{calendar_id} 뒤의 경로)
+
+    Lark가 캘린더를 찾을 수 없다고 응답하면 캐시를 무효화하고 한 번 재시도한다.
+    ignore_codes에 든 에러 코드는 성공으로 간주해 빈 dict를 반환한다.
+
+    Returns:
+        dict: 응답의 data 필드, 실패 시 None
+    """
+    for attempt in range(2):
+        calendar_id = get_primary_calendar_id()
+        if not calendar_id:
+            return None
+
+        token = _get_token()
+        if not token:
+            return None
+
+        result = lark_request(method, f"/calendar/v4/calendars/{calendar_id}{path}", token,
+                              params=params, json=json)
+
+        if result.get("code") in CALENDAR_NOT_FOUND_CODES and attempt == 0:
+            print("⚠️ 캐시된 캘린더를 찾을 수 없어 캘린더 ID를 다시 조회합니다.")
+            invalidate_calendar_cache()
+            continue
+
+        return _calendar_data(result, action, ignore_codes)
+
+
+def _calendar_data(result: dict, action: str, ignore_codes=()):
+    """캘린더 API 응답 → data 필드 (ignore_codes는 빈 dict, 그 외 실패는 에러 출력 후 None)"""
+    if result.get("code") in ignore_codes:
+        return {}
+
+    if result.get("code") != 0:
+        print(f"❌ {action} 실패: {result.get('msg')}")
+        return None
+
+    return result.get("data") or {}
 
 
 def list_today_events():
@@ -94,121 +222,163 @@ def list_today_events():
     return list_remaining_weekday_events()
 
 
-def list_remaining_weekday_events():
-    """이번 주 남은 평일 일정 조회 (오늘 ~ 금요일)"""
-    calendar_id = get_primary_calendar_id()
-    if not calendar_id:
-        return []
+def _iter_pages(path: str, params: dict, action: str, errors: list = None):
+    """목록 API를 페이지 단위로 따라가며 일정을 CalendarEvent로 하나씩 반환 (has_more/page_token)
 
-    # 이번 주 남은 평일 범위 계산
-    start_date, end_date = get_remaining_weekdays()
+    시각 정보가 없는 일정은 건너뛰고, 중간 페이지에서 실패하면
+    에러를 출력하고 거기까지만 반환한다 (errors 목록을 주면 실패를 기록).
+    """
+    params = dict(params)
+    while True:
+        data = _calendar_call("GET", path, action=action, params=params)
+        if data is None:
+            if errors is not None:
+                errors.append(f"{action} 실패: {path}")
+            return
+
+        yield from _page_events(data)
+
+        page_token = data.get("page_token")
+        if not data.get("has_more") or not page_token:
+            return
+        params["page_token"] = page_token
+
+
+def _page_events(data: dict) -> list:
+    """목록 API 한 페이지 → CalendarEvent 목록 (시각 정보가 없는 일정 제외)"""
+    events = []
+    for item in data.get("items") or []:
+        event = CalendarEvent.from_lark(item)
+        if event is not None:
+            events.append(event)
+    return events
 
-    # Unix timestamp (seconds)
-    range_start = int(start_date.timestamp())
-    range_end = int(end_date.replace(hour=23, minute=59, second=59).timestamp())
 
-    token = _get_token()
-    if not token:
-        return []
+def _instance_view_chunks(range_start: datetime, range_end: datetime):
+    """instance_view 요청 파라미터를 INSTANCE_VIEW_MAX_DAYS 단위로 나눠 반환"""
+    chunk_start = range_start
+    while chunk_start <= range_end:
+        chunk_end = min(range_end, chunk_start + timedelta(days=INSTANCE_VIEW_MAX_DAYS) - timedelta(seconds=1))
+        yield {
+            "start_time": str(int(chunk_start.timestamp())),
+            "end_time": str(int(chunk_end.timestamp()))
+        }
+        chunk_start = chunk_end + timedelta(seconds=1)
 
-    url = f"https://open.larksuite.com/open-apis/calendar/v4/calendars/{calendar_id}/events"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    params = {
-        "start_time": range_start,
-        "end_time": range_end
-    }
 
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
+def iter_events(range_start: datetime, range_end: datetime, page_size: int = DEFAULT_PAGE_SIZE,
+                instances: bool = True, errors: list = None):
+    """기간 일정을 페이지 단위로 받아 CalendarEvent로 하나씩 반환하는 제너레이터
 
-    if data.get("code") != 0:
-        print(f"❌ 일정 조회 실패: {data.get('msg')}")
-        return []
+    Args:
+        range_start, range_end: 조회 기간 (datetime)
+        page_size: /events 목록 조회 시 한 페이지 크기
+        instances: True면 instance_view(반복 일정을 실제 발생 시각으로 펼침,
+            INSTANCE_VIEW_MAX_DAYS 단위로 나눠 요청), False면 /events 목록 조회
+        errors: 실패 기록용 목록 (중간에 실패하면 메시지가 추가됨)
+    """
+    if not instances:
+        params = {
+            "start_time": str(int(range_start.timestamp())),
+            "end_time": str(int(range_end.timestamp())),
+            "page_size": page_size
+        }
+        yield from _iter_pages("/events", params, action="일정 조회", errors=errors)
+        return
 
-    events = data.get("data", {}).get("items", [])
+    for params in _instance_view_chunks(range_start, range_end):
+        yield from _iter_pages("/events/instance_view", params, action="일정 조회", errors=errors)
+        if errors:
+            return
 
-    # 디버그: 조회 범위 출력
-    print(f"📅 일정 조회 범위: {start_date.strftime('%m/%d(%a)')} ~ {end_date.strftime('%m/%d(%a)')}")
 
-    return events
+def _fetch_snapshot_window(range_start: datetime, range_end: datetime):
+    """스냅샷 창 하나 조회 (instance_view 전체, 중간에 실패하면 None)"""
+    errors = []
+    events = list(iter_events(range_start, range_end, errors=errors))
+    return None if errors else events
 
 
-def find_free_slots(duration_minutes: int, min_block_minutes: int = 30):
-    """빈 시간 찾기 - 이번 주 남은 평일 대상 (월~금, 10:00-19:00, 점심 제외)
+# 이번 실행 동안 주 단위로 받아 둔 일정 (일정 생성/삭제 시 invalidate_snapshot, 사용자마다 따로)
+_snapshot = PerUser(lambda: CalendarSnapshot(
+    _fetch_snapshot_window, owner=getenv("LARK_USER_OPEN_ID"), path=state_path(SNAPSHOT_FILE)
+))
 
-    Args:
-        duration_minutes: 필요한 총 시간 (참고용)
-        min_block_minutes: 최소 블록 크기 (기본 30분)
+
+def invalidate_snapshot():
+    """일정 스냅샷 폐기 (이 프로세스가 일정을 만들거나 지운 뒤 호출)"""
+    _snapshot.get().invalidate()
+
+
+def events_between(range_start: datetime, range_end: datetime):
+    """기간과 겹치는 일정 (스냅샷에서 반환, 없는 주만 API 조회)
 
     Returns:
-        list: (start_dt, end_dt, gap_minutes) 튜플의 리스트
+        list: CalendarEvent 목록 (시작 시각 순), 조회 실패 시 None
     """
-    # 남은 평일 범위 계산
-    start_date, end_date = get_remaining_weekdays()
+    return _snapshot.get().query(range_start, range_end)
 
-    # 평일 일정 조회
-    events = list_remaining_weekday_events()
 
-    # 날짜별로 빈 시간 찾기
-    all_free_slots = []
-    current_date = start_date
-
-    while current_date <= end_date:
-        # 주말 건너뛰기
-        if current_date.weekday() >= 5:
-            current_date += timedelta(days=1)
-            continue
+def iter_remaining_weekday_events(page_size: int = DEFAULT_PAGE_SIZE):
+    """이번 주 남은 평일 일정을 하나씩 반환 (오늘 ~ 금요일, 스냅샷 사용)"""
+    start_date, end_date = get_remaining_weekdays()
 
-        # 이 날짜의 근무시간 정의 (10:00 ~ 19:00)
-        work_start = current_date.replace(hour=10, minute=0, second=0, microsecond=0)
-        work_end = current_date.replace(hour=19, minute=0, second=0, microsecond=0)
+    # 디버그: 조회 범위 출력
+    print(f"📅 일정 조회 범위: {start_date.strftime('%m/%d(%a)')} ~ {end_date.strftime('%m/%d(%a)')}")
 
-        # 이 날짜의 바쁜 시간 수집
-        busy_slots = []
+    yield from events_between(start_date, end_date.replace(hour=23, minute=59, second=59)) or []
 
-        # 점심시간 추가 (11:00 ~ 12:00)
-        lunch_start = current_date.replace(hour=11, minute=0, second=0, microsecond=0)
-        lunch_end = current_date.replace(hour=12, minute=0, second=0, microsecond=0)
-        busy_slots.append((lunch_start, lunch_end))
 
-        # 이 날짜의 일정 추가
-        for event in events:
-            start = event.get("start_time", {})
-            end = event.get("end_time", {})
+def list_remaining_weekday_events():
+    """이번 주 남은 평일 일정 조회 (오늘 ~ 금요일)"""
+    return list(iter_remaining_weekday_events())
 
-            if "timestamp" in start and "timestamp" in end:
-                start_dt = datetime.fromtimestamp(int(start["timestamp"]))
-                end_dt = datetime.fromtimestamp(int(end["timestamp"]))
 
-                # 같은 날짜의 일정만 포함
-                if start_dt.date() == current_date.date():
-                    busy_slots.append((start_dt, end_dt))
+def find_free_slots(duration_minutes: int, min_block_minutes: int = 30, policy: AvailabilityPolicy = None,
+                    source=None):
+    """빈 시간 찾기 - 이번 주 남은 평일 대상 (월~금, 10:00-19:00, 점심 제외)
 
-        busy_slots.sort()
+    Args:
+        duration_minutes: 필요한 총 시간 (참고용)
+        min_block_minutes: 최소 블록 크기 (기본 30분)
+        policy: 빈 시간 계산 규칙 (기본 WEEK_POLICY)
+        source: 바쁜 시간 소스 (busy_source.py, 없으면 내 캘린더 일정 전체 조회)
 
-        # 빈 시간 찾기
-        current_time = work_start
+    Returns:
+        list: (start_dt, end_dt, gap_minutes) 튜플의 리스트
+    """
+    policy = (policy or WEEK_POLICY).with_min_block(min_block_minutes)
+    source = _source_for_policy(source, policy)
 
-        for busy_start, busy_end in busy_slots:
-            if busy_start > current_time:
-                gap_minutes = int((busy_start - current_time).total_seconds() / 60)
-                if gap_minutes >= min_block_minutes:
-                    all_free_slots.append((current_time, busy_start, gap_minutes))
+    # 남은 평일 범위 계산
+    start_date, end_date = get_remaining_weekdays()
+    days = []
+    current_date = start_date
+    while current_date <= end_date:
+        if current_date.weekday() < 5:
+            days.append(current_date)
+        current_date += timedelta(days=1)
 
-            current_time = max(current_time, busy_end)
+    if source is None:
+        # 평일 일정을 페이지 단위로 받으면서 인덱스 구축 → 날짜별 빈 시간
+        events = iter_remaining_weekday_events()
+    else:
+        user_id = getenv("LARK_USER_OPEN_ID")
+        busy_by_user, failed = source.fetch([user_id], start_date, end_date.replace(hour=23, minute=59, second=59))
+        if failed:
+            print("❌ 바쁜 시간을 가져오지 못해 빈 시간을 계산할 수 없습니다.")
+            return []
+        events = busy_by_user.get(user_id, [])
 
-        # 마지막 빈 시간 확인
-        if current_time < work_end:
-            gap_minutes = int((work_end - current_time).total_seconds() / 60)
-            if gap_minutes >= min_block_minutes:
-                all_free_slots.append((current_time, work_end, gap_minutes))
+    return free_slots_for_days(IntervalIndex(events), days, policy)
 
-        current_date += timedelta(days=1)
 
-    return all_free_slots
+def _source_for_policy(source, policy: AvailabilityPolicy):
+    """일정 단위 무시 규칙은 합쳐진 freebusy 구간에 적용할 수 없으므로 내 캘린더 조회(None)로 대체"""
+    if source is not None and policy.ignore_rules and not getattr(source, "per_event", True):
+        print("ℹ️ 일정 단위 무시 규칙이 있어 freebusy 대신 내 캘린더 일정으로 빈 시간을 계산합니다.")
+        return None
+    return source
 
 
 def get_next_workday(from_date=None):
@@ -225,140 +395,202 @@ def get_next_workday(from_date=None):
     return target
 
 
+def _day_range(target_date):
+    """날짜의 00:00:00 ~ 23:59:59"""
+    return (target_date.replace(hour=0, minute=0, second=0, microsecond=0),
+            target_date.replace(hour=23, minute=59, second=59, microsecond=0))
+
+
+def _print_day_count(target_date, count: int) -> None:
+    weekday_names = ['월', '화', '수', '목', '금', '토', '일']
+    day_name = weekday_names[target_date.weekday()]
+    print(f"📅 {target_date.strftime('%m/%d')}({day_name}) 일정 조회: {count}개")
+
+
 def list_events_for_date(target_date):
-    """특정 날짜의 일정 조회 (instance_view로 반복 일정의 실제 발생 시각 반환)"""
-    calendar_id = get_primary_calendar_id()
-    if not calendar_id:
-        return []
+    """특정 날짜의 일정 조회 (instance_view로 반복 일정의 실제 발생 시각 반환)
 
-    range_start = int(target_date.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
-    range_end = int(target_date.replace(hour=23, minute=59, second=59, microsecond=0).timestamp())
+    Returns:
+        list: CalendarEvent 목록, 조회 실패 시 None (빈 날과 구분)
+    """
+    events = events_between(*_day_range(target_date))
+    if events is None:
+        return None
+    _print_day_count(target_date, len(events))
+    return events
 
-    token = _get_token()
-    if not token:
-        return []
 
-    url = f"https://open.larksuite.com/open-apis/calendar/v4/calendars/{calendar_id}/events/instance_view"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    params = {
-        "start_time": str(range_start),
-        "end_time": str(range_end)
-    }
+def list_events_for_range(start_date, end_date):
+    """기간 일정 한 번에 조회 (start_date 00:00 ~ end_date 23:59:59, instance_view)
 
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
+    Returns:
+        list: CalendarEvent 목록, 조회 실패 시 None (빈 기간과 구분)
+    """
+    range_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    range_end = end_date.replace(hour=23, minute=59, second=59, microsecond=0)
 
-    if data.get("code") != 0:
-        print(f"❌ 일정 조회 실패: {data.get('msg')}")
-        return []
+    events = events_between(range_start, range_end)
+    if events is None:
+        return None
 
-    events = data.get("data", {}).get("items", [])
-    weekday_names = ['월', '화', '수', '목', '금', '토', '일']
-    day_name = weekday_names[target_date.weekday()]
-    print(f"📅 {target_date.strftime('%m/%d')}({day_name}) 일정 조회: {len(events)}개")
+    print(f"📅 {start_date.strftime('%m/%d')} ~ {end_date.strftime('%m/%d')} 일정 조회: {len(events)}개")
 
     return events
 
 
-def find_free_slots_for_date(target_date, duration_minutes: int, min_block_minutes: int = 30):
-    """특정 날짜의 빈 시간 찾기 (10:00-19:00, 점심 제외, 9:30-11:00 Focus 윈도우 내 일정 무시)
+def group_events_by_date(events: list) -> dict:
+    """일정(CalendarEvent) 목록을 시작 날짜별로 묶기
+
+    Returns:
+        dict: {'YYYY-MM-DD': [event, ...]}
+    """
+    grouped = {}
+    for event in events:
+        grouped.setdefault(event.day.isoformat(), []).append(event)
+    return grouped
+
+
+def _rfc3339(dt: datetime) -> str:
+    """datetime → RFC 3339 문자열 (naive면 로컬 시간대로 간주)"""
+    return dt.astimezone().isoformat(timespec="seconds")
+
+
+def _parse_rfc3339(value: str) -> int:
+    """RFC 3339 문자열 → epoch 초"""
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+def list_freebusy(user_id: str, range_start: datetime, range_end: datetime):
+    """사용자 한 명의 바쁜 구간 조회 (freebusy/list, 일정 내용 없이 시각만)
 
     Args:
-        target_date: 대상 날짜 (datetime)
-        duration_minutes: 필요한 총 시간 (참고용)
-        min_block_minutes: 최소 블록 크기 (기본 30분)
+        user_id: 조회할 사용자 open_id
 
     Returns:
-        list: (start_dt, end_dt, gap_minutes) 튜플의 리스트
+        list: [(start_ts, end_ts), ...] epoch 초, 실패 시 None
     """
-    events = list_events_for_date(target_date)
+    token = _get_token()
+    if not token:
+        return None
 
-    # 근무시간 정의
-    work_start = target_date.replace(hour=10, minute=0, second=0, microsecond=0)
-    work_end = target_date.replace(hour=19, minute=0, second=0, microsecond=0)
+    payload = {
+        "time_min": _rfc3339(range_start),
+        "time_max": _rfc3339(range_end),
+        "user_id": user_id
+    }
+    data = lark_call("POST", "/calendar/v4/freebusy/list", token, action=f"바쁜 시간 조회 ({user_id})",
+                     params={"user_id_type": "open_id"}, json=payload)
+    if data is None:
+        return None
 
-    # 9:30-11:00 Focus 전용 윈도우 (이 안의 일정은 무시)
-    focus_window_start = target_date.replace(hour=9, minute=30, second=0, microsecond=0)
-    focus_window_end = target_date.replace(hour=11, minute=0, second=0, microsecond=0)
+    return [(_parse_rfc3339(item["start_time"]), _parse_rfc3339(item["end_time"]))
+            for item in data.get("freebusy_list") or []]
 
-    # 바쁜 시간 수집
-    busy_slots = []
 
-    # 점심시간 (11:00-12:00)
-    lunch_start = target_date.replace(hour=11, minute=0, second=0, microsecond=0)
-    lunch_end = target_date.replace(hour=12, minute=0, second=0, microsecond=0)
-    busy_slots.append((lunch_start, lunch_end))
+def batch_freebusy(user_ids: list, range_start: datetime, range_end: datetime):
+    """여러 사용자의 바쁜 구간 한 번에 조회 (freebusy/batch, 최대 FREEBUSY_BATCH_SIZE명)
 
-    for event in events:
-        start = event.get("start_time", {})
-        end = event.get("end_time", {})
+    Returns:
+        dict: {user_id: [(start_ts, end_ts), ...]}, 실패 시 None (호출부가 freebusy/list로 대체)
+    """
+    token = _get_token()
+    if not token:
+        return None
 
-        if "timestamp" in start and "timestamp" in end:
-            start_dt = datetime.fromtimestamp(int(start["timestamp"]))
-            end_dt = datetime.fromtimestamp(int(end["timestamp"]))
+    payload = {
+        "time_min": _rfc3339(range_start),
+        "time_max": _rfc3339(range_end),
+        "user_ids": list(user_ids),
+        "include_external_calendar": True,
+        "only_busy": True
+    }
+    result = lark_request("POST", "/calendar/v4/freebusy/batch", token,
+                          params={"user_id_type": "open_id"}, json=payload)
+    if result.get("code") != 0:
+        return None
 
-            if start_dt.date() == target_date.date():
-                # 9:30-11:00 윈도우 안에 완전히 포함된 일정은 무시
-                if start_dt >= focus_window_start and end_dt <= focus_window_end:
-                    continue
+    busy = {}
+    for entry in (result.get("data") or {}).get("freebusy_lists") or []:
+        busy[entry.get("user_id")] = [
+            (_parse_rfc3339(item["start_time"]), _parse_rfc3339(item["end_time"]))
+            for item in entry.get("freebusy_items") or []
+        ]
+    return busy
 
-                # 종일 블록 무시 (8시간 이상: 재택, WFH 등 배경 일정)
-                duration_hrs = (end_dt - start_dt).total_seconds() / 3600
-                if duration_hrs >= 8:
-                    continue
 
-                # free_busy_status가 "free"인 일정 무시
-                if event.get("free_busy_status") == "free":
-                    continue
+def find_free_slots_for_days(days: list, min_block_minutes: int = 30,
+                             policy: AvailabilityPolicy = None, source=None) -> dict:
+    """여러 날짜의 빈 시간을 한 번의 기간 조회로 찾기
 
-                busy_slots.append((start_dt, end_dt))
+    Args:
+        days: 대상 날짜 목록 (datetime, 오름차순)
+        min_block_minutes: 최소 블록 크기 (기본 30분)
+        policy: 빈 시간 계산 규칙 (기본 NIGHTLY_POLICY)
+        source: 바쁜 시간 소스 (busy_source.py, 없으면 내 캘린더 일정 전체 조회)
 
-    busy_slots.sort()
+    Returns:
+        dict: {'YYYY-MM-DD': [(start_dt, end_dt, gap_minutes), ...]} (조회 실패 시 빈 dict)
+    """
+    if not days:
+        return {}
+
+    source = _source_for_policy(source, policy or NIGHTLY_POLICY)
+    days = [day.replace(hour=0, minute=0, second=0, microsecond=0) for day in days]
+    range_start = days[0]
+    range_end = days[-1].replace(hour=23, minute=59, second=59)
+
+    if source is None:
+        events = events_between(range_start, range_end)
+        if events is None:
+            print("❌ 일정을 가져오지 못해 빈 시간을 계산할 수 없습니다.")
+            return {}
+    else:
+        user_id = getenv("LARK_USER_OPEN_ID")
+        busy_by_user, failed = source.fetch([user_id], range_start, range_end)
+        if failed:
+            print("❌ 바쁜 시간을 가져오지 못해 빈 시간을 계산할 수 없습니다.")
+            return {}
+        events = busy_by_user.get(user_id, [])
 
-    # 빈 시간 찾기
-    free_slots = []
-    current_time = work_start
+    return _free_slots_from_events(events, days, min_block_minutes, policy)
 
-    for busy_start, busy_end in busy_slots:
-        if busy_start > current_time:
-            gap_minutes = int((busy_start - current_time).total_seconds() / 60)
-            if gap_minutes >= min_block_minutes:
-                free_slots.append((current_time, busy_start, gap_minutes))
-        current_time = max(current_time, busy_end)
 
-    # 마지막 빈 시간
-    if current_time < work_end:
-        gap_minutes = int((work_end - current_time).total_seconds() / 60)
-        if gap_minutes >= min_block_minutes:
-            free_slots.append((current_time, work_end, gap_minutes))
+def _free_slots_from_events(events, days: list, min_block_minutes: int,
+                            policy: AvailabilityPolicy = None) -> dict:
+    """받아 온 일정으로 날짜별 빈 시간 계산 (days는 00:00으로 맞춘 datetime, 오름차순)"""
+    policy = (policy or NIGHTLY_POLICY).with_min_block(min_block_minutes)
+    index = IntervalIndex(events)
 
-    return free_slots
+    if len(days) == 1:
+        _print_day_count(days[0], len(index))
+    else:
+        print(f"📅 {days[0].strftime('%m/%d')} ~ {days[-1].strftime('%m/%d')} 일정 조회: {len(index)}개")
 
+    return {day.strftime("%Y-%m-%d"): free_slots_for_day(index, day, policy) for day in days}
 
-def create_focus_block(title: str, start_time: str, duration_minutes: int):
-    """Focus Block 생성"""
-    calendar_id = get_primary_calendar_id()
-    if not calendar_id:
-        return False
 
-    token = _get_token()
-    if not token:
-        return False
+def find_free_slots_for_date(target_date, duration_minutes: int, min_block_minutes: int = 30,
+                             policy: AvailabilityPolicy = None, source=None):
+    """특정 날짜의 빈 시간 찾기 (10:00-19:00, 점심 제외, 9:30-11:00 Focus 윈도우 내 일정 무시)
 
-    # 시작/종료 시간 계산
-    start_dt = datetime.fromisoformat(start_time)
-    end_dt = start_dt + timedelta(minutes=duration_minutes)
+    Args:
+        target_date: 대상 날짜 (datetime)
+        duration_minutes: 필요한 총 시간 (참고용)
+        min_block_minutes: 최소 블록 크기 (기본 30분)
+        policy: 빈 시간 계산 규칙 (기본 NIGHTLY_POLICY)
+        source: 바쁜 시간 소스 (busy_source.py, 없으면 내 캘린더 일정 전체 조회)
 
-    url = f"https://open.larksuite.com/open-apis/calendar/v4/calendars/{calendar_id}/events"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "summary": f"🔒 {title}",
+    Returns:
+        list: (start_dt, end_dt, gap_minutes) 튜플의 리스트
+    """
+    slots_by_date = find_free_slots_for_days([target_date], min_block_minutes, policy, source)
+    return slots_by_date.get(target_date.strftime("%Y-%m-%d"), [])
+
+
+def _focus_block_payload(title: str, start_dt: datetime, end_dt: datetime) -> dict:
+    """Focus Block 생성 요청 본문"""
+    return {
+        "summary": f"{FOCUS_BLOCK_PREFIX} {title}",
         "description": "Focus Block - 이 시간엔 미팅이 끼어들 수 없어요!",
         "start_time": {
             "timestamp": str(int(start_dt.timestamp()))
@@ -370,60 +602,357 @@ def create_focus_block(title: str, start_time: str, duration_minutes: int):
         "free_busy_status": "busy"
     }
 
-    response = requests.post(url, headers=headers, json=payload)
-    data = response.json()
 
-    if data.get("code") != 0:
-        print(f"❌ Focus Block 생성 실패: {data.get('msg')}")
+def _focus_block_window(start_time: str, duration_minutes: int):
+    """ISO 시작 시각 + 길이 → (start_dt, end_dt)"""
+    start_dt = datetime.fromisoformat(start_time)
+    return start_dt, start_dt + timedelta(minutes=duration_minutes)
+
+
+def create_focus_block(title: str, start_time: str, duration_minutes: int):
+    """Focus Block 생성"""
+    start_dt, end_dt = _focus_block_window(start_time, duration_minutes)
+
+    payload = _focus_block_payload(title, start_dt, end_dt)
+
+    data = _calendar_call("POST", "/events", action="Focus Block 생성", json=payload)
+    if data is None:
         return False
+    invalidate_snapshot()
 
     print(f"✅ Focus Block 생성 성공: {title} ({start_dt.strftime('%H:%M')}-{end_dt.strftime('%H:%M')})")
     return True
 
 
-def delete_event(event_id: str):
-    """이벤트 삭제"""
-    calendar_id = get_primary_calendar_id()
-    if not calendar_id:
-        return False
+def create_focus_blocks(blocks: list, max_workers: int = FOCUS_BLOCK_WORKERS) -> list:
+    """Focus Block 여러 개를 동시에 생성
 
-    token = _get_token()
-    if not token:
-        return False
+    캘린더 ID와 토큰은 한 번만 가져오고, 생성 요청은 동시에 보낸다
+    (요청 간격은 lark_client의 공용 rate limiter가 맞춘다).
 
-    url = f"https://open.larksuite.com/open-apis/calendar/v4/calendars/{calendar_id}/events/{event_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+    Args:
+        blocks: [(title, start_time, duration_minutes), ...] (start_time은 ISO 8601 또는 datetime)
+
+    Returns:
+        list: 블록 순서대로 {"title", "start", "duration", "success", "event_id", "error"}
+    """
+    if not blocks:
+        return []
+
+    results = []
+    for title, start_time, duration_minutes in blocks:
+        start_dt = start_time if isinstance(start_time, datetime) else datetime.fromisoformat(start_time)
+        results.append({
+            "title": title,
+            "start": start_dt.isoformat(),
+            "duration": duration_minutes,
+            "success": False,
+            "event_id": None,
+            "error": None,
+        })
+
+    def _create(result, calendar_id, token):
+        start_dt = datetime.fromisoformat(result["start"])
+        end_dt = start_dt + timedelta(minutes=result["duration"])
+        response = lark_request("POST", f"/calendar/v4/calendars/{calendar_id}/events", token,
+                                json=_focus_block_payload(result["title"], start_dt, end_dt))
+        code = response.get("code")
+        if code == 0:
+            event = (response.get("data") or {}).get("event") or {}
+            result.update(success=True, event_id=event.get("event_id"), error=None)
+        else:
+            result["error"] = response.get("msg")
+        return code
+
+    pending = results
+    for attempt in range(2):
+        calendar_id = get_primary_calendar_id()
+        token = _get_token()
+        if not calendar_id or not token:
+            for result in pending:
+                result["error"] = "캘린더 또는 토큰 없음"
+            break
+
+        workers = max(1, min(max_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            codes = list(executor.map(propagate(lambda r: _create(r, calendar_id, token)), pending))
+
+        # 캐시된 캘린더를 찾을 수 없으면 캘린더 ID를 다시 조회해서 실패한 것만 한 번 더
+        if 0 in codes:
+            invalidate_snapshot()
+
+        retry = [r for r, code in zip(pending, codes) if code in CALENDAR_NOT_FOUND_CODES]
+        if not retry or attempt == 1:
+            break
+        print("⚠️ 캐시된 캘린더를 찾을 수 없어 캘린더 ID를 다시 조회합니다.")
+        invalidate_calendar_cache()
+        pending = retry
+
+    for result in results:
+        start_dt = datetime.fromisoformat(result["start"])
+        end_dt = start_dt + timedelta(minutes=result["duration"])
+        time_range = f"{start_dt.strftime('%m/%d %H:%M')}-{end_dt.strftime('%H:%M')}"
+        if result["success"]:
+            print(f"✅ Focus Block 생성 성공: {result['title']} ({time_range})")
+        else:
+            print(f"❌ Focus Block 생성 실패: {result['title']} ({time_range}) - {result['error']}")
+
+    return results
 
-    response = requests.delete(url, headers=headers)
-    data = response.json()
 
-    if data.get("code") != 0:
-        print(f"❌ 이벤트 삭제 실패: {data.get('msg')}")
+def delete_event(event_id: str):
+    """이벤트 삭제 (이미 없는 이벤트도 성공으로 처리)"""
+    data = _calendar_call("DELETE", f"/events/{event_id}", action="이벤트 삭제",
+                          ignore_codes=EVENT_NOT_FOUND_CODES)
+    if data is None:
         return False
+    invalidate_snapshot()
 
     print(f"✅ 이벤트 삭제 성공: {event_id}")
     return True
 
 
-def delete_focus_blocks_today(keyword: str = "🔒"):
-    """오늘 생성된 Focus Block 삭제"""
-    events = list_today_events()
+def _delete_events(event_ids: list, max_workers: int = FOCUS_BLOCK_WORKERS) -> list:
+    """이벤트 여러 개를 동시에 삭제 → 삭제에 성공한 이벤트 ID 목록"""
+    if not event_ids:
+        return []
+    workers = max(1, min(max_workers, len(event_ids)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(propagate(delete_event), event_ids))
+    return [event_id for event_id, ok in zip(event_ids, results) if ok]
+
+
+def reconcile_focus_blocks(plan: str, desired: list, prune: bool = True) -> dict:
+    """기록된 Focus Block과 원하는 블록을 비교해 필요한 생성/삭제만 (동시에) 실행
+
+    같은 계획을 다시 실행해도 이미 있는 블록은 그대로 두므로 중복 생성되지 않는다.
+
+    Args:
+        plan: 블록 묶음 키 (focus_block_store 참고)
+        desired: [(title, start_time, duration_minutes), ...]
+        prune: True면 이 계획의 기록 중 desired에 없는 블록 삭제
+
+    Returns:
+        dict: {"created": create_focus_blocks 결과 목록, "kept": 유지한 기록 목록,
+               "deleted": 삭제한 이벤트 수}
+    """
+    records = focus_block_store.load_blocks(plan)
+
+    # 사용자가 Lark에서 지운 블록은 "유지"가 아니라 다시 만들 대상 (기록만 정리)
+    missing_ids = _missing_from_calendar(records)
+    if missing_ids:
+        print(f"⚠️ 캘린더에서 사라진 Focus Block {len(missing_ids)}개 - 기록에서 제외")
+
+    existing = {}
+    for block in records:
+        if block["event_id"] in missing_ids:
+            continue
+        existing.setdefault(focus_block_store.block_key(block["title"], block["start"], block["duration"]), block)
+
+    to_create = []
+    kept = []
+    seen = set()
+    for title, start_time, duration_minutes in desired:
+        start_iso = start_time.isoformat() if isinstance(start_time, datetime) else start_time
+        key = focus_block_store.block_key(title, start_iso, duration_minutes)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in existing:
+            kept.append(existing[key])
+        else:
+            to_create.append((title, start_iso, duration_minutes))
+
+    stale = [block["event_id"] for key, block in existing.items() if prune and key not in seen]
+
+    print(f"🔁 Focus Block 비교: 생성 {len(to_create)} / 삭제 {len(stale)} / 유지 {len(kept)}")
+
+    # 생성과 삭제를 함께 진행
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        created_future = executor.submit(propagate(create_focus_blocks), to_create)
+        deleted_future = executor.submit(propagate(_delete_events), stale)
+        created = created_future.result()
+        deleted_ids = deleted_future.result()
+
+    added = [
+        {"event_id": r["event_id"], "plan": plan, "title": r["title"],
+         "start": r["start"], "duration": r["duration"]}
+        for r in created if r["success"] and r["event_id"]
+    ]
+    focus_block_store.record_changes(added, list(deleted_ids) + sorted(missing_ids))
+
+    return {"created": created, "kept": kept, "deleted": len(deleted_ids)}
+
+
+def _missing_from_calendar(records: list) -> set:
+    """기록된 블록 중 캘린더에 실제로 없는 이벤트 ID (스냅샷 조회, 실패하면 기록을 그대로 믿음)"""
+    if not records:
+        return set()
+
+    starts = [datetime.fromisoformat(block["start"]) for block in records]
+    ends = [start + timedelta(minutes=block["duration"]) for start, block in zip(starts, records)]
+    events = events_between(min(starts), max(ends))
+    if events is None:
+        print("⚠️ 일정을 조회하지 못해 Focus Block 기록을 그대로 사용합니다.")
+        return set()
+
+    live_ids = {event.event_id for event in events}
+    return {block["event_id"] for block in records if block["event_id"] not in live_ids}
+
+
+def delete_focus_blocks_today(keyword: str = FOCUS_BLOCK_PREFIX):
+    """이번 주 남은 평일의 Focus Block 삭제
+
+    기록(focus_block_store)된 블록은 바로 동시에 삭제하고, 기록에 없는 블록
+    (예전 버전으로 만든 블록 등)은 일정을 조회해 keyword로 찾아 삭제한다.
+    """
+    recorded_ids = set()
     deleted_count = 0
 
+    if focus_block_store.has_records():
+        start_date, end_date = get_remaining_weekdays()
+        end_date = end_date.replace(hour=23, minute=59, second=59)
+        records = focus_block_store.load_blocks()
+        recorded_ids = {block["event_id"] for block in records}
+        targets = [
+            block for block in records
+            if start_date <= datetime.fromisoformat(block["start"]) <= end_date
+        ]
+        deleted_ids = _delete_events([block["event_id"] for block in targets])
+        for block in targets:
+            if block["event_id"] in deleted_ids:
+                print(f"  삭제: {FOCUS_BLOCK_PREFIX} {block['title']}")
+        focus_block_store.record_changes(removed_ids=deleted_ids)
+        deleted_count += len(deleted_ids)
+
+    # 삭제하면서 페이지를 넘기지 않도록 목록을 먼저 모두 받는다
+    events = list_today_events()
+
     for event in events:
-        summary = event.get("summary", "")
-        if keyword in summary:
-            event_id = event.get("event_id")
-            if event_id and delete_event(event_id):
+        if keyword in event.summary and event.event_id not in recorded_ids:
+            if event.event_id and delete_event(event.event_id):
                 deleted_count += 1
-                print(f"  삭제: {summary}")
+                print(f"  삭제: {event.summary}")
 
     return deleted_count
 
 
+# ---------- asyncio 버전 ----------
+# 동기 함수와 같은 요청 본문/파싱/스냅샷을 쓰고, HTTP만 async_lark_request (aiohttp).
+# 토큰/캘린더 ID는 대부분 캐시에서 바로 나오지만 갱신 시 파일 락을 잡으므로 스레드에서 조회.
+
+
+async def _async_calendar_call(method: str, path: str, action: str, params: dict = None,
+                               json: dict = None, ignore_codes=()):
+    """_calendar_call의 asyncio 버전"""
+    for attempt in range(2):
+        calendar_id = await asyncio.to_thread(get_primary_calendar_id)
+        if not calendar_id:
+            return None
+
+        token = await asyncio.to_thread(_get_token)
+        if not token:
+            return None
+
+        result = await async_lark_request(method, f"/calendar/v4/calendars/{calendar_id}{path}", token,
+                                          params=params, json=json)
+
+        if result.get("code") in CALENDAR_NOT_FOUND_CODES and attempt == 0:
+            print("⚠️ 캐시된 캘린더를 찾을 수 없어 캘린더 ID를 다시 조회합니다.")
+            invalidate_calendar_cache()
+            continue
+
+        return _calendar_data(result, action, ignore_codes)
+
+
+async def _async_fetch_window(range_start: datetime, range_end: datetime):
+    """instance_view 조회 (asyncio, 40일 단위 구간은 동시에) → CalendarEvent 목록, 실패 시 None"""
+
+    async def fetch_chunk(params):
+        events = []
+        params = dict(params)
+        while True:
+            data = await _async_calendar_call("GET", "/events/instance_view", action="일정 조회", params=params)
+            if data is None:
+                return None
+            events.extend(_page_events(data))
+            page_token = data.get("page_token")
+            if not data.get("has_more") or not page_token:
+                return events
+            params["page_token"] = page_token
+
+    chunks = await asyncio.gather(*(fetch_chunk(p) for p in _instance_view_chunks(range_start, range_end)))
+    if any(chunk is None for chunk in chunks):
+        return None
+    return [event for chunk in chunks for event in chunk]
+
+
+async def async_events_between(range_start: datetime, range_end: datetime):
+    """events_between의 asyncio 버전 (같은 스냅샷 사용, 없는 주만 조회)"""
+    snapshot = _snapshot.get()
+    events = snapshot.peek(range_start, range_end)
+    if events is not None:
+        return events
+
+    generation = snapshot.generation
+    window_start, window_end = week_window(range_start, range_end)
+    events = await _async_fetch_window(window_start, window_end)
+    if events is None:
+        return None
+    snapshot.store(window_start, window_end, events, generation)
+
+    start_ts, end_ts = int(range_start.timestamp()), int(range_end.timestamp())
+    return sorted((e for e in events if e.start <= end_ts and e.end > start_ts), key=lambda e: e.start)
+
+
+async def async_list_events_for_date(target_date):
+    """list_events_for_date의 asyncio 버전 (조회 실패 시 None)"""
+    events = await async_events_between(*_day_range(target_date))
+    if events is None:
+        return None
+    _print_day_count(target_date, len(events))
+    return events
+
+
+async def async_find_free_slots_for_date(target_date, duration_minutes: int, min_block_minutes: int = 30,
+                                         policy: AvailabilityPolicy = None):
+    """find_free_slots_for_date의 asyncio 버전 (내 캘린더 일정 기준)"""
+    day, day_end = _day_range(target_date)
+    events = await async_events_between(day, day_end)
+    if events is None:
+        print("❌ 일정을 가져오지 못해 빈 시간을 계산할 수 없습니다.")
+        return []
+    slots_by_date = _free_slots_from_events(events, [day], min_block_minutes, policy)
+    return slots_by_date.get(day.strftime("%Y-%m-%d"), [])
+
+
+async def async_create_focus_block(title: str, start_time: str, duration_minutes: int):
+    """create_focus_block의 asyncio 버전"""
+    start_dt, end_dt = _focus_block_window(start_time, duration_minutes)
+
+    payload = _focus_block_payload(title, start_dt, end_dt)
+
+    data = await _async_calendar_call("POST", "/events", action="Focus Block 생성", json=payload)
+    if data is None:
+        return False
+    invalidate_snapshot()
+
+    print(f"✅ Focus Block 생성 성공: {title} ({start_dt.strftime('%H:%M')}-{end_dt.strftime('%H:%M')})")
+    return True
+
+
+async def async_delete_event(event_id: str):
+    """delete_event의 asyncio 버전"""
+    data = await _async_calendar_call("DELETE", f"/events/{event_id}", action="이벤트 삭제",
+                                      ignore_codes=EVENT_NOT_FOUND_CODES)
+    if data is None:
+        return False
+    invalidate_snapshot()
+
+    print(f"✅ 이벤트 삭제 성공: {event_id}")
+    return True
+
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description="Lark 캘린더 관리")
@@ -440,20 +969,16 @@ def main():
         events = list_today_events()
         print(f"📅 오늘 일정 ({len(events)}개):")
         for event in events:
-            summary = event.get("summary", "제목 없음")
-            start = event.get("start_time", {})
-            end = event.get("end_time", {})
-
-            if "timestamp" in start and "timestamp" in end:
-                start_dt = datetime.fromtimestamp(int(start["timestamp"]))
-                end_dt = datetime.fromtimestamp(int(end["timestamp"]))
-                print(f"  - {start_dt.strftime('%H:%M')}-{end_dt.strftime('%H:%M')} {summary}")
+            if event.is_timed:
+                summary = event.summary or "제목 없음"
+                print(f"  - {event.start_dt.strftime('%H:%M')}-{event.end_dt.strftime('%H:%M')} {summary}")
 
     elif args.find_gaps:
         if not args.duration:
             print("❌ --duration 옵션이 필요합니다.")
             sys.exit(1)
 
+        # 내 캘린더 일정 기준 (freebusy는 free 일정을 빼고 종일 일정을 넣어 결과가 달라짐)
         free_slots = find_free_slots(args.duration)
         print(f"🔍 빈 시간 ({args.duration}분 이상):")
         for start, end, gap_minutes in free_slots:
@@ -464,7 +989,8 @@ def main():
             print("❌ --title, --start, --duration 옵션이 모두 필요합니다.")
             sys.exit(1)
 
-        create_focus_block(args.title, args.start, args.duration)
+        # 같은 블록을 다시 만들면 기록을 보고 건너뛴다
+        reconcile_focus_blocks("cli", [(args.title, args.start, args.duration)], prune=False)
 
     else:
         parser.print_help()
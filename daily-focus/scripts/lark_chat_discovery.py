@@ -12,7 +12,6 @@ Lark 그룹 채팅 ID 조회 스크립트
 import os
 import sys
 import json
-import requests
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -20,27 +19,19 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 sys.path.insert(0, str(Path(__file__).parent))
 
 from lark_tenant_token import get_valid_tenant_token
-
-BASE_URL = "https://open.larksuite.com/open-apis"
+from lark_client import lark_call
+from state_files import atomic_write_text
 
 
 def list_bot_chats():
     """봇이 참여한 채팅 목록 조회"""
     token = get_valid_tenant_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-
-    url = f"{BASE_URL}/im/v1/chats"
-    response = requests.get(url, headers=headers)
-    data = response.json()
 
-    if data.get("code") != 0:
-        print(f"❌ 채팅 목록 조회 실패: {data.get('msg')}")
+    data = lark_call("GET", "/im/v1/chats", token, action="채팅 목록 조회")
+    if data is None:
         return []
 
-    chats = data.get("data", {}).get("items", [])
+    chats = data.get("items", [])
     return chats
 
 
@@ -66,7 +57,7 @@ def save_chat_id_to_env(chat_id: str):
     else:
         content += f"\nLARK_CHAT_ID={chat_id}\n"
 
-    env_path.write_text(content, encoding="utf-8")
+    atomic_write_text(env_path, content)
     print(f"✅ LARK_CHAT_ID={chat_id} → .env 저장 완료")
     return True
 
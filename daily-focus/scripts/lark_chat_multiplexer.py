@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+여러 채팅 메시지 대기 (asyncio 멀티플렉서)
+
+lark_event_listener.py는 채팅 하나(LARK_CHAT_ID)를 프로세스 하나가 붙잡고
+기다린다. 조직 전체를 돌리려면 사용자마다 프로세스가 필요해서, 여기서는
+이벤트 루프 하나가 수백 개 채팅을 함께 지켜본다.
+
+    - 채팅마다 커서(MessageCursor)와 폴링 간격(1초 → 30초)을 따로 둔다
+    - 기다리는 대화가 있는 채팅만 폴링한다 (대기 없는 채팅은 비용 0)
+    - 동시에 나가는 조회 수는 max_concurrency로 제한 (요청 속도는 lark_client 공용 제한)
+    - aiohttp가 있으면 메시지 조회도 스레드 없이 asyncio로 (없으면 asyncio.to_thread)
+    - LARK_LISTENER_MODE가 callback/ws면 수신기 하나로 모든 채팅의 메시지를 받아
+      chat_id로 나눠 준다 (수신기가 끊기면 폴링으로 대체)
+    - 받은 답장은 그 채팅을 기다리는 future로 전달
+
+채팅이 수백 개면 폴링만으로는 30초 간격에서도 Lark 요청 한도에 닿으므로
+푸시 모드(callback/ws)를 권장한다.
+
+사용법:
+    # asyncio 코드에서
+    mux = ChatMultiplexer()
+    await mux.start()
+    await mux.clear(chat_id)
+    reply = await mux.wait_for_message(chat_id, timeout_minutes=15)
+
+    # 스레드에서 (루프를 백그라운드 스레드로 실행)
+    mux = ChatMultiplexer()
+    mux.start_background()
+    mux.clear_blocking(chat_id)
+    reply = mux.wait_blocking(chat_id, timeout_minutes=15)
+
+    # 테스트: 채팅 여러 개를 동시에 대기
+    python3 scripts/lark_chat_multiplexer.py oc_xxx oc_yyy --timeout 1
+"""
+
+import sys
+import asyncio
+import argparse
+import threading
+
+from lark_client import async_available, close_async_session
+from lark_event_listener import (
+    LISTENER_MODE, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_BACKOFF, PUSH_CHECK_INTERVAL,
+    MessageCursor, fetch_messages_since, async_fetch_messages_since,
+    find_user_message, message_text, start_receiver
+)
+
+# 동시에 진행하는 메시지 조회 수
+DEFAULT_CONCURRENCY = 8
+
+
+class _ChatState:
+    """채팅 하나의 커서, 대기 중인 future, 폴링 일정"""
+
+    def __init__(self, chat_id: str):
+        self.chat_id = chat_id
+        self.cursor = MessageCursor()
+        self.waiters = []
+        self.pending = None  # 기다리는 대화가 없을 때 푸시로 먼저 도착한 답장
+        self.interval = POLL_MIN_INTERVAL
+        self.next_poll = 0.0
+        self.polling = False
+
+
+class ChatMultiplexer:
+    """채팅 여러 개를 이벤트 루프 하나에서 대기
+
+    Args:
+        fetch: fetch(start_time, chat_id) -> [message, ...] | None, 코루틴 함수도 가능
+            (기본: aiohttp가 있으면 async_fetch_messages_since, 없으면 fetch_messages_since)
+        mode: 수신 방식 (poll / callback / ws, 기본: LARK_LISTENER_MODE)
+        max_concurrency: 동시에 진행하는 메시지 조회 수
+    """
+
+    def __init__(self, fetch=None, mode: str = LISTENER_MODE,
+                 max_concurrency: int = DEFAULT_CONCURRENCY):
+        if fetch is None:
+            fetch = async_fetch_messages_since if async_available() else fetch_messages_since
+        self._fetch = fetch
+        self._mode = mode
+        self._max_concurrency = max_concurrency
+        self._chats = {}
+        self._loop = None
+        self._semaphore = None
+        self._wakeup = None
+        self._receiver = None
+        self._task = None
+        self._thread = None
+
+    # ---------- asyncio API ----------
+
+    async def start(self) -> None:
+        """스케줄러와 (푸시 모드면) 수신기 시작"""
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._wakeup = asyncio.Event()
+        self._receiver = start_receiver(
+            lambda item: self._loop.call_soon_threadsafe(self._on_push, item), self._mode
+        )
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """스케줄러/수신기 종료, 대기 중인 대화는 None으로 끝냄"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for state in self._chats.values():
+            self._deliver(state, None)
+        if self._receiver is not None:
+            self._receiver.stop()
+            self._receiver = None
+        await close_async_session()
+
+    async def clear(self, chat_id: str) -> None:
+        """채팅의 기준 시각을 현재로 리셋 (새 질문 전 호출)"""
+        state = self._state(chat_id)
+        state.cursor.reset()
+        state.pending = None
+
+    async def wait_for_message(self, chat_id: str, timeout_minutes: float = 5):
+        """채팅의 기준 시각 이후 사용자 메시지 대기
+
+        Returns:
+            str: 수신된 메시지 텍스트, 타임아웃 시 None
+        """
+        state = self._state(chat_id)
+        if state.pending is not None:
+            text, state.pending = state.pending, None
+            state.cursor.reset()
+            return text
+
+        future = self._loop.create_future()
+        state.waiters.append(future)
+        # 새로 기다리기 시작한 채팅은 바로 폴링
+        state.interval = POLL_MIN_INTERVAL
+        state.next_poll = 0.0
+        self._wakeup.set()
+
+        try:
+            return await asyncio.wait_for(future, timeout_minutes * 60)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if future in state.waiters:
+                state.waiters.remove(future)
+
+    # ---------- 스레드용 API ----------
+
+    def start_background(self) -> None:
+        """이벤트 루프를 데몬 스레드에서 실행하고 start()가 끝날 때까지 대기"""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop_background(self) -> None:
+        """백그라운드 루프 종료"""
+        if self._thread is None:
+            return
+        loop = self._loop
+        asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def clear_blocking(self, chat_id: str) -> None:
+        asyncio.run_coroutine_threadsafe(self.clear(chat_id), self._loop).result()
+
+    def wait_blocking(self, chat_id: str, timeout_minutes: float = 5):
+        return asyncio.run_coroutine_threadsafe(
+            self.wait_for_message(chat_id, timeout_minutes), self._loop
+        ).result()
+
+    # ---------- 내부 ----------
+
+    def _state(self, chat_id: str) -> _ChatState:
+        state = self._chats.get(chat_id)
+        if state is None:
+            state = self._chats[chat_id] = _ChatState(chat_id)
+        return state
+
+    def _deliver(self, state: _ChatState, text) -> None:
+        for future in state.waiters:
+            if not future.done():
+                future.set_result(text)
+        state.waiters.clear()
+        if text is not None:
+            state.cursor.reset()
+
+    def _on_push(self, item) -> None:
+        create_time, chat_id, msg_type, content = item
+        state = self._chats.get(chat_id)
+        if state is None or create_time < state.cursor.baseline_ms:
+            return
+        text = message_text(msg_type, content)
+        if not text:
+            return
+        if state.waiters:
+            self._deliver(state, text)
+        else:
+            state.pending = text
+
+    def _push_alive(self) -> bool:
+        if self._receiver is None:
+            return False
+        if self._receiver.is_alive():
+            return True
+        print("⚠️ 푸시 수신이 끊겨 폴링으로 대체합니다.")
+        self._receiver = None
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._push_alive():
+                timeout = PUSH_CHECK_INTERVAL
+            else:
+                now = self._loop.time()
+                for state in self._chats.values():
+                    if not state.waiters or state.polling:
+                        continue
+                    if state.next_poll <= now:
+                        state.polling = True
+                        asyncio.ensure_future(self._poll(state))
+                    else:
+                        wait = state.next_poll - now
+                        timeout = wait if timeout is None else min(timeout, wait)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, state: _ChatState) -> None:
+        try:
+            async with self._semaphore:
+                if asyncio.iscoroutinefunction(self._fetch):
+                    messages = await self._fetch(state.cursor.start_time, state.chat_id)
+                else:
+                    messages = await asyncio.to_thread(self._fetch, state.cursor.start_time, state.chat_id)
+            new = state.cursor.advance(messages or [])
+
+            # 같은 폴링에 여러 개가 오면 가장 최근 응답
+            text = find_user_message(reversed(new))
+            if text:
+                self._deliver(state, text)
+
+            if new:
+                state.interval = POLL_MIN_INTERVAL
+            state.next_poll = self._loop.time() + state.interval
+            if not new:
+                state.interval = min(state.interval * POLL_BACKOFF, POLL_MAX_INTERVAL)
+        except Exception as e:
+            print(f"❌ 메시지 조회 오류 ({state.chat_id}): {e}")
+            state.next_poll = self._loop.time() + state.interval
+        finally:
+            state.polling = False
+            self._wakeup.set()
+
+
+async def _demo(chat_ids: list, timeout_minutes: float) -> None:
+    mux = ChatMultiplexer()
+    await mux.start()
+    for chat_id in chat_ids:
+        await mux.clear(chat_id)
+
+    print(f"⏳ 채팅 {len(chat_ids)}개 대기 중... (최대 {timeout_minutes}분)")
+    replies = await asyncio.gather(*(mux.wait_for_message(c, timeout_minutes) for c in chat_ids))
+    for chat_id, reply in zip(chat_ids, replies):
+        print(f"  {chat_id}: {reply if reply is not None else '(타임아웃)'}")
+    await mux.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 채팅 메시지 동시 대기 테스트")
+    parser.add_argument("chat_ids", nargs="+", help="대기할 채팅 ID")
+    parser.add_argument("--timeout", type=float, default=1, help="대기 시간 (분, 기본: 1)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_demo(args.chat_ids, args.timeout))
+    except KeyboardInterrupt:
+        print("\n👋 종료합니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Lark Open API 공용 HTTP 클라이언트
+
+모든 daily-focus 스크립트가 하나의 requests.Session을 공유한다.
+- keep-alive 커넥션 풀 (매 호출마다 TCP+TLS 핸드셰이크 반복 방지)
+- 기본 타임아웃
+- `code != 0` 응답의 일관된 에러 처리
+- 프로세스 공용 토큰 버킷 rate limiter (LARK_RATE_LIMIT, 초당 요청 수)
+- 빈도 제한(429 / code 99991400) 응답 재시도 (지터 섞인 지수 백오프,
+  x-ogw-ratelimit-reset 헤더 존중) + 동시 요청 수 자동 조절 (AIMD: 정상 응답이면
+  늘리고, 빈도 제한/5xx/네트워크 오류면 줄임)
+- asyncio용 async_lark_request / async_lark_call (aiohttp, 선택 의존성)
+  이벤트 루프마다 ClientSession 하나 (커넥션 수 ASYNC_POOL_LIMIT), rate limiter,
+  동시 요청 수 제한, 재시도 정책은 동기 버전과 공유
+
+사용법:
+    from lark_client import lark_call
+
+    data = lark_call("GET", "/calendar/v4/calendars", token, action="캘린더 조회")
+    if data is None:
+        return None
+
+    # asyncio
+    data = await async_lark_call("GET", "/calendar/v4/calendars", token, action="캘린더 조회")
+    ...
+    await close_async_session()  # 루프 종료 전
+"""
+
+import os
+import json as jsonlib
+import time
+import random
+import asyncio
+import weakref
+import threading
+import importlib.util
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "https://open.larksuite.com/open-apis"
+
+# (connect, read) 초 단위
+DEFAULT_TIMEOUT = (5, 30)
+
+# 동시에 유지할 커넥션 수 (open.larksuite.com 단일 호스트)
+POOL_MAXSIZE = 16
+
+# asyncio 세션의 최대 동시 커넥션 수 (스레드 없이 겹치는 호출이 많으므로 동기보다 넉넉하게)
+ASYNC_POOL_LIMIT = int(os.getenv("LARK_ASYNC_POOL_LIMIT", "32"))
+
+# 초당 허용 요청 수 (Lark 앱 API 쿼터보다 낮게)
+DEFAULT_RATE_LIMIT = float(os.getenv("LARK_RATE_LIMIT", "10"))
+
+# 빈도 제한 응답 (HTTP 429 또는 아래 code)
+RATE_LIMIT_CODES = {99991400}
+
+# 재시도 정책: 최대 횟수, 백오프 기본/최대 대기(초)
+MAX_RETRIES = int(os.getenv("LARK_MAX_RETRIES", "4"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+_session = None
+_session_lock = threading.Lock()
+
+# 이벤트 루프별 aiohttp.ClientSession (세션은 만든 루프에서만 쓸 수 있음)
+_async_sessions = weakref.WeakKeyDictionary()
+
+
+class RateLimiter:
+    """토큰 버킷 rate limiter (스레드 간 공유)
+
+    초당 rate개씩 토큰이 차고, 최대 burst개까지 쌓인다.
+    요청 한 번에 토큰 한 개를 쓰고, 없으면 찰 때까지 기다린다.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 한 개를 예약하고, 그 토큰을 쓸 수 있을 때까지 기다릴 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """토큰 한 개를 쓸 수 있을 때까지 대기"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """동시 요청 수 제한 (AIMD)
+
+    빈도 제한/서버 오류 응답을 받으면 허용 동시 요청 수를 절반으로 줄이고,
+    현재 한도만큼 연속으로 성공(2xx, code 0)하면 1씩 다시 늘린다.
+
+    동기 요청은 Condition으로, asyncio 요청은 이벤트 루프의 Future로 기다린다
+    (자리가 나면 call_soon_threadsafe로 깨움, 기다리는 동안 스레드를 쓰지 않음).
+    """
+
+    # 한 번의 빈도 제한/장애 폭주에 여러 번 연달아 줄이지 않도록 두는 간격(초)
+    DECREASE_INTERVAL = 1.0
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()  # (loop, future)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def async_acquire(self) -> None:
+        """acquire의 asyncio 버전 (루프를 막지 않고, 취소되면 대기열에서 빠짐)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                    else:
+                        # 이미 깨워진 뒤 취소됨: 받은 차례를 다음 대기자에게
+                        self._notify()
+                raise
+
+    def _notify(self) -> None:
+        """자리가 났을 때 동기 대기자 하나와 asyncio 대기자 하나를 깨움 (_cond를 잡은 상태에서 호출)"""
+        self._cond.notify()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+                return
+            except RuntimeError:
+                continue  # 닫힌 루프
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            if self.limit >= self.max_limit:
+                return
+            self._successes += 1
+            if self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+                self._notify()
+
+    def on_overload(self, reason: str = "빈도 제한") -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.DECREASE_INTERVAL:
+                return
+            self._last_decrease = now
+            self._successes = 0
+            if self.limit > 1:
+                self.limit = max(1, self.limit // 2)
+                print(f"⚠️ Lark {reason} - 동시 요청 수 {self.limit}개로 축소")
+
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_rate_limiter = RateLimiter(DEFAULT_RATE_LIMIT)
+_concurrency = AdaptiveConcurrency(POOL_MAXSIZE)
+
+
+def configure_rate_limit(rate: float, burst: int = None, max_concurrency: int = None) -> None:
+    """프로세스 공용 rate limiter 설정 변경 (초당 요청 수, 최대 동시 요청 수)"""
+    global _rate_limiter, _concurrency
+    _rate_limiter = RateLimiter(rate, burst)
+    if max_concurrency:
+        _concurrency = AdaptiveConcurrency(max_concurrency)
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 Session 반환 (최초 호출 시 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json; charset=utf-8"})
+            _session = session
+    return _session
+
+
+def _url(path: str) -> str:
+    """상대 경로(/im/v1/...)를 전체 URL로 변환"""
+    if path.startswith("http"):
+        return path
+    return f"{BASE_URL}{path}"
+
+
+def _is_rate_limited(status_code: int, result: dict) -> bool:
+    return status_code == 429 or result.get("code") in RATE_LIMIT_CODES
+
+
+def _backoff_delay(attempt: int, reset_header: str = None) -> float:
+    """재시도 전 대기 시간(초)
+
+    지수 백오프에 full jitter를 섞고, 서버가 알려준 리셋 시간보다는 짧지 않게 한다.
+    """
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+    try:
+        reset = float(reset_header) if reset_header else 0.0
+    except ValueError:
+        reset = 0.0
+    return max(delay, min(reset, BACKOFF_MAX))
+
+
+def _should_retry(idempotent: bool, status_code, result: dict) -> bool:
+    """응답을 보고 재시도할지 결정 (동시 요청 수 조절 신호도 함께 전달)
+
+    한도는 정상 응답(2xx, code 0)에서만 늘리고, 빈도 제한/5xx/네트워크 오류에서는 줄인다.
+    그 밖의 응답(4xx, 업무 에러 code)은 서버 부하와 무관하므로 한도를 그대로 둔다.
+    """
+    if _is_rate_limited(status_code, result):
+        _concurrency.on_overload()
+        return True
+    if status_code is None or status_code >= 500:
+        _concurrency.on_overload("서버 오류" if status_code else "네트워크 오류")
+        return idempotent
+    if 200 <= status_code < 300 and result.get("code") == 0:
+        _concurrency.on_success()
+    return False
+
+
+def _send(method: str, url: str, headers: dict, params, json, timeout):
+    """요청 1회 전송 → (status_code, 응답 JSON, 응답 헤더)"""
+    _rate_limiter.acquire()
+    concurrency = _concurrency
+    concurrency.acquire()
+    try:
+        response = get_session().request(
+            method, url, headers=headers,
+            params=params, json=json, timeout=timeout
+        )
+    except requests.RequestException as e:
+        return None, {"code": -1, "msg": f"네트워크 오류: {e}"}, {}
+    finally:
+        concurrency.release()
+
+    try:
+        return response.status_code, response.json(), response.headers
+    except ValueError:
+        return (response.status_code,
+                {"code": -1, "msg": f"HTTP {response.status_code}: {response.text[:200]}"},
+                response.headers)
+
+
+def lark_request(method: str, path: str, token: str = None,
+                 params: dict = None, json: dict = None, timeout=DEFAULT_TIMEOUT) -> dict:
+    """Lark API 호출 후 응답 JSON을 그대로 반환
+
+    네트워크 오류나 JSON이 아닌 응답은 code=-1 응답으로 변환하므로
+    호출부는 항상 `result.get("code")`만 확인하면 된다.
+
+    재시도:
+        - 빈도 제한(429 / code 99991400): 모든 메서드 (서버가 처리하지 않은 요청)
+        - 네트워크 오류, HTTP 5xx: GET만 (쓰기 요청은 중복 생성될 수 있어 재시도하지 않음)
+    """
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    url = _url(path)
+    idempotent = method.upper() == "GET"
+
+    for attempt in range(MAX_RETRIES + 1):
+        status_code, result, response_headers = _send(method, url, headers, params, json, timeout)
+
+        retryable = _should_retry(idempotent, status_code, result)
+        if not retryable or attempt == MAX_RETRIES:
+            return result
+
+        delay = _backoff_delay(attempt, response_headers.get("x-ogw-ratelimit-reset"))
+        print(f"⏳ Lark 재시도 {attempt + 1}/{MAX_RETRIES} ({delay:.1f}초 후): {result.get('msg')}")
+        time.sleep(delay)
+
+    return result
+
+
+def lark_call(method: str, path: str, token: str = None, action: str = "Lark API 호출",
+              params: dict = None, json: dict = None, timeout=DEFAULT_TIMEOUT):
+    """Lark API 호출 후 `data` 필드 반환
+
+    `code != 0`이면 "❌ {action} 실패: {msg}"를 출력하고 None 반환.
+    """
+    result = lark_request(method, path, token, params=params, json=json, timeout=timeout)
+
+    if result.get("code") != 0:
+        print(f"❌ {action} 실패: {result.get('msg')}")
+        return None
+
+    return result.get("data") or {}
+
+
+def async_available() -> bool:
+    """aiohttp가 설치되어 async_lark_request를 쓸 수 있는지"""
+    return importlib.util.find_spec("aiohttp") is not None
+
+
+def _get_async_session():
+    """현재 이벤트 루프의 공용 ClientSession 반환 (최초 호출 시 생성)"""
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connect_timeout, read_timeout = DEFAULT_TIMEOUT
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=ASYNC_POOL_LIMIT, limit_per_host=ASYNC_POOL_LIMIT),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session() -> None:
+    """현재 이벤트 루프의 ClientSession 종료 (루프를 끝내기 전에 호출)"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def _async_send(method: str, url: str, headers: dict, params, json):
+    """요청 1회 전송 (asyncio) → (status_code, 응답 JSON, 응답 헤더)"""
+    import aiohttp
+
+    wait = _rate_limiter.reserve()
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+    if params:
+        params = {key: str(value) for key, value in params.items()}
+
+    concurrency = _concurrency
+    await concurrency.async_acquire()
+    try:
+        async with _get_async_session().request(method, url, headers=headers,
+                                                params=params, json=json) as response:
+            text = await response.text()
+            status_code, response_headers = response.status, response.headers
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return None, {"code": -1, "msg": f"네트워크 오류: {e}"}, {}
+    finally:
+        concurrency.release()
+
+    try:
+        return status_code, jsonlib.loads(text), response_headers
+    except ValueError:
+        return (status_code,
+                {"code": -1, "msg": f"HTTP {status_code}: {text[:200]}"},
+                response_headers)
+
+
+async def async_lark_request(method: str, path: str, token: str = None,
+                             params: dict = None, json: dict = None) -> dict:
+    """lark_request의 asyncio 버전 (같은 rate limiter, 동시 요청 수 제한, 재시도 정책)
+
+    aiohttp가 없으면 code=-1 응답을 반환한다.
+    """
+    if not async_available():
+        return {"code": -1, "msg": "aiohttp가 설치되지 않았습니다 (pip install aiohttp)"}
+
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    url = _url(path)
+    idempotent = method.upper() == "GET"
+
+    for attempt in range(MAX_RETRIES + 1):
+        status_code, result, response_headers = await _async_send(method, url, headers, params, json)
+
+        retryable = _should_retry(idempotent, status_code, result)
+        if not retryable or attempt == MAX_RETRIES:
+            return result
+
+        delay = _backoff_delay(attempt, response_headers.get("x-ogw-ratelimit-reset"))
+        print(f"⏳ Lark 재시도 {attempt + 1}/{MAX_RETRIES} ({delay:.1f}초 후): {result.get('msg')}")
+        await asyncio.sleep(delay)
+
+    return result
+
+
+async def async_lark_call(method: str, path: str, token: str = None, action: str = "Lark API 호출",
+                          params: dict = None, json: dict = None):
+    """lark_call의 asyncio 버전 (`code != 0`이면 에러 출력 후 None)"""
+    result = await async_lark_request(method, path, token, params=params, json=json)
+
+    if result.get("code") != 0:
+        print(f"❌ {action} 실패: {result.get('msg')}")
+        return None
+
+    return result.get("data") or {}
@@ -1,14 +1,21 @@
 #!/usr/bin/env python3
 """
-Lark 그룹 채팅 메시지 폴링
+Lark 그룹 채팅 메시지 수신
 
-그룹 채팅의 최근 메시지를 주기적으로 조회하여 사용자 응답을 감지.
-Tenant Access Token 사용.
+그룹 채팅의 사용자 응답을 감지. 수신 방식은 LARK_LISTENER_MODE로 고른다.
+    poll     — 커서 이후 새 메시지만 조회 (기본, Tenant Access Token 사용)
+               조용하면 간격을 1초 → 30초로 늘리고, 새 메시지가 오면 1초로 복귀
+    callback — 이벤트 구독 요청 URL을 로컬 HTTP 서버로 수신 (lark_event_transport.py)
+    ws       — lark-oapi 장기 연결로 수신 (공개 URL 불필요)
+푸시 수신을 시작하지 못하거나 도중에 끊기면 폴링으로 대체한다.
+
+여러 사용자를 한 프로세스에서 돌릴 때(multi_user_flow.py)는 사용자 컨텍스트의
+waiter(ChatMultiplexer)에 대기를 맡기고, 채팅/커서는 사용자마다 따로 둔다.
 
 인터페이스:
-    start_listener()      — 봇 메시지 발송 시각 기록 (폴링 기준점)
-    wait_for_message()    — 기준점 이후 사용자 메시지를 폴링하여 반환
-    clear_queue()         — 기준 시각 리셋
+    start_listener()      — 수신 시작 + 기준 시각 기록
+    wait_for_message()    — 기준 시각 이후 사용자 메시지를 기다려 반환
+    clear_queue()         — 받아 둔 메시지를 버리고 기준 시각 리셋
 
 사용법:
     # nightly_flow.py에서 사용
@@ -18,7 +25,8 @@ Tenant Access Token 사용.
 import os
 import json
 import time
-import requests
+import queue
+import asyncio
 from pathlib import Path
 from datetime import datetime
 
@@ -26,23 +34,29 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 from lark_tenant_token import get_valid_tenant_token
+from lark_client import lark_call, async_lark_call
+from lark_event_transport import CallbackReceiver, WebSocketReceiver
+from user_context import PerUser, current, getenv
 
-LARK_CHAT_ID = os.getenv("LARK_CHAT_ID")
 LARK_APP_ID = os.getenv("LARK_APP_ID")
 
-BASE_URL = "https://open.larksuite.com/open-apis"
+# 수신 방식: poll / callback / ws
+LISTENER_MODE = os.getenv("LARK_LISTENER_MODE", "poll").lower()
 
-# 폴링 기준 시각 (이 시각 이후의 메시지만 수신)
-_baseline_timestamp = None
+# 폴링 간격 (초): 새 메시지가 없을 때마다 POLL_BACKOFF배씩 늘림
+POLL_MIN_INTERVAL = float(os.getenv("LARK_POLL_MIN_INTERVAL", "1"))
+POLL_MAX_INTERVAL = float(os.getenv("LARK_POLL_MAX_INTERVAL", "30"))
+POLL_BACKOFF = 2
 
+# 메시지 조회 페이지 크기 (API 최대 50)
+MESSAGE_PAGE_SIZE = 50
 
-def _get_headers():
-    """인증 헤더 생성"""
-    token = get_valid_tenant_token()
-    return {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
+# 푸시 수신 중 수신기 상태를 확인하는 간격 (초)
+PUSH_CHECK_INTERVAL = 30
+
+# 푸시 수신기와 수신한 메시지 (create_time_ms, chat_id, msg_type, content_json)
+_receiver = None
+_push_queue = queue.Queue()
 
 
 def _get_bot_app_id():
@@ -50,38 +64,111 @@ def _get_bot_app_id():
     return LARK_APP_ID
 
 
-def _fetch_recent_messages(start_time: str, page_size: int = 20):
-    """그룹 채팅의 최근 메시지 조회
+class MessageCursor:
+    """폴링 커서: 기준 시각 이후, 마지막으로 본 메시지 다음부터만 반환
+
+    메시지 조회 API의 start_time은 초 단위라서 마지막 메시지와 같은 초의
+    메시지는 다시 내려온다. 그 초에 이미 본 message_id를 기억해 걸러낸다.
+    """
+
+    def __init__(self):
+        self.last_ms = 0
+        self.seen_ids = set()
+        self.reset()
+
+    def reset(self) -> None:
+        """기준 시각을 현재로 (이전 메시지는 모두 무시)
+
+        방금 본 메시지와 같은 초라면 그 초에 본 ID는 계속 걸러낸다.
+        """
+        self.baseline_ms = int(time.time()) * 1000
+        if self.baseline_ms > self.last_ms:
+            self.last_ms = self.baseline_ms
+            self.seen_ids = set()
+
+    @property
+    def start_time(self) -> str:
+        return str(self.last_ms // 1000)
+
+    def advance(self, messages: list) -> list:
+        """조회 결과(오래된 순)에서 처음 보는 메시지만 골라 커서를 옮김"""
+        new = []
+        for msg in messages:
+            create_ms = int(msg.get("create_time") or 0)
+            if create_ms < self.baseline_ms or msg.get("message_id") in self.seen_ids:
+                continue
+            if create_ms // 1000 > self.last_ms // 1000:
+                self.seen_ids = set()
+            self.last_ms = max(self.last_ms, create_ms)
+            self.seen_ids.add(msg.get("message_id"))
+            new.append(msg)
+        return new
+
+
+# 대기 기준 커서 (사용자 컨텍스트마다 따로)
+_cursor = PerUser(MessageCursor)
+
+
+def fetch_messages_since(start_time: str, chat_id: str = None):
+    """그룹 채팅에서 start_time 이후 메시지를 모두 조회 (page_token으로 끝까지)
 
     Args:
         start_time: Unix timestamp (초 단위, 문자열)
-        page_size: 조회할 메시지 수
+        chat_id: 채팅 ID (기본: LARK_CHAT_ID)
 
     Returns:
-        list: 메시지 목록 (최신 순)
+        list: 메시지 목록 (오래된 순), 실패 시 None
     """
-    url = f"{BASE_URL}/im/v1/messages"
-    params = {
-        "container_id_type": "chat",
-        "container_id": LARK_CHAT_ID,
-        "start_time": start_time,
-        "sort_type": "ByCreateTimeDesc",
-        "page_size": str(page_size),
-    }
+    params = _message_list_params(start_time, chat_id)
 
+    messages = []
     try:
-        response = requests.get(url, headers=_get_headers(), params=params)
-        data = response.json()
+        while True:
+            data = lark_call("GET", "/im/v1/messages", get_valid_tenant_token(),
+                             action="메시지 조회", params=params)
+            if data is None:
+                return None
+
+            messages.extend(data.get("items", []))
+            if not data.get("has_more") or not data.get("page_token"):
+                return messages
+            params["page_token"] = data["page_token"]
+    except Exception as e:
+        print(f"❌ 메시지 조회 오류: {e}")
+        return None
 
-        if data.get("code") != 0:
-            print(f"❌ 메시지 조회 실패: {data.get('msg')}")
-            return []
 
-        items = data.get("data", {}).get("items", [])
-        return items
+async def async_fetch_messages_since(start_time: str, chat_id: str = None):
+    """fetch_messages_since의 asyncio 버전"""
+    params = _message_list_params(start_time, chat_id)
+
+    messages = []
+    try:
+        token = await asyncio.to_thread(get_valid_tenant_token)
+        while True:
+            data = await async_lark_call("GET", "/im/v1/messages", token,
+                                         action="메시지 조회", params=params)
+            if data is None:
+                return None
+
+            messages.extend(data.get("items", []))
+            if not data.get("has_more") or not data.get("page_token"):
+                return messages
+            params["page_token"] = data["page_token"]
     except Exception as e:
         print(f"❌ 메시지 조회 오류: {e}")
-        return []
+        return None
+
+
+def _message_list_params(start_time: str, chat_id: str = None) -> dict:
+    """메시지 목록 조회 파라미터 (오래된 순)"""
+    return {
+        "container_id_type": "chat",
+        "container_id": chat_id or getenv("LARK_CHAT_ID"),
+        "start_time": start_time,
+        "sort_type": "ByCreateTimeAsc",
+        "page_size": str(MESSAGE_PAGE_SIZE),
+    }
 
 
 def _extract_text_from_post(content):
@@ -102,8 +189,8 @@ def _extract_text_from_post(content):
     return "\n".join(lines)
 
 
-def _find_user_message(messages):
-    """메시지 목록에서 사용자(봇이 아닌) 텍스트 메시지를 찾기
+def find_user_message(messages):
+    """메시지 목록(앞쪽 우선)에서 사용자(봇이 아닌) 텍스트 메시지를 찾기
 
     text 타입과 post 타입(리치 텍스트) 모두 처리.
 
@@ -118,35 +205,122 @@ def _find_user_message(messages):
         if sender_type == "app":
             continue
 
-        msg_type = msg.get("msg_type", "")
-        body = msg.get("body", {})
+        text = message_text(msg.get("msg_type", ""), msg.get("body", {}).get("content", "{}"))
+        if text:
+            return text
+
+    return None
+
+
+def message_text(msg_type: str, content_json: str):
+    """메시지 본문(JSON 문자열)에서 텍스트 추출 (text / post 타입, 그 외 None)"""
+    try:
+        content = json.loads(content_json or "{}")
+        if msg_type == "text":
+            return content.get("text", "").strip() or None
+        if msg_type == "post":
+            return _extract_text_from_post(content) or None
+    except (json.JSONDecodeError, AttributeError):
+        pass
+    return None
 
+
+def start_receiver(put, mode: str = LISTENER_MODE):
+    """mode에 맞는 푸시 수신기 시작 (poll이거나 시작 실패 시 None)
+
+    Args:
+        put: 수신한 메시지 (create_time_ms, chat_id, msg_type, content_json)를 받는 함수
+    """
+    if mode == "poll":
+        return None
+    if mode == "callback":
+        receiver = CallbackReceiver(put)
+    elif mode == "ws":
+        receiver = WebSocketReceiver(put)
+    else:
+        print(f"⚠️ 알 수 없는 LARK_LISTENER_MODE: {mode} - 폴링 사용")
+        return None
+
+    if not receiver.start():
+        print("⚠️ 푸시 수신을 시작하지 못해 폴링으로 대체합니다.")
+        return None
+    return receiver
+
+
+def _waiter():
+    """현재 사용자 컨텍스트의 메시지 대기기 (없으면 None)"""
+    user = current()
+    return user.waiter if user is not None else None
+
+
+def start_listener() -> None:
+    """수신 시작 (푸시 수신기는 한 번만 시작) + 기준 시각 설정"""
+    global _receiver
+    waiter = _waiter()
+    if waiter is not None:
+        waiter.clear_blocking(getenv("LARK_CHAT_ID"))
+        print("🔌 그룹 채팅 메시지 수신 준비 완료 (멀티플렉서)")
+        return
+
+    if _receiver is None:
+        _receiver = start_receiver(_push_queue.put)
+    _cursor.get().reset()
+    if _receiver is None:
+        print("🔌 그룹 채팅 메시지 폴링 준비 완료")
+    else:
+        print(f"🔌 그룹 채팅 메시지 수신 준비 완료 ({LISTENER_MODE})")
+
+
+def _wait_push(deadline: float, chat_id: str, cursor: MessageCursor):
+    """푸시로 받은 메시지 중 기준 시각 이후의 사용자 메시지 대기
+
+    Returns:
+        str: 메시지 텍스트, 타임아웃이면 None, 수신기가 끊기면 False
+    """
+    while time.time() < deadline:
+        if not _receiver.is_alive():
+            return False
         try:
-            content = json.loads(body.get("content", "{}"))
-
-            if msg_type == "text":
-                text = content.get("text", "").strip()
-                if text:
-                    return text
-            elif msg_type == "post":
-                text = _extract_text_from_post(content)
-                if text:
-                    return text
-        except (json.JSONDecodeError, AttributeError):
+            create_time, message_chat_id, msg_type, content = _push_queue.get(
+                timeout=min(PUSH_CHECK_INTERVAL, max(0.0, deadline - time.time()))
+            )
+        except queue.Empty:
             continue
 
+        if message_chat_id != chat_id or create_time < cursor.baseline_ms:
+            continue
+        text = message_text(msg_type, content)
+        if text:
+            return text
     return None
 
 
-def start_listener() -> None:
-    """폴링 기준 시각 설정 (현재 시각)"""
-    global _baseline_timestamp
-    _baseline_timestamp = str(int(time.time()))
-    print("🔌 그룹 채팅 메시지 폴링 준비 완료")
+def _wait_poll(deadline: float, chat_id: str, cursor: MessageCursor):
+    """커서 이후 새 메시지를 폴링하여 사용자 메시지 대기 (타임아웃이면 None)
+
+    새 메시지(봇 메시지 포함)가 있으면 간격을 POLL_MIN_INTERVAL로 되돌리고,
+    없으면 POLL_MAX_INTERVAL까지 늘린다.
+    """
+    interval = POLL_MIN_INTERVAL
+    while time.time() < deadline:
+        messages = fetch_messages_since(cursor.start_time, chat_id)
+        new = cursor.advance(messages or [])
+
+        # 같은 폴링에 여러 개가 오면 가장 최근 응답
+        user_text = find_user_message(reversed(new))
+        if user_text:
+            return user_text
+
+        if new:
+            interval = POLL_MIN_INTERVAL
+        time.sleep(max(0.0, min(interval, deadline - time.time())))
+        if not new:
+            interval = min(interval * POLL_BACKOFF, POLL_MAX_INTERVAL)
+    return None
 
 
 def wait_for_message(timeout_minutes: int = 5):
-    """그룹 채팅을 폴링하여 사용자 메시지 대기
+    """사용자 메시지 대기 (푸시 수신 중이면 큐에서, 아니면 폴링)
 
     Args:
         timeout_minutes: 최대 대기 시간 (분)
@@ -154,45 +328,65 @@ def wait_for_message(timeout_minutes: int = 5):
     Returns:
         str: 수신된 메시지 텍스트, 타임아웃 시 None
     """
-    global _baseline_timestamp
+    global _receiver
 
-    if not LARK_CHAT_ID:
+    chat_id = getenv("LARK_CHAT_ID")
+    if not chat_id:
         print("❌ LARK_CHAT_ID가 설정되지 않았습니다.")
         return None
 
-    if not _baseline_timestamp:
-        _baseline_timestamp = str(int(time.time()))
-
     print(f"⏳ 사용자 응답 대기 중... (최대 {timeout_minutes}분)")
 
-    poll_interval = 5  # 5초마다 폴링
-    deadline = time.time() + (timeout_minutes * 60)
-
-    while time.time() < deadline:
-        messages = _fetch_recent_messages(_baseline_timestamp)
-
-        user_text = _find_user_message(messages)
+    waiter = _waiter()
+    if waiter is not None:
+        user_text = waiter.wait_blocking(chat_id, timeout_minutes)
         if user_text:
             print(f"✅ 응답 받음: {user_text[:50]}...")
-            # 다음 폴링 기준점 업데이트
-            _baseline_timestamp = str(int(time.time()))
-            return user_text
+        else:
+            print("⏰ 타임아웃: 응답이 없습니다.")
+        return user_text
 
-        time.sleep(poll_interval)
+    cursor = _cursor.get()
+    deadline = time.time() + (timeout_minutes * 60)
+
+    user_text = None
+    if _receiver is not None:
+        user_text = _wait_push(deadline, chat_id, cursor)
+        if user_text is False:
+            print("⚠️ 푸시 수신이 끊겨 폴링으로 대체합니다.")
+            _receiver = None
+            user_text = None
+    if _receiver is None:
+        user_text = _wait_poll(deadline, chat_id, cursor)
+
+    if user_text:
+        print(f"✅ 응답 받음: {user_text[:50]}...")
+        # 다음 대기 기준점 업데이트
+        cursor.reset()
+        return user_text
 
     print("⏰ 타임아웃: 응답이 없습니다.")
     return None
 
 
 def clear_queue() -> None:
-    """폴링 기준 시각을 현재로 리셋 (새 질문 전 호출)"""
-    global _baseline_timestamp
-    _baseline_timestamp = str(int(time.time()))
+    """받아 둔 푸시 메시지를 버리고 기준 시각을 현재로 리셋 (새 질문 전 호출)"""
+    waiter = _waiter()
+    if waiter is not None:
+        waiter.clear_blocking(getenv("LARK_CHAT_ID"))
+        return
+
+    while True:
+        try:
+            _push_queue.get_nowait()
+        except queue.Empty:
+            break
+    _cursor.get().reset()
 
 
 if __name__ == "__main__":
     print("=" * 60)
-    print("🔍 Lark 그룹 채팅 메시지 폴링 테스트")
+    print(f"🔍 Lark 그룹 채팅 메시지 수신 테스트 ({LISTENER_MODE})")
     print("=" * 60)
     print("그룹에서 메시지를 보내보세요.")
     print("Ctrl+C로 종료.\n")
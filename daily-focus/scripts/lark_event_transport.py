@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Lark 메시지 푸시 수신 (im.message.receive_v1)
+
+폴링 대신 Lark가 보내 주는 메시지 이벤트를 받아 큐에 넣는다.
+lark_event_listener.py가 LARK_LISTENER_MODE에 따라 골라 쓴다.
+
+    CallbackReceiver  — 이벤트 구독 요청 URL을 받는 로컬 HTTP 서버 (http.server)
+                        url_verification 응답, 토큰 검증, 재전송 중복 제거
+    WebSocketReceiver — lark-oapi 장기 연결 클라이언트 (공개 URL 불필요, 선택 의존성)
+
+큐에 들어가는 항목: (create_time_ms, chat_id, msg_type, content_json)
+
+로컬 테스트:
+    # 터미널 1 — callback 모드로 대기
+    LARK_LISTENER_MODE=callback python3 scripts/lark_event_listener.py
+    # 터미널 2 — Lark 대신 이벤트 전송
+    python3 scripts/lark_event_transport.py --send-test "테스트 메시지"
+"""
+
+import os
+import sys
+import json
+import hmac
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+LARK_APP_ID = os.getenv("LARK_APP_ID")
+LARK_APP_SECRET = os.getenv("LARK_APP_SECRET")
+
+# 이벤트 구독 Verification Token (callback 모드 필수, 토큰이 다른 요청은 거부)
+LARK_VERIFICATION_TOKEN = os.getenv("LARK_VERIFICATION_TOKEN")
+
+# callback 모드 수신 주소 (기본은 로컬만, 외부에 열려면 LARK_CALLBACK_HOST=0.0.0.0)
+CALLBACK_HOST = os.getenv("LARK_CALLBACK_HOST", "127.0.0.1")
+CALLBACK_PORT = int(os.getenv("LARK_CALLBACK_PORT", "8787"))
+
+MESSAGE_EVENT_TYPE = "im.message.receive_v1"
+
+# 재전송 중복 제거용으로 기억하는 이벤트 ID 수
+SEEN_EVENT_LIMIT = 1000
+
+
+class _SeenEvents:
+    """최근 이벤트 ID (Lark는 응답이 늦으면 같은 이벤트를 다시 보냄)"""
+
+    def __init__(self, limit: int = SEEN_EVENT_LIMIT):
+        self._limit = limit
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, event_id: str) -> bool:
+        """처음 보는 ID면 True"""
+        if not event_id:
+            return True
+        with self._lock:
+            if event_id in self._ids:
+                return False
+            self._ids[event_id] = None
+            if len(self._ids) > self._limit:
+                self._ids.popitem(last=False)
+            return True
+
+
+def message_from_event(body: dict):
+    """이벤트 v2 본문 → 큐 항목 (사용자 메시지가 아니면 None)"""
+    header = body.get("header", {})
+    if header.get("event_type") != MESSAGE_EVENT_TYPE:
+        return None
+
+    event = body.get("event", {})
+    if event.get("sender", {}).get("sender_type") == "app":
+        return None
+
+    message = event.get("message", {})
+    return (
+        int(message.get("create_time") or time.time() * 1000),
+        message.get("chat_id"),
+        message.get("message_type", ""),
+        message.get("content", "{}"),
+    )
+
+
+class CallbackReceiver:
+    """이벤트 구독 요청 URL 수신 서버
+
+    Lark 개발자 콘솔 → 이벤트 구독 → 요청 URL을 이 서버로 지정하고
+    im.message.receive_v1을 추가한다. 암호화(Encrypt Key)는 지원하지 않으므로
+    Verification Token이 없으면 시작하지 않는다 (아무나 메시지를 넣을 수 있음).
+
+    Args:
+        put: 큐 항목을 받는 함수 (queue.Queue.put 등)
+    """
+
+    def __init__(self, put, host: str = CALLBACK_HOST, port: int = CALLBACK_PORT,
+                 verification_token: str = LARK_VERIFICATION_TOKEN):
+        self._put = put
+        self._host = host
+        self._port = port
+        self._verification_token = verification_token
+        self._seen = _SeenEvents()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}/"
+
+    def handle(self, body: dict):
+        """요청 본문 처리 → (HTTP 상태, 응답 본문)"""
+        if "encrypt" in body:
+            print("❌ 암호화된 이벤트는 지원하지 않습니다 (이벤트 구독에서 Encrypt Key를 비워 주세요)")
+            return 400, {"msg": "encrypted events are not supported"}
+
+        token = body.get("token") or body.get("header", {}).get("token")
+        if not self._verification_token or not hmac.compare_digest(
+                str(token or "").encode("utf-8"), self._verification_token.encode("utf-8")):
+            return 403, {"msg": "invalid verification token"}
+
+        if body.get("type") == "url_verification":
+            return 200, {"challenge": body.get("challenge")}
+
+        event_id = body.get("header", {}).get("event_id")
+        if not self._seen.add(event_id):
+            return 200, {}
+
+        item = message_from_event(body)
+        if item is not None:
+            self._put(item)
+        return 200, {}
+
+    def start(self) -> bool:
+        if not self._verification_token:
+            print("❌ LARK_VERIFICATION_TOKEN이 없어 이벤트 수신 서버를 시작하지 않습니다 "
+                  "(이벤트 구독의 Verification Token을 설정해 주세요)")
+            return False
+
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    status, response = receiver.handle(body)
+                except (ValueError, AttributeError):
+                    status, response = 400, {"msg": "invalid json"}
+
+                payload = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self._host, self._port), Handler)
+        except OSError as e:
+            print(f"❌ 이벤트 수신 서버 시작 실패: {e}")
+            return False
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"🔌 이벤트 수신 서버 시작: {self.url}")
+        return True
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class WebSocketReceiver:
+    """lark-oapi 장기 연결(WebSocket) 수신
+
+    공개 URL 없이 앱 ID/시크릿만으로 이벤트를 받는다 (GitHub Actions 등).
+    Lark 개발자 콘솔 → 이벤트 구독 방식을 "장기 연결로 이벤트 수신"으로 설정.
+
+    Args:
+        put: 큐 항목을 받는 함수 (queue.Queue.put 등)
+    """
+
+    def __init__(self, put, app_id: str = LARK_APP_ID, app_secret: str = LARK_APP_SECRET):
+        self._put = put
+        self._app_id = app_id
+        self._app_secret = app_secret
+        self._seen = _SeenEvents()
+        self._thread = None
+
+    def _on_message(self, data) -> None:
+        if not self._seen.add(getattr(data.header, "event_id", None)):
+            return
+        sender = data.event.sender
+        if sender is not None and sender.sender_type == "app":
+            return
+        message = data.event.message
+        self._put((
+            int(message.create_time or time.time() * 1000),
+            message.chat_id,
+            message.message_type or "",
+            message.content or "{}",
+        ))
+
+    def start(self) -> bool:
+        try:
+            import lark_oapi as lark
+        except ImportError:
+            print("⚠️ lark-oapi가 설치되지 않아 WebSocket 수신을 쓸 수 없습니다 (pip install lark-oapi)")
+            return False
+
+        if not self._app_id or not self._app_secret:
+            print("❌ LARK_APP_ID / LARK_APP_SECRET이 설정되지 않았습니다.")
+            return False
+
+        handler = (
+            lark.EventDispatcherHandler.builder("", "")
+            .register_p2_im_message_receive_v1(self._on_message)
+            .build()
+        )
+        client = lark.ws.Client(self._app_id, self._app_secret,
+                                event_handler=handler, log_level=lark.LogLevel.WARNING)
+
+        def run():
+            # lark-oapi ws 모듈은 import 시점의 이벤트 루프를 모듈 전역 loop로 잡아 두고
+            # start()에서 run_until_complete한다. 실행 중인 루프(ChatMultiplexer 등) 안에서
+            # 처음 import됐으면 그 루프를 잡으므로, 이 스레드 전용 루프로 바꿔 준다.
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            lark.ws.client.loop = loop
+            try:
+                client.start()
+            except Exception as e:
+                print(f"❌ WebSocket 연결 종료: {e}")
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        print("🔌 WebSocket 이벤트 수신 시작")
+        return True
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        # lark-oapi 클라이언트는 종료 API가 없음 (데몬 스레드라 프로세스와 함께 종료)
+        pass
+
+
+def build_test_event(text: str, chat_id: str, sender_type: str = "user") -> dict:
+    """im.message.receive_v1 형식의 테스트 이벤트"""
+    return {
+        "schema": "2.0",
+        "header": {
+            "event_id": uuid.uuid4().hex,
+            "event_type": MESSAGE_EVENT_TYPE,
+            "create_time": str(int(time.time() * 1000)),
+            "token": LARK_VERIFICATION_TOKEN or "",
+            "app_id": LARK_APP_ID or "",
+        },
+        "event": {
+            "sender": {"sender_type": sender_type},
+            "message": {
+                "message_id": f"om_{uuid.uuid4().hex}",
+                "chat_id": chat_id,
+                "message_type": "text",
+                "create_time": str(int(time.time() * 1000)),
+                "content": json.dumps({"text": text}, ensure_ascii=False),
+            },
+        },
+    }
+
+
+def send_test_event(text: str, url: str, chat_id: str = None) -> bool:
+    """로컬 수신 서버에 Lark 대신 메시지 이벤트 전송"""
+    body = build_test_event(text, chat_id or os.getenv("LARK_CHAT_ID", ""))
+    try:
+        response = requests.post(url, json=body, timeout=5)
+    except requests.RequestException as e:
+        print(f"❌ 테스트 이벤트 전송 실패: {e}")
+        return False
+    if response.status_code != 200:
+        print(f"❌ 테스트 이벤트 전송 실패: HTTP {response.status_code} {response.text}")
+        return False
+    print(f"✅ 테스트 이벤트 전송: {text}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lark 이벤트 수신 테스트 도구")
+    parser.add_argument("--send-test", metavar="TEXT", required=True,
+                        help="callback 수신 서버에 테스트 메시지 이벤트 전송")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{CALLBACK_PORT}/",
+                        help=f"수신 서버 주소 (기본: http://127.0.0.1:{CALLBACK_PORT}/)")
+    parser.add_argument("--chat-id", help="채팅 ID (기본: LARK_CHAT_ID)")
+    args = parser.parse_args()
+
+    sys.exit(0 if send_test_event(args.send_test, args.url, args.chat_id) else 1)
+
+
+if __name__ == "__main__":
+    main()
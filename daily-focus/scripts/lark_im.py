@@ -4,41 +4,33 @@ Lark IM 메시지 발송 스크립트
 
 Lark 메신저를 통해 봇이 그룹 채팅에 메시지를 보낸다.
 Tenant Access Token (봇 레벨) 사용.
-메시지 수신은 lark_event_listener.py (그룹 채팅 폴링) 담당.
+메시지 수신은 lark_event_listener.py (그룹 채팅 폴링 또는 이벤트 푸시) 담당.
 
 사용법:
     python3 lark_im.py "메시지 내용"
 """
 
-import os
 import sys
 import json
-import requests
+import asyncio
 from dotenv import load_dotenv
 
 # 환경변수 로드
 load_dotenv()
 
 from lark_tenant_token import get_valid_tenant_token
+from lark_client import lark_call, async_lark_call
+from user_context import getenv
 
-LARK_CHAT_ID = os.getenv("LARK_CHAT_ID")
 
-if not LARK_CHAT_ID:
+def chat_id_configured() -> bool:
+    """LARK_CHAT_ID 설정 여부 (없으면 설정 방법 안내)"""
+    if getenv("LARK_CHAT_ID"):
+        return True
     print("❌ 환경변수가 설정되지 않았습니다.")
     print("LARK_CHAT_ID를 .env 파일에 설정해주세요.")
     print("조회 방법: python3 scripts/lark_chat_discovery.py")
-    sys.exit(1)
-
-BASE_URL = "https://open.larksuite.com/open-apis"
-
-
-def _get_headers():
-    """인증 헤더 생성"""
-    token = get_valid_tenant_token()
-    return {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json; charset=utf-8"
-    }
+    return False
 
 
 def _strip_markdown(message: str) -> str:
@@ -46,26 +38,54 @@ def _strip_markdown(message: str) -> str:
     return message.replace("**", "")
 
 
+def _text_message_payload(chat_id: str, clean_message: str) -> dict:
+    """텍스트 메시지 발송 요청 본문"""
+    return {
+        "receive_id": chat_id,
+        "msg_type": "text",
+        "content": json.dumps({"text": clean_message})
+    }
+
+
 def send_message(message: str) -> bool:
-    """Lark IM으로 그룹 채팅에 메시지 발송 (봇 → 그룹)"""
+    """Lark IM으로 그룹 채팅에 메시지 발송 (봇 → 그룹, 채팅: 현재 사용자의 LARK_CHAT_ID)"""
+    chat_id = getenv("LARK_CHAT_ID")
+    if not chat_id:
+        print("❌ LARK_CHAT_ID가 설정되지 않았습니다.")
+        return False
+
     try:
-        url = f"{BASE_URL}/im/v1/messages?receive_id_type=chat_id"
-        headers = _get_headers()
+        token = get_valid_tenant_token()
 
         # **bold** 마크다운 제거
         clean_message = _strip_markdown(message)
 
-        payload = {
-            "receive_id": LARK_CHAT_ID,
-            "msg_type": "text",
-            "content": json.dumps({"text": clean_message})
-        }
+        payload = _text_message_payload(chat_id, clean_message)
+
+        data = lark_call("POST", "/im/v1/messages", token, action="메시지 발송",
+                         params={"receive_id_type": "chat_id"}, json=payload)
+        if data is None:
+            return False
+
+        print(f"✅ Lark 메시지 발송 성공: {clean_message[:50]}...")
+        return True
 
-        response = requests.post(url, headers=headers, json=payload)
-        data = response.json()
+    except Exception as e:
+        print(f"❌ Lark IM 오류: {e}")
+        return False
 
-        if data.get("code") != 0:
-            print(f"❌ 메시지 발송 실패: {data.get('msg')}")
+
+async def async_send_message(message: str, chat_id: str = None) -> bool:
+    """send_message의 asyncio 버전 (chat_id를 주면 그 채팅으로)"""
+    try:
+        token = await asyncio.to_thread(get_valid_tenant_token)
+
+        clean_message = _strip_markdown(message)
+        payload = _text_message_payload(chat_id or getenv("LARK_CHAT_ID"), clean_message)
+
+        data = await async_lark_call("POST", "/im/v1/messages", token, action="메시지 발송",
+                                     params={"receive_id_type": "chat_id"}, json=payload)
+        if data is None:
             return False
 
         print(f"✅ Lark 메시지 발송 성공: {clean_message[:50]}...")
@@ -80,6 +100,8 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("사용법: python3 lark_im.py \"메시지 내용\"")
         sys.exit(1)
+    if not chat_id_configured():
+        sys.exit(1)
 
     message = " ".join(sys.argv[1:])
     send_message(message)
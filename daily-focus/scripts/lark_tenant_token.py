@@ -13,31 +13,36 @@ User Token 대신 Tenant Access Token 방식 사용:
 """
 import os
 import json
-import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from lark_client import lark_request
+from token_cache import TokenHolder
+from state_files import file_lock, atomic_write_json
+
 LARK_APP_ID = os.getenv('LARK_APP_ID')
 LARK_APP_SECRET = os.getenv('LARK_APP_SECRET')
 
 # 토큰 캐시 파일
 TOKEN_CACHE_FILE = Path.home() / '.daily-focus' / 'tenant_token.json'
 
+# 토큰 발급 락 파일 (여러 프로세스가 동시에 발급하지 않도록)
+TOKEN_LOCK_FILE = Path.home() / '.daily-focus' / 'tenant_token.lock'
+
 
 def get_tenant_access_token():
     """Tenant Access Token 발급"""
-    url = "https://open.larksuite.com/open-apis/auth/v3/tenant_access_token/internal"
+    path = "/auth/v3/tenant_access_token/internal"
 
     payload = {
         "app_id": LARK_APP_ID,
         "app_secret": LARK_APP_SECRET
     }
 
-    response = requests.post(url, json=payload)
-    result = response.json()
+    result = lark_request("POST", path, json=payload)
 
     if result.get('code') == 0:
         return {
@@ -48,8 +53,8 @@ def get_tenant_access_token():
         raise Exception(f"Tenant token 발급 실패: {result}")
 
 
-def load_cached_token():
-    """캐시된 토큰 불러오기"""
+def _load_cached_token_data():
+    """캐시된 토큰과 만료 시각 불러오기 (만료됐으면 None)"""
     if not TOKEN_CACHE_FILE.exists():
         return None
 
@@ -61,13 +66,19 @@ def load_cached_token():
 
         # 아직 유효한지 확인 (5분 여유)
         if datetime.now() < expires_at:
-            return token_data['token']
+            return token_data['token'], expires_at
 
         return None
     except:
         return None
 
 
+def load_cached_token():
+    """캐시된 토큰 불러오기"""
+    cached = _load_cached_token_data()
+    return cached[0] if cached else None
+
+
 def save_token(token, expires_in):
     """토큰 캐시 저장"""
     TOKEN_CACHE_FILE.parent.mkdir(exist_ok=True)
@@ -78,27 +89,52 @@ def save_token(token, expires_in):
         'updated_at': datetime.now().isoformat()
     }
 
-    with open(TOKEN_CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(token_data, f, indent=2)
+    atomic_write_json(TOKEN_CACHE_FILE, token_data)
 
+    return token_data
 
-def get_valid_tenant_token():
-    """유효한 Tenant Access Token 반환 (필요시 자동 발급/갱신)"""
+
+def _fetch_tenant_token(force=False):
+    """디스크 캐시 확인 후 필요하면 새로 발급
+
+    발급은 TOKEN_LOCK_FILE 락 안에서만 하고, 락 대기 중 다른 프로세스가
+    먼저 발급했다면 그 토큰을 재사용한다.
+
+    Args:
+        force: True면 캐시가 유효해도 새로 발급 (백그라운드 선제 갱신용)
+
+    Returns:
+        (token, expires_at) 튜플
+    """
     # 1. 캐시에서 먼저 확인
-    cached_token = load_cached_token()
-    if cached_token:
-        return cached_token
+    cached = _load_cached_token_data()
+    if cached and not force:
+        return cached
 
-    # 2. 새로 발급
-    print("🔄 Tenant Access Token 발급 중...")
-    token_data = get_tenant_access_token()
+    with file_lock(TOKEN_LOCK_FILE):
+        latest = _load_cached_token_data()
+        if latest and latest != cached:
+            return latest
 
-    # 3. 캐시 저장
-    save_token(token_data['token'], token_data['expires_in'])
+        # 2. 새로 발급
+        print("🔄 Tenant Access Token 발급 중...")
+        token_data = get_tenant_access_token()
+
+        # 3. 캐시 저장
+        saved = save_token(token_data['token'], token_data['expires_in'])
 
     print(f"✅ Tenant Access Token 발급 완료 (유효기간: {token_data['expires_in']/3600:.1f}시간)")
 
-    return token_data['token']
+    return token_data['token'], datetime.fromisoformat(saved['expires_at'])
+
+
+# 프로세스 메모리 토큰 (디스크는 발급할 때만 접근)
+_token_holder = TokenHolder("Tenant", _fetch_tenant_token)
+
+
+def get_valid_tenant_token():
+    """유효한 Tenant Access Token 반환 (메모리 캐시, 만료 직전 백그라운드 자동 갱신)"""
+    return _token_holder.get()
 
 
 def main():
@@ -8,7 +8,6 @@ Lark Token 자동 갱신 관리자
 import os
 import json
 import time
-import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -16,20 +15,29 @@ from dotenv import load_dotenv
 # .env 파일 로드
 load_dotenv()
 
+from lark_client import lark_request
+from token_cache import TokenHolder
+from state_files import file_lock, atomic_write_json, atomic_write_text
+from user_context import PerUser, current, getenv, propagate, state_path
+
 LARK_APP_ID = os.getenv('LARK_APP_ID')
 LARK_APP_SECRET = os.getenv('LARK_APP_SECRET')
 
 # 토큰 정보 저장 파일
 TOKEN_CACHE_FILE = Path.home() / '.daily-focus' / 'lark_tokens.json'
 
+# 토큰 갱신 락 파일 (여러 프로세스가 동시에 refresh token을 쓰지 않도록)
+TOKEN_LOCK_FILE = Path.home() / '.daily-focus' / 'lark_tokens.lock'
+
 
 def load_tokens():
     """저장된 토큰 정보 불러오기"""
-    if not TOKEN_CACHE_FILE.exists():
+    token_file = state_path(TOKEN_CACHE_FILE)
+    if not token_file.exists():
         return None
 
     try:
-        with open(TOKEN_CACHE_FILE, 'r', encoding='utf-8') as f:
+        with open(token_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
         # access_token이 없으면 손상된 캐시로 간주
         if not data.get('access_token') and not data.get('refresh_token'):
@@ -41,7 +49,8 @@ def load_tokens():
 
 def save_tokens(access_token, refresh_token, expires_in, refresh_expires_in):
     """토큰 정보 저장"""
-    TOKEN_CACHE_FILE.parent.mkdir(exist_ok=True)
+    token_file = state_path(TOKEN_CACHE_FILE)
+    token_file.parent.mkdir(exist_ok=True)
 
     token_data = {
         'access_token': access_token,
@@ -51,11 +60,11 @@ def save_tokens(access_token, refresh_token, expires_in, refresh_expires_in):
         'updated_at': datetime.now().isoformat()
     }
 
-    with open(TOKEN_CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(token_data, f, indent=2)
+    atomic_write_json(token_file, token_data)
 
-    # .env 파일도 업데이트 (access + refresh 모두)
-    update_env_file(access_token, refresh_token)
+    # .env 파일도 업데이트 (access + refresh 모두, 여러 사용자 실행 중이면 사용자 디렉토리만)
+    if current() is None:
+        update_env_file(access_token, refresh_token)
 
     return token_data
 
@@ -85,13 +94,12 @@ def update_env_file(access_token, refresh_token=None):
         if not updated:
             lines.append(new_line)
 
-    with open(env_file, 'w', encoding='utf-8') as f:
-        f.writelines(lines)
+    atomic_write_text(env_file, "".join(lines))
 
 
 def refresh_access_token(refresh_token):
     """Refresh token으로 새 access token 발급"""
-    url = "https://open.larksuite.com/open-apis/authen/v2/oauth/token"
+    path = "/authen/v2/oauth/token"
 
     payload = {
         "grant_type": "refresh_token",
@@ -100,8 +108,7 @@ def refresh_access_token(refresh_token):
         "refresh_token": refresh_token
     }
 
-    response = requests.post(url, json=payload)
-    result = response.json()
+    result = lark_request("POST", path, json=payload)
 
     if result.get('code') == 0:
         data = result.get('data', {})
@@ -124,25 +131,59 @@ def refresh_access_token(refresh_token):
         raise Exception(f"토큰 갱신 실패: {result.get('msg')}")
 
 
-def get_valid_token():
-    """유효한 access token 반환 (필요시 자동 갱신)"""
+def _is_access_token_valid(token_data):
+    """캐시된 access token이 아직 유효한지"""
+    return bool(token_data) and datetime.now() < datetime.fromisoformat(token_data['expires_at'])
+
+
+def _fetch_token(force=False):
+    """디스크 캐시 확인 후 필요하면 refresh token으로 갱신
+
+    갱신은 TOKEN_LOCK_FILE 락 안에서만 한다. 락을 기다리는 동안 다른 프로세스가
+    먼저 갱신했다면 네트워크 호출 없이 그 결과를 재사용한다.
+    (Lark는 refresh token을 회전시키므로 두 프로세스가 동시에 갱신하면 한쪽 토큰이 무효가 됨)
+
+    Args:
+        force: True면 access token이 아직 유효해도 갱신 (백그라운드 선제 갱신용)
+
+    Returns:
+        (access_token, expires_at) 튜플, 실패 시 None
+    """
     token_data = load_tokens()
 
+    if not force and _is_access_token_valid(token_data):
+        # 아직 유효함
+        return token_data['access_token'], datetime.fromisoformat(token_data['expires_at'])
+
+    with file_lock(state_path(TOKEN_LOCK_FILE)):
+        latest = load_tokens()
+
+        # 락 대기 중 다른 프로세스가 이미 갱신했으면 그 결과 재사용
+        seen_updated_at = token_data.get('updated_at') if token_data else None
+        if _is_access_token_valid(latest) and latest.get('updated_at') != seen_updated_at:
+            print("✅ 다른 프로세스가 갱신한 토큰 사용")
+            return latest['access_token'], datetime.fromisoformat(latest['expires_at'])
+
+        return _refresh_locked(latest, force)
+
+
+def _refresh_locked(token_data, force=False):
+    """refresh token으로 갱신 후 저장 (TOKEN_LOCK_FILE 락을 잡은 상태에서 호출)"""
     if not token_data:
         # GitHub Actions 등 캐시 파일이 없는 환경: 환경변수로 폴백
-        refresh_token_env = os.getenv('LARK_REFRESH_TOKEN')
+        refresh_token_env = getenv('LARK_REFRESH_TOKEN')
         if refresh_token_env:
             print("🔄 환경변수 LARK_REFRESH_TOKEN으로 토큰 갱신 중...")
             try:
                 new_tokens = refresh_access_token(refresh_token_env)
-                save_tokens(
+                saved = save_tokens(
                     new_tokens['access_token'],
                     new_tokens['refresh_token'],
                     new_tokens['expires_in'],
                     new_tokens['refresh_expires_in']
                 )
                 print("✅ 토큰 갱신 완료")
-                return new_tokens['access_token']
+                return new_tokens['access_token'], datetime.fromisoformat(saved['expires_at'])
             except Exception as e:
                 print(f"❌ LARK_REFRESH_TOKEN 갱신 실패: {e}")
 
@@ -150,15 +191,9 @@ def get_valid_token():
         print("python3 scripts/lark_oauth.py를 실행하여 로그인해주세요.")
         return None
 
-    # Access token 만료 확인
-    expires_at = datetime.fromisoformat(token_data['expires_at'])
-
-    if datetime.now() < expires_at:
-        # 아직 유효함
-        return token_data['access_token']
-
-    # Access token이 만료됨
-    print("⚠️ Access token이 만료되었습니다.")
+    if not force:
+        # Access token이 만료됨
+        print("⚠️ Access token이 만료되었습니다.")
 
     # Refresh token이 있는지 확인
     if not token_data.get('refresh_token'):
@@ -182,7 +217,7 @@ def get_valid_token():
         new_tokens = refresh_access_token(token_data['refresh_token'])
 
         # 새 토큰 저장
-        save_tokens(
+        saved = save_tokens(
             new_tokens['access_token'],
             new_tokens['refresh_token'],
             new_tokens['expires_in'],
@@ -191,7 +226,7 @@ def get_valid_token():
 
         print(f"✅ 토큰 갱신 완료 (다음 만료: {datetime.now() + timedelta(seconds=new_tokens['expires_in'])})")
 
-        return new_tokens['access_token']
+        return new_tokens['access_token'], datetime.fromisoformat(saved['expires_at'])
 
     except Exception as e:
         print(f"❌ 토큰 갱신 실패: {e}")
@@ -199,6 +234,16 @@ def get_valid_token():
         return None
 
 
+# 프로세스 메모리 토큰 (디스크는 갱신할 때만 접근, 사용자 컨텍스트마다 따로)
+# 백그라운드 갱신 타이머도 그 사용자의 파일을 쓰도록 propagate로 묶는다
+_token_holder = PerUser(lambda: TokenHolder("Lark user", propagate(_fetch_token)))
+
+
+def get_valid_token():
+    """유효한 access token 반환 (메모리 캐시, 만료 직전 백그라운드 자동 갱신)"""
+    return _token_holder.get().get()
+
+
 def main():
     """테스트용 메인 함수"""
     print("=" * 60)
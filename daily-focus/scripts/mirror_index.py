@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Google 이벤트 ID → Lark 미러링 이벤트 ID 로컬 인덱스 (SQLite)
+
+gcal_sync.py가 만든 미러를 기억해 두고, 다음 동기화 때 Lark 일정을
+다시 조회하지 않고 특정 미러만 바로 수정/삭제할 수 있게 한다.
+
+테이블:
+    mirrors        — (google_event_id, event_date) → lark_event_id, content_hash, summary
+                     Google 이벤트가 다른 날짜로 옮겨지면 새 날짜의 미러가 새로 생기고,
+                     옛 날짜의 미러는 그 날짜를 동기화할 때 원본이 없어진 것으로 지워진다
+    indexed_dates  — 인덱스가 Lark 상태를 완전히 반영하고 있는 날짜
+                     (없는 날짜는 Lark 일정을 한 번 조회해서 인덱스를 채운다)
+"""
+
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+
+INDEX_DB_FILE = Path.home() / '.daily-focus' / 'mirror_index.db'
+
+# PRAGMA user_version — 2: mirrors 키가 (google_event_id, event_date)
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirrors (
+    google_event_id TEXT NOT NULL,
+    lark_event_id   TEXT NOT NULL,
+    content_hash    TEXT NOT NULL,
+    event_date      TEXT NOT NULL,
+    summary         TEXT,
+    updated_at      TEXT NOT NULL,
+    PRIMARY KEY (google_event_id, event_date)
+);
+CREATE INDEX IF NOT EXISTS idx_mirrors_event_date ON mirrors (event_date);
+CREATE TABLE IF NOT EXISTS indexed_dates (
+    event_date TEXT PRIMARY KEY,
+    indexed_at TEXT NOT NULL
+);
+"""
+
+# 버전 1(google_event_id 단독 키) 인덱스를 새 키로 옮김
+_MIGRATE_V1 = """
+ALTER TABLE mirrors RENAME TO mirrors_v1;
+DROP INDEX IF EXISTS idx_mirrors_event_date;
+""" + _SCHEMA + """
+INSERT INTO mirrors SELECT google_event_id, lark_event_id, content_hash, event_date, summary, updated_at
+    FROM mirrors_v1;
+DROP TABLE mirrors_v1;
+"""
+
+
+def content_hash(summary: str, description: str, start_ts: str, end_ts: str) -> str:
+    """미러 내용 해시 (제목/설명/시작/종료가 같으면 같은 값)"""
+    raw = "\x1f".join([summary or "", description or "", str(start_ts), str(end_ts)])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class MirrorIndex:
+    """미러링 인덱스 (스레드 간 공유 가능)"""
+
+    def __init__(self, path: Path = INDEX_DB_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._event_locks = {}
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._migrate()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        has_mirrors = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'mirrors'"
+        ).fetchone()
+        if has_mirrors and version < SCHEMA_VERSION:
+            self._conn.executescript(_MIGRATE_V1)
+        else:
+            self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def event_lock(self, google_event_id: str) -> threading.Lock:
+        """Google 이벤트 하나의 미러 변경을 직렬화하는 락 (날짜 스레드끼리 같은 이벤트를 다룰 때)"""
+        with self._lock:
+            return self._event_locks.setdefault(google_event_id, threading.Lock())
+
+    def get(self, google_event_id: str, event_date: str):
+        """Google 이벤트 ID + 날짜로 미러 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM mirrors WHERE google_event_id = ? AND event_date = ?",
+                (google_event_id, event_date)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def for_date(self, event_date: str) -> list:
+        """해당 날짜(YYYY-MM-DD)의 미러 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM mirrors WHERE event_date = ?", (event_date,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def upsert(self, google_event_id: str, lark_event_id: str, content_hash: str,
+               event_date: str, summary: str = None) -> None:
+        """미러 추가/갱신"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO mirrors (google_event_id, lark_event_id, content_hash, event_date, summary, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(google_event_id, event_date) DO UPDATE SET
+                    lark_event_id = excluded.lark_event_id,
+                    content_hash = excluded.content_hash,
+                    summary = excluded.summary,
+                    updated_at = excluded.updated_at
+                """,
+                (google_event_id, lark_event_id, content_hash, event_date, summary,
+                 datetime.now().isoformat())
+            )
+
+    def remove(self, google_event_id: str, event_date: str) -> None:
+        """해당 날짜의 미러 삭제 (다른 날짜로 옮겨 간 같은 이벤트의 미러는 그대로)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM mirrors WHERE google_event_id = ? AND event_date = ?",
+                (google_event_id, event_date)
+            )
+
+    def is_date_indexed(self, event_date: str) -> bool:
+        """해당 날짜의 미러가 인덱스에 모두 기록되어 있는지"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM indexed_dates WHERE event_date = ?", (event_date,)
+            ).fetchone()
+        return row is not None
+
+    def mark_date_indexed(self, event_date: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO indexed_dates (event_date, indexed_at) VALUES (?, ?)",
+                (event_date, datetime.now().isoformat())
+            )
+
+    def forget_date(self, event_date: str) -> None:
+        """해당 날짜를 미색인 상태로 되돌림 (다음 동기화 때 Lark 조회로 다시 채움)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM mirrors WHERE event_date = ?", (event_date,))
+            self._conn.execute("DELETE FROM indexed_dates WHERE event_date = ?", (event_date,))
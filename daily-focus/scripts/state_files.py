@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+~/.daily-focus 상태 파일 유틸
+
+여러 프로세스(gcal_sync.py, nightly_flow.py 등)가 동시에 같은 파일을
+읽고 쓰는 경우를 위한 도구.
+- file_lock(): 프로세스 간 배타 락 (fcntl.flock)
+- atomic_write_text() / atomic_write_json(): 임시 파일에 쓴 뒤 rename으로 교체
+  (읽는 쪽은 항상 이전 내용 또는 새 내용 전체만 보게 됨)
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 락 없이 동작
+    fcntl = None
+
+
+@contextmanager
+def file_lock(lock_path: Path):
+    """lock_path에 대한 프로세스 간 배타 락 (with 블록 동안 유지)"""
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(lock_path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체 (기존 권한 유지)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Path, data) -> None:
+    """JSON 파일 원자적 저장"""
+    atomic_write_text(path, json.dumps(data, indent=2, ensure_ascii=False))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+팀 공통 Focus 시간 찾기
+
+여러 사용자의 바쁜 구간을 분 단위 비트맵(Python int)으로 만들어 OR로 합치고,
+근무시간 마스크와 AND해서 모두가 비어 있는 시간을 한 번에 구한다.
+(사용자 N명 × 일정 M개를 구간끼리 비교하지 않고 비트 연산 N번으로 끝남)
+
+사용법:
+    python3 scripts/team_focus.py --members ou_aaa,ou_bbb,ou_ccc
+    python3 scripts/team_focus.py --days 5 --min-minutes 90 --top 3
+    # --members를 생략하면 LARK_TEAM_OPEN_IDS (쉼표 구분) 사용
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from lark_calendar import get_next_workday
+from busy_source import FreeBusySource
+from availability import AvailabilityPolicy, WEEK_POLICY, epoch_at
+
+# 비트 하나 = 1분
+MINUTE = 60
+
+
+class MinuteGrid:
+    """range_start부터 1분 단위 비트 위치 계산 (bit i = range_start + i분)"""
+
+    def __init__(self, range_start: datetime, range_end: datetime):
+        self.origin = int(range_start.timestamp()) // MINUTE * MINUTE
+        self.size = (int(range_end.timestamp()) - self.origin + MINUTE - 1) // MINUTE
+
+    def span(self, start_ts: int, end_ts: int) -> int:
+        """[start_ts, end_ts) 구간의 비트마스크 (격자 밖은 잘라냄, 걸친 분은 바쁜 것으로 올림)"""
+        lo = max(0, (start_ts - self.origin) // MINUTE)
+        hi = min(self.size, -(-(end_ts - self.origin) // MINUTE))
+        if hi <= lo:
+            return 0
+        return ((1 << (hi - lo)) - 1) << lo
+
+    def to_ts(self, bit: int) -> int:
+        return self.origin + bit * MINUTE
+
+
+def busy_bitmap(grid: MinuteGrid, intervals) -> int:
+    """[(start_ts, end_ts), ...] → 바쁜 분 비트맵"""
+    bits = 0
+    for start_ts, end_ts in intervals:
+        bits |= grid.span(start_ts, end_ts)
+    return bits
+
+
+def working_bitmap(grid: MinuteGrid, days, policy: AvailabilityPolicy) -> int:
+    """날짜별 근무시간에서 고정 일정(점심 등)을 뺀 비트맵"""
+    bits = 0
+    for day in days:
+        bits |= grid.span(epoch_at(day, policy.work_start), epoch_at(day, policy.work_end))
+        for start, end in policy.blocked:
+            bits &= ~grid.span(epoch_at(day, start), epoch_at(day, end))
+    return bits
+
+
+def iter_runs(bits: int):
+    """비트맵에서 연속된 1 구간을 (시작 비트, 길이)로 반환"""
+    while bits:
+        low = (bits & -bits).bit_length() - 1
+        shifted = bits >> low
+        length = (shifted ^ (shifted + 1)).bit_length() - 1
+        yield low, length
+        bits &= ~(((1 << length) - 1) << low)
+
+
+def common_free_bitmap(grid: MinuteGrid, busy_by_user: dict, days,
+                       policy: AvailabilityPolicy = WEEK_POLICY) -> int:
+    """모든 사용자가 비어 있는 근무시간 비트맵"""
+    busy = 0
+    for intervals in busy_by_user.values():
+        busy |= busy_bitmap(grid, intervals)
+    return working_bitmap(grid, days, policy) & ~busy
+
+
+def largest_common_windows(busy_by_user: dict, days, policy: AvailabilityPolicy = WEEK_POLICY,
+                           min_minutes: int = 60, top: int = 5) -> list:
+    """모두가 비어 있는 가장 긴 시간대 top개
+
+    Args:
+        busy_by_user: {user_id: [(start_ts, end_ts), ...]}
+        days: 대상 날짜 목록 (datetime, 00:00)
+
+    Returns:
+        list: (start_dt, end_dt, minutes) 튜플, 긴 순서 (같으면 이른 순서)
+    """
+    if not days:
+        return []
+
+    grid = MinuteGrid(days[0], days[-1] + timedelta(days=1))
+    free = common_free_bitmap(grid, busy_by_user, days, policy)
+    tz = days[0].tzinfo
+
+    windows = [(bit, length) for bit, length in iter_runs(free) if length >= min_minutes]
+    windows.sort(key=lambda w: (-w[1], w[0]))
+
+    return [(datetime.fromtimestamp(grid.to_ts(bit), tz=tz),
+             datetime.fromtimestamp(grid.to_ts(bit + length), tz=tz),
+             length)
+            for bit, length in windows[:top]]
+
+
+def load_team_busy(user_ids: list, range_start: datetime, range_end: datetime, source=None):
+    """사용자별 바쁜 구간 조회 (기본: freebusy/batch로 묶어서 조회)
+
+    Returns:
+        (busy_by_user, failed): busy_by_user는 {user_id: [(start_ts, end_ts), ...]},
+            조회 실패한 사용자는 failed에 담긴다
+            (실패한 사람을 "비어 있음"으로 취급하지 않도록 호출부가 확인할 것)
+    """
+    source = source or FreeBusySource()
+    events_by_user, failed = source.fetch(user_ids, range_start, range_end)
+    busy_by_user = {
+        user_id: [(event.start, event.end) for event in events if event.busy]
+        for user_id, events in events_by_user.items()
+    }
+    return busy_by_user, failed
+
+
+def main():
+    """메인 함수 - 팀 공통 빈 시간 출력"""
+    parser = argparse.ArgumentParser(description="팀 공통 Focus 시간 찾기")
+    parser.add_argument("--members", type=str, default=os.getenv("LARK_TEAM_OPEN_IDS", ""),
+                        help="팀원 open_id 목록 (쉼표 구분, 기본: LARK_TEAM_OPEN_IDS)")
+    parser.add_argument("--days", type=int, default=5, help="대상 근무일 수 (기본: 5, 내일부터)")
+    parser.add_argument("--min-minutes", type=int, default=60, help="최소 공통 시간 (분, 기본: 60)")
+    parser.add_argument("--top", type=int, default=5, help="보여줄 시간대 수 (기본: 5)")
+    args = parser.parse_args()
+
+    members = [m.strip() for m in args.members.split(",") if m.strip()]
+    if not members:
+        print("❌ --members 또는 LARK_TEAM_OPEN_IDS가 필요합니다.")
+        sys.exit(1)
+
+    days = []
+    current = get_next_workday()
+    for _ in range(args.days):
+        days.append(current)
+        current = get_next_workday(current)
+
+    print(f"👥 팀원 {len(members)}명 바쁜 시간 조회: "
+          f"{days[0].strftime('%m/%d')} ~ {days[-1].strftime('%m/%d')}")
+    busy_by_user, failed = load_team_busy(members, days[0], days[-1] + timedelta(days=1))
+    if failed:
+        print(f"⚠️ 조회 실패 {len(failed)}명 (결과에서 제외됨): {', '.join(failed)}")
+
+    windows = largest_common_windows(busy_by_user, days, min_minutes=args.min_minutes, top=args.top)
+    if not windows:
+        print(f"😔 {args.min_minutes}분 이상 모두가 비어 있는 시간이 없어요.")
+        return
+
+    weekday_names = ['월', '화', '수', '목', '금', '토', '일']
+    print(f"🔍 공통 빈 시간 ({args.min_minutes}분 이상, 긴 순서):")
+    for start, end, minutes in windows:
+        day_name = weekday_names[start.weekday()]
+        print(f"  - {start.strftime('%m/%d')}({day_name}) "
+              f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')} ({minutes}분)")
+
+
+if __name__ == "__main__":
+    main()
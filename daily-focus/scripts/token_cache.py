@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+프로세스 메모리 토큰 보관소
+
+토큰과 만료 시각을 메모리에 들고 있다가, 만료 직전에 백그라운드 타이머로
+미리 갱신한다. 디스크 캐시(JSON)는 갱신할 때만 읽고 쓴다.
+
+사용법:
+    def _fetch(force):
+        ...  # (token, expires_at) 또는 None 반환
+        return token, expires_at
+
+    _holder = TokenHolder("tenant", _fetch)
+    token = _holder.get()
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+# 만료 몇 초 전에 백그라운드 갱신할지
+REFRESH_LEAD = timedelta(seconds=60)
+
+# 갱신 직후에도 만료가 임박한 토큰이면 최소 이 간격 뒤에 재시도
+MIN_REFRESH_DELAY = 30
+
+
+class TokenHolder:
+    """토큰 + 만료 시각을 메모리에 보관하고 만료 전에 자동 갱신
+
+    Args:
+        name: 로그 출력용 이름
+        fetch: fetch(force: bool) -> (token, expires_at) | None
+            force=False면 디스크 캐시가 유효할 때 그대로 반환,
+            force=True면 무조건 새로 발급한다.
+        refresh_lead: 만료 몇 분 전에 백그라운드 갱신할지
+    """
+
+    def __init__(self, name: str, fetch, refresh_lead: timedelta = REFRESH_LEAD):
+        self.name = name
+        self._fetch = fetch
+        self._refresh_lead = refresh_lead
+        self._lock = threading.Lock()
+        # (token, expires_at) 또는 None — 락 없이 읽으므로 통째로 한 번에 바꾼다
+        self._current = None
+        self._timer = None
+
+    @staticmethod
+    def _valid_token(current):
+        """current가 아직 유효하면 토큰, 아니면 None"""
+        if not current:
+            return None
+        token, expires_at = current
+        if token and expires_at is not None and datetime.now() < expires_at:
+            return token
+        return None
+
+    def get(self):
+        """유효한 토큰 반환 (메모리에 없거나 만료됐을 때만 fetch 호출)"""
+        token = self._valid_token(self._current)
+        if token:
+            return token
+
+        with self._lock:
+            # 락 대기 중 다른 스레드가 이미 갱신했으면 그대로 사용
+            token = self._valid_token(self._current)
+            if token:
+                return token
+            return self._load(force=False)
+
+    def _load(self, force: bool):
+        result = self._fetch(force)
+        if not result:
+            self._current = None
+            self._cancel_timer()
+            return None
+
+        self._current = tuple(result)
+        self._schedule_refresh()
+        return self._current[0]
+
+    def _cancel_timer(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule_refresh(self) -> None:
+        """만료 refresh_lead 전에 백그라운드 갱신 예약"""
+        self._cancel_timer()
+
+        delay = (self._current[1] - self._refresh_lead - datetime.now()).total_seconds()
+        self._timer = threading.Timer(max(delay, MIN_REFRESH_DELAY), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        # 실패해도 기존 토큰은 만료 전까지 계속 사용, 만료 후엔 get()이 다시 시도
+        with self._lock:
+            try:
+                result = self._fetch(True)
+            except Exception as e:
+                print(f"⚠️ {self.name} 토큰 백그라운드 갱신 실패: {e}")
+                return
+
+            if result:
+                self._current = tuple(result)
+                self._schedule_refresh()
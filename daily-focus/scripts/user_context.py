@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+사용자별 실행 컨텍스트 (여러 사용자를 한 프로세스에서 돌릴 때)
+
+daily-focus 모듈은 원래 프로세스 하나 = 사용자 하나(.env)를 전제로 환경변수와
+모듈 전역(토큰, 캘린더 ID, 스냅샷, 리스너 커서)을 쓴다. multi_user_flow.py는
+사용자마다 스레드를 나눠 돌리므로, 그 값들을 contextvars로 사용자별로 가른다.
+
+    getenv(name)        — 현재 사용자의 설정(LARK_CHAT_ID 등)을 먼저, 없으면 os.getenv
+                          (USER_SCOPED_KEYS는 os.getenv로 넘어가지 않음 — 남의 토큰을 쓰지 않게)
+    state_path(path)    — ~/.daily-focus/x → 사용자 상태 디렉토리/x
+    PerUser(factory)    — 사용자마다 따로 만들어지는 값 (컨텍스트 밖이면 프로세스에 하나)
+    propagate(fn)       — 다른 스레드(ThreadPoolExecutor, 타이머)에서도 현재 사용자로 실행
+
+컨텍스트를 쓰지 않는 단일 사용자 실행(nightly_flow.py)은 기존과 똑같이 동작한다.
+
+사용법:
+    user = UserContext("alice", {"LARK_CHAT_ID": "oc_xxx", "LARK_USER_OPEN_ID": "ou_xxx"})
+    with use(user):
+        run_nightly()
+"""
+
+import os
+import sys
+import threading
+import contextvars
+from pathlib import Path
+from contextlib import contextmanager
+
+STATE_ROOT = Path.home() / '.daily-focus'
+
+_current = contextvars.ContextVar("daily_focus_user", default=None)
+
+# 사용자마다 달라야 하는 설정 (컨텍스트 안에서는 프로세스 환경변수로 대체하지 않음)
+USER_SCOPED_KEYS = frozenset({
+    "LARK_CHAT_ID", "LARK_USER_OPEN_ID", "LARK_USER_TOKEN", "LARK_REFRESH_TOKEN",
+})
+
+
+class UserContext:
+    """사용자 한 명의 설정과 상태
+
+    Args:
+        user_id: 로그/상태 디렉토리용 ID
+        env: 환경변수 대신 쓸 값 (LARK_CHAT_ID, LARK_USER_OPEN_ID, LARK_REFRESH_TOKEN 등)
+        state_dir: 토큰/캐시/기록 파일 디렉토리 (기본: ~/.daily-focus/users/{user_id})
+        waiter: 메시지 대기를 맡길 ChatMultiplexer (없으면 lark_event_listener가 직접 대기)
+    """
+
+    def __init__(self, user_id: str, env: dict = None, state_dir: Path = None, waiter=None):
+        self.user_id = user_id
+        self.env = {key: value for key, value in (env or {}).items() if value}
+        self.state_dir = Path(state_dir) if state_dir else STATE_ROOT / 'users' / user_id
+        self.waiter = waiter
+        self._values = {}
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"UserContext({self.user_id!r})"
+
+
+def current():
+    """현재 사용자 컨텍스트 (없으면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def use(user: UserContext):
+    """with 블록 동안 현재 사용자를 user로"""
+    token = _current.set(user)
+    try:
+        yield user
+    finally:
+        _current.reset(token)
+
+
+def propagate(fn):
+    """지금의 사용자 컨텍스트로 fn을 실행하는 함수 반환 (다른 스레드로 넘길 때)"""
+    user = _current.get()
+    if user is None:
+        return fn
+
+    def run(*args, **kwargs):
+        token = _current.set(user)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
+
+
+def getenv(name: str, default: str = None):
+    """현재 사용자 설정 → 환경변수 순으로 조회
+
+    사용자 컨텍스트 안에서 USER_SCOPED_KEYS는 그 사용자 설정에서만 찾는다
+    (없으면 default — .env의 다른 사용자 토큰/채팅으로 대체되지 않음).
+    """
+    user = _current.get()
+    if user is not None:
+        if name in user.env:
+            return user.env[name]
+        if name in USER_SCOPED_KEYS:
+            return default
+    return os.getenv(name, default)
+
+
+def state_path(path: Path) -> Path:
+    """상태 파일 경로 (사용자 컨텍스트 안이면 사용자 디렉토리의 같은 이름 파일)"""
+    user = _current.get()
+    if user is None:
+        return path
+    user.state_dir.mkdir(parents=True, exist_ok=True)
+    return user.state_dir / Path(path).name
+
+
+class PerUser:
+    """사용자별로 따로 보관하는 값
+
+    factory는 그 사용자의 컨텍스트 안에서 처음 get()할 때 한 번 호출된다.
+    컨텍스트 밖에서는 프로세스 전체에 값 하나 (기존 모듈 전역과 같음).
+    """
+
+    def __init__(self, factory=lambda: None):
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._values = {}
+
+    def _store(self):
+        user = _current.get()
+        if user is None:
+            return self._values, self._lock
+        return user._values, user._lock
+
+    def get(self):
+        values, lock = self._store()
+        with lock:
+            if id(self) not in values:
+                values[id(self)] = self._factory()
+            return values[id(self)]
+
+    def set(self, value) -> None:
+        values, lock = self._store()
+        with lock:
+            values[id(self)] = value
+
+
+class PrefixedStdout:
+    """출력 줄 앞에 현재 사용자 ID를 붙이는 stdout (여러 사용자 로그가 섞여도 구분되게)"""
+
+    def __init__(self, stream=None):
+        self._stream = stream or sys.stdout
+        self._lock = threading.Lock()
+        self._partial = threading.local()
+
+    def write(self, text: str) -> int:
+        user = _current.get()
+        if user is None:
+            return self._stream.write(text)
+
+        buffered = getattr(self._partial, "text", "") + text
+        *lines, rest = buffered.split("\n")
+        self._partial.text = rest
+        if lines:
+            with self._lock:
+                self._stream.write("".join(f"[{user.user_id}] {line}\n" for line in lines))
+        return len(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
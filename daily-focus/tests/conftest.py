@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# scripts/ 모듈은 서로를 최상위 모듈로 import 한다 (nightly_flow.py와 같은 방식)
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT))
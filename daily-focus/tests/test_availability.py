@@ -0,0 +1,52 @@
+from datetime import datetime, date
+
+import lark_calendar
+from availability import WEEK_POLICY, free_slots_for_days
+from calendar_event import CalendarEvent
+
+DAY = datetime(2026, 10, 20)
+
+
+def _ts(hour, minute=0):
+    return int(DAY.replace(hour=hour, minute=minute).timestamp())
+
+
+def _event(start, end, kind="event", busy=True, summary=""):
+    return CalendarEvent(summary or f"{start}-{end}", summary, "", start, end, busy, kind,
+                         datetime.fromtimestamp(start).date())
+
+
+def _all_day(day: date):
+    start = int(datetime(day.year, day.month, day.day).timestamp())
+    return CalendarEvent("all", "휴가", "", start, start + 86400, True, "all_day", day)
+
+
+def _slots(events, policy):
+    return [(s.strftime("%H:%M"), e.strftime("%H:%M")) for s, e, _ in free_slots_for_days(events, [DAY], policy)]
+
+
+def test_week_policy_keeps_baseline_semantics():
+    """--find-gaps: 종일 일정은 무시하고, free 일정과 8시간 넘는 일정은 바쁜 시간으로 반영"""
+    events = [
+        _all_day(DAY.date()),
+        _event(_ts(13), _ts(14), busy=False),
+        _event(_ts(16), _ts(17)),
+    ]
+    assert _slots(events, WEEK_POLICY) == [("10:00", "11:00"), ("12:00", "13:00"),
+                                           ("14:00", "16:00"), ("17:00", "19:00")]
+
+    long_event = [_event(_ts(9), _ts(18))]
+    assert _slots(long_event, WEEK_POLICY) == [("18:00", "19:00")]
+
+
+def test_find_gaps_uses_own_calendar_events(monkeypatch):
+    monkeypatch.setattr(lark_calendar, "get_remaining_weekdays", lambda: (DAY, DAY))
+    monkeypatch.setattr(lark_calendar, "iter_remaining_weekday_events",
+                        lambda: iter([_all_day(DAY.date()), _event(_ts(13), _ts(14), busy=False)]))
+
+    slots = lark_calendar.find_free_slots(60)
+
+    assert [(s.strftime("%H:%M"), e.strftime("%H:%M")) for s, e, _ in slots] == [
+        ("10:00", "11:00"), ("12:00", "13:00"), ("14:00", "19:00")
+    ]
+
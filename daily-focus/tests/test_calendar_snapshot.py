@@ -0,0 +1,97 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from calendar_event import CalendarEvent
+from calendar_snapshot import CalendarSnapshot
+
+MONDAY = datetime(2026, 10, 19)
+
+
+def _event(day, event_id="e1"):
+    start = int(day.replace(hour=10).timestamp())
+    return CalendarEvent(event_id, "회의", "", start, start + 3600, True, "event", day.date())
+
+
+def _day(day):
+    return day, day.replace(hour=23, minute=59, second=59)
+
+
+class BlockingFetch:
+    """첫 조회를 release 전까지 붙잡아 두는 fetch"""
+
+    def __init__(self, result=lambda start: [_event(start)]):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._result = result
+
+    def __call__(self, range_start, range_end):
+        self.calls.append(range_start)
+        if len(self.calls) == 1:
+            self.started.set()
+            assert self.release.wait(5)
+        return self._result(range_start)
+
+
+def _query_in_thread(snapshot, day, results):
+    thread = threading.Thread(target=lambda: results.append(snapshot.query(*_day(day))))
+    thread.start()
+    return thread
+
+
+def test_same_week_is_fetched_once_and_cached_weeks_do_not_wait():
+    fetch = BlockingFetch()
+    snapshot = CalendarSnapshot(fetch, ttl=timedelta(0))
+    next_week = MONDAY + timedelta(days=7)
+    snapshot.store(next_week, next_week + timedelta(days=6, hours=23, minutes=59, seconds=59),
+                   [_event(next_week, "e2")])
+
+    results = []
+    first = _query_in_thread(snapshot, MONDAY, results)
+    assert fetch.started.wait(5)
+    second = _query_in_thread(snapshot, MONDAY + timedelta(days=1), results)
+
+    # 다른 주를 받아 오는 중이어도 이미 받아 둔 주는 바로 응답
+    assert [e.event_id for e in snapshot.query(*_day(next_week))] == ["e2"]
+
+    fetch.release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(fetch.calls) == 1
+    assert sorted(len(r) for r in results) == [0, 1]
+
+
+def test_invalidate_during_fetch_drops_stale_result():
+    fetch = BlockingFetch()
+    snapshot = CalendarSnapshot(fetch, ttl=timedelta(0))
+
+    results = []
+    thread = _query_in_thread(snapshot, MONDAY, results)
+    assert fetch.started.wait(5)
+    snapshot.invalidate()
+    fetch.release.set()
+    thread.join(5)
+
+    assert [e.event_id for e in results[0]] == ["e1"]
+    assert snapshot.peek(*_day(MONDAY)) is None
+    snapshot.query(*_day(MONDAY))
+    assert len(fetch.calls) == 2
+
+
+def test_failed_fetch_is_reported_to_waiters():
+    fetch = BlockingFetch(result=lambda start: None)
+    snapshot = CalendarSnapshot(fetch, ttl=timedelta(0))
+
+    results = []
+    first = _query_in_thread(snapshot, MONDAY, results)
+    assert fetch.started.wait(5)
+    second = _query_in_thread(snapshot, MONDAY, results)
+    time.sleep(0.1)  # 두 번째 조회가 진행 중인 조회를 기다리게
+    fetch.release.set()
+    first.join(5)
+    second.join(5)
+
+    assert results == [None, None]
+    assert len(fetch.calls) == 1
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import busy_source
+import focus_block_store
+import lark_calendar
+from availability import (
+    AvailabilityPolicy, IgnoreIntervals, IntervalIndex, NIGHTLY_POLICY, busy_intervals_for_day
+)
+from calendar_event import CalendarEvent
+
+DAY = datetime(2026, 10, 20)
+
+
+def _ts(hour, minute=0, day=DAY):
+    return int(day.replace(hour=hour, minute=minute).timestamp())
+
+
+def _event(start, end, kind="event", event_id=None, summary=""):
+    return CalendarEvent(event_id or f"{start}-{end}", summary, "", start, end, True, kind,
+                         datetime.fromtimestamp(start).date())
+
+
+def _hours(slots):
+    return [(s.strftime("%H:%M"), e.strftime("%H:%M")) for s, e, _ in slots]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(focus_block_store, "FOCUS_BLOCKS_FILE", tmp_path / "focus_blocks.json")
+    monkeypatch.setattr(focus_block_store, "FOCUS_BLOCKS_LOCK", tmp_path / "focus_blocks.lock")
+    return focus_block_store
+
+
+# ---------- IgnoreIntervals ----------
+
+def test_ignore_intervals_drops_exact_block():
+    block = (_ts(14), _ts(15))
+    policy = AvailabilityPolicy(ignore_rules=[IgnoreIntervals({block})])
+    events = [_event(*block, kind="focus"), _event(_ts(16), _ts(17))]
+
+    assert busy_intervals_for_day(IntervalIndex(events), DAY, policy) == [[_ts(16), _ts(17)]]
+
+
+def test_ignore_intervals_keeps_other_events():
+    policy = AvailabilityPolicy(ignore_rules=[IgnoreIntervals({(_ts(14), _ts(15))})])
+    events = [_event(_ts(14), _ts(15, 30))]
+
+    assert busy_intervals_for_day(IntervalIndex(events), DAY, policy) == [[_ts(14), _ts(15, 30)]]
+
+
+# ---------- 다시 계획할 때 내 블록을 바쁜 시간에서 제외 ----------
+
+MEETING = (_ts(13), _ts(14))
+BLOCK = (_ts(14), _ts(16))
+
+
+@pytest.fixture
+def own_calendar(monkeypatch):
+    """회의(13-14) 바로 뒤에 지난번 Focus Block(14-16)이 붙어 있는 캘린더"""
+    events = [_event(*MEETING), _event(*BLOCK, kind="focus", event_id="fb1", summary="🔒 작업")]
+    monkeypatch.setenv("LARK_USER_OPEN_ID", "ou_me")
+    monkeypatch.setattr(lark_calendar, "events_between", lambda start, end: events)
+    monkeypatch.setattr(busy_source, "events_between", lambda start, end: events)
+
+
+def test_block_next_to_meeting_is_ignored(own_calendar):
+    policy = NIGHTLY_POLICY.with_ignore_rules(IgnoreIntervals({BLOCK}))
+    source = busy_source.default_busy_source(policy)
+
+    assert isinstance(source, busy_source.OwnCalendarSource)
+    slots = lark_calendar.find_free_slots_for_days([DAY], policy=policy, source=source)
+    assert _hours(slots["2026-10-20"]) == [("10:00", "11:00"), ("12:00", "13:00"), ("14:00", "19:00")]
+
+
+def test_merged_freebusy_span_falls_back_to_events(own_calendar):
+    """freebusy는 13-16을 한 구간으로 돌려주므로 무시 규칙이 있으면 일정 단위 조회로 대체"""
+    class MergedFreeBusy:
+        per_event = False
+
+        def fetch(self, user_ids, range_start, range_end):
+            return {user_ids[0]: [CalendarEvent.from_busy(MEETING[0], BLOCK[1])]}, []
+
+    policy = NIGHTLY_POLICY.with_ignore_rules(IgnoreIntervals({BLOCK}))
+    slots = lark_calendar.find_free_slots_for_days([DAY], policy=policy, source=MergedFreeBusy())
+
+    assert ("14:00", "19:00") in _hours(slots["2026-10-20"])
+
+
+# ---------- 기록과 실제 캘린더 비교 ----------
+
+def _tomorrow(hour):
+    day = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return day.isoformat()
+
+
+def _fake_create(created):
+    def create(blocks):
+        results = []
+        for title, start, duration in blocks:
+            created.append((title, start, duration))
+            results.append({"title": title, "start": start, "duration": duration,
+                            "success": True, "event_id": f"new{len(created)}", "error": None})
+        return results
+    return create
+
+
+def test_block_deleted_in_lark_is_recreated(store, monkeypatch):
+    start = _tomorrow(14)
+    store.record_changes([{"event_id": "fb1", "plan": "p", "title": "작업", "start": start, "duration": 120}])
+    created = []
+    monkeypatch.setattr(lark_calendar, "events_between", lambda s, e: [])
+    monkeypatch.setattr(lark_calendar, "create_focus_blocks", _fake_create(created))
+    monkeypatch.setattr(lark_calendar, "_delete_events", lambda ids: list(ids))
+
+    result = lark_calendar.reconcile_focus_blocks("p", [("작업", start, 120)])
+
+    assert result["kept"] == []
+    assert created == [("작업", start, 120)]
+    assert [b["event_id"] for b in store.load_blocks("p")] == ["new1"]
+
+
+def test_block_still_in_lark_is_kept(store, monkeypatch):
+    start = _tomorrow(14)
+    store.record_changes([{"event_id": "fb1", "plan": "p", "title": "작업", "start": start, "duration": 120}])
+    begin = int(datetime.fromisoformat(start).timestamp())
+    live = [_event(begin, begin + 7200, kind="focus", event_id="fb1")]
+    created = []
+    monkeypatch.setattr(lark_calendar, "events_between", lambda s, e: live)
+    monkeypatch.setattr(lark_calendar, "create_focus_blocks", _fake_create(created))
+    monkeypatch.setattr(lark_calendar, "_delete_events", lambda ids: list(ids))
+
+    result = lark_calendar.reconcile_focus_blocks("p", [("작업", start, 120)])
+
+    assert [b["event_id"] for b in result["kept"]] == ["fb1"]
+    assert created == []
+
+
+def test_delete_today_also_removes_unrecorded_legacy_blocks(store, monkeypatch):
+    start = _tomorrow(14)
+    store.record_changes([{"event_id": "fb1", "plan": "p", "title": "작업", "start": start, "duration": 60}])
+    begin = int(datetime.fromisoformat(start).timestamp())
+    listing = [
+        _event(begin, begin + 3600, kind="focus", event_id="fb1", summary="🔒 작업"),
+        _event(begin + 7200, begin + 9000, kind="focus", event_id="legacy", summary="🔒 예전 블록"),
+        _event(begin + 9000, begin + 10800, event_id="meeting", summary="회의"),
+    ]
+    deleted = []
+    window_start = datetime.fromisoformat(start).replace(hour=0)
+    monkeypatch.setattr(lark_calendar, "get_remaining_weekdays", lambda: (window_start, window_start))
+    monkeypatch.setattr(lark_calendar, "list_today_events", lambda: listing)
+    monkeypatch.setattr(lark_calendar, "delete_event", lambda event_id: deleted.append(event_id) or True)
+
+    assert lark_calendar.delete_focus_blocks_today() == 2
+    assert sorted(deleted) == ["fb1", "legacy"]
+    assert store.load_blocks() == []
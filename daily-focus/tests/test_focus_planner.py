@@ -0,0 +1,90 @@
+from datetime import datetime
+
+from focus_planner import plan_focus_blocks, plan_greedy, plan_spillover
+
+DAY = datetime(2026, 10, 20)
+
+
+def _slot(start, end, day=DAY):
+    """("HH:MM", "HH:MM") → (start_dt, end_dt, gap_minutes)"""
+    start_dt = day.replace(hour=int(start[:2]), minute=int(start[3:]))
+    end_dt = day.replace(hour=int(end[:2]), minute=int(end[3:]))
+    return start_dt, end_dt, int((end_dt - start_dt).total_seconds() // 60)
+
+
+def _plan(blocks):
+    return [(start.strftime("%m-%d %H:%M"), minutes) for start, minutes in blocks]
+
+
+FRAGMENTED = [_slot("09:00", "10:00"), _slot("10:30", "11:15"),
+              _slot("11:30", "12:30"), _slot("13:00", "17:00")]
+
+
+def test_prefers_one_long_block_over_scattered_gaps():
+    assert _plan(plan_focus_blocks(FRAGMENTED, 240)) == [("10-20 13:00", 240)]
+    assert len(plan_greedy(FRAGMENTED, 240)) == 4
+
+
+def test_covers_as_much_as_possible_when_short():
+    slots = [_slot("09:00", "10:00"), _slot("14:00", "14:30")]
+
+    assert _plan(plan_focus_blocks(slots, 240)) == [("10-20 09:00", 60), ("10-20 14:00", 30)]
+
+
+def test_respects_max_blocks():
+    slots = [_slot(f"{hour:02d}:00", f"{hour:02d}:45") for hour in (9, 11, 13, 15)]
+
+    blocks = plan_focus_blocks(slots, 180, max_blocks=2)
+
+    assert len(blocks) == 2
+    assert sum(minutes for _, minutes in blocks) == 90
+
+
+def test_block_hugs_slot_edge_nearest_preferred_time():
+    slots = [_slot("06:00", "10:30")]
+
+    assert _plan(plan_focus_blocks(slots, 60, preferred_time="10:00")) == [("10-20 09:30", 60)]
+    assert _plan(plan_focus_blocks(slots, 60, preferred_time="06:00")) == [("10-20 06:00", 60)]
+
+
+def test_skips_gaps_shorter_than_min_block():
+    slots = [_slot("09:00", "09:20"), _slot("15:00", "16:00")]
+
+    assert _plan(plan_focus_blocks(slots, 60)) == [("10-20 15:00", 60)]
+
+
+
+def test_short_need_books_only_what_is_needed():
+    assert _plan(plan_focus_blocks([_slot("09:00", "10:00")], 15, preferred_time="09:00")) == [
+        ("10-20 09:00", 15)
+    ]
+
+
+def test_spillover_applies_daily_cap_in_day_order():
+    next_day = datetime(2026, 10, 21)
+    slots_by_day = [(DAY, [_slot("09:00", "17:00")]),
+                    (next_day, [_slot("09:00", "17:00", day=next_day)])]
+
+    blocks = plan_spillover(slots_by_day, 300, daily_cap_minutes=180, preferred_time="09:00")
+
+    assert _plan(blocks) == [("10-20 09:00", 180), ("10-21 09:00", 120)]
+
+
+def test_spillover_without_cap_stays_on_first_day_when_it_fits():
+    next_day = datetime(2026, 10, 21)
+    slots_by_day = [(DAY, [_slot("09:00", "19:00")]),
+                    (next_day, [_slot("09:00", "17:00", day=next_day)])]
+
+    blocks = plan_spillover(slots_by_day, 480, preferred_time="09:00")
+
+    assert _plan(blocks) == [("10-20 09:00", 480)]
+
+
+def test_spillover_moves_short_remainder_without_padding():
+    next_day = datetime(2026, 10, 21)
+    slots_by_day = [(DAY, [_slot("09:00", "11:00")]),
+                    (next_day, [_slot("09:00", "17:00", day=next_day)])]
+
+    blocks = plan_spillover(slots_by_day, 130, preferred_time="09:00")
+
+    assert _plan(blocks) == [("10-20 09:00", 120), ("10-21 09:00", 10)]
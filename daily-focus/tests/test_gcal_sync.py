@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from mirror_index import MirrorIndex
+
+gcal_sync = pytest.importorskip("gcal_sync")
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = MirrorIndex(tmp_path / "mirror_index.db")
+    yield index
+    index.close()
+
+
+def _event(gid, hour):
+    return {
+        "id": gid, "summary": gid, "html_link": f"https://calendar/{gid}",
+        "start_dt": datetime(2026, 10, 20, hour), "end_dt": datetime(2026, 10, 20, hour + 1),
+        "is_all_day": False,
+    }
+
+
+def test_failed_lark_listing_is_not_an_empty_day(index, monkeypatch):
+    """Lark 조회 실패 시 미러를 새로 만들지 않고 날짜도 색인 완료로 기록하지 않음"""
+    created = []
+    monkeypatch.setattr(gcal_sync, "list_events_for_date", lambda target_date: None)
+    monkeypatch.setattr(gcal_sync, "create_mirrored_event",
+                        lambda *args: created.append(args) or "L1")
+    monkeypatch.setattr(gcal_sync, "get_primary_calendar_id", lambda: "cal")
+    monkeypatch.setattr(gcal_sync, "_get_token", lambda: "tok")
+
+    result = {"deleted": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": []}
+    gcal_sync._reconcile_mirrors(index, datetime(2026, 10, 20), [_event("g1", 10)],
+                                 result, dry_run=False)
+
+    assert created == []
+    assert result["errors"] == ["Lark 일정 조회 실패"]
+    assert not index.is_date_indexed("2026-10-20")
+
+
+def test_empty_lark_listing_creates_mirrors(index, monkeypatch):
+    monkeypatch.setattr(gcal_sync, "list_events_for_date", lambda target_date: [])
+    monkeypatch.setattr(gcal_sync, "create_mirrored_event", lambda *args: "L1")
+    monkeypatch.setattr(gcal_sync, "get_primary_calendar_id", lambda: "cal")
+    monkeypatch.setattr(gcal_sync, "_get_token", lambda: "tok")
+
+    result = {"deleted": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": []}
+    gcal_sync._reconcile_mirrors(index, datetime(2026, 10, 20), [_event("g1", 10)],
+                                 result, dry_run=False)
+
+    assert result["created"] == 1
+    assert index.is_date_indexed("2026-10-20")
+    assert index.get("g1", "2026-10-20")["lark_event_id"] == "L1"
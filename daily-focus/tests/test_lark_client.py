@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import pytest
+
+import lark_client
+from lark_client import AdaptiveConcurrency
+
+
+@pytest.fixture
+def concurrency(monkeypatch):
+    concurrency = AdaptiveConcurrency(8)
+    concurrency.limit = 2
+    monkeypatch.setattr(lark_client, "_concurrency", concurrency)
+    return concurrency
+
+
+def test_success_grows_limit(concurrency):
+    for _ in range(2):
+        assert not lark_client._should_retry(True, 200, {"code": 0})
+    assert concurrency.limit == 3
+
+
+@pytest.mark.parametrize("status_code", [500, 503, None])
+def test_server_errors_shrink_limit(concurrency, status_code):
+    concurrency.limit = 4
+    for _ in range(8):
+        concurrency._last_decrease = 0.0
+        lark_client._should_retry(True, status_code, {"code": -1})
+    assert concurrency.limit == 1
+
+
+def test_server_errors_retry_only_idempotent(concurrency):
+    assert lark_client._should_retry(True, 502, {"code": -1})
+    assert not lark_client._should_retry(False, 502, {"code": -1})
+
+
+def test_business_errors_leave_limit_alone(concurrency):
+    for _ in range(4):
+        lark_client._should_retry(True, 200, {"code": 191000})
+        lark_client._should_retry(True, 400, {"code": 99992402})
+    assert concurrency.limit == 2
+
+
+def test_rate_limited_halves_limit(concurrency):
+    concurrency.limit = 8
+    assert lark_client._should_retry(False, 429, {"code": 99991400})
+    assert concurrency.limit == 4
+
+
+def test_async_requests_share_the_limit(concurrency):
+    concurrency.limit = 1
+    concurrency.acquire()  # 동기 요청 하나가 자리를 차지한 상태
+
+    async def scenario():
+        waiting = asyncio.ensure_future(concurrency.async_acquire())
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        threading.Thread(target=concurrency.release).start()
+        await asyncio.wait_for(waiting, 2)
+        assert concurrency._in_flight == 1
+        concurrency.release()
+
+    asyncio.run(scenario())
+
+
+def test_async_waiters_do_not_use_executor_threads(concurrency):
+    concurrency.limit = 1
+    concurrency.acquire()
+
+    async def scenario():
+        threads = threading.active_count()
+        waiters = [asyncio.ensure_future(concurrency.async_acquire()) for _ in range(100)]
+        await asyncio.sleep(0.05)
+        # 대기 중에도 기본 executor가 비어 있어 다른 to_thread 호출이 바로 실행됨
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "ok"), 1) == "ok"
+        assert threading.active_count() <= threads + 1
+
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert not concurrency._async_waiters
+
+    asyncio.run(scenario())
+    concurrency.release()
+
+
+def test_cancelled_waiter_passes_its_turn_on(concurrency):
+    concurrency.limit = 1
+    concurrency.acquire()
+
+    async def scenario():
+        first = asyncio.ensure_future(concurrency.async_acquire())
+        second = asyncio.ensure_future(concurrency.async_acquire())
+        await asyncio.sleep(0.01)
+        concurrency.release()  # first를 깨움
+        first.cancel()         # 깨어나기 전에 취소
+        await asyncio.wait_for(second, 2)
+        assert concurrency._in_flight == 1
+        concurrency.release()
+
+    asyncio.run(scenario())
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+import requests
+
+from lark_event_transport import CallbackReceiver, WebSocketReceiver, build_test_event
+
+
+def test_callback_refuses_to_start_without_token():
+    receiver = CallbackReceiver(lambda item: None, port=0, verification_token=None)
+
+    assert receiver.start() is False
+    assert not receiver.is_alive()
+
+
+def test_callback_listens_on_loopback_and_checks_token():
+    received = []
+    receiver = CallbackReceiver(received.append, port=0, verification_token="secret")
+    assert receiver.start()
+    try:
+        assert receiver.url.startswith("http://127.0.0.1:")
+
+        body = build_test_event("안녕", "oc_1")
+        body["header"]["token"] = "wrong"
+        assert requests.post(receiver.url, json=body, timeout=5).status_code == 403
+
+        body = build_test_event("안녕", "oc_1")
+        body["header"]["token"] = "secret"
+        assert requests.post(receiver.url, json=body, timeout=5).status_code == 200
+    finally:
+        receiver.stop()
+
+    assert [item[1] for item in received] == ["oc_1"]
+
+
+def test_handle_rejects_wrong_or_missing_token():
+    receiver = CallbackReceiver(lambda item: None, verification_token="secret")
+    challenge = {"type": "url_verification", "challenge": "abc"}
+
+    assert receiver.handle(dict(challenge, token="secret")) == (200, {"challenge": "abc"})
+    assert receiver.handle(dict(challenge, token="secreT"))[0] == 403
+    assert receiver.handle(dict(challenge, token=123))[0] == 403
+    assert receiver.handle(challenge)[0] == 403
+
+
+def test_ws_receiver_starts_from_inside_a_running_loop(monkeypatch):
+    """ChatMultiplexer처럼 실행 중인 루프 안에서 처음 시작해도 연결까지 진행"""
+    lark = pytest.importorskip("lark_oapi")
+    connected = threading.Event()
+
+    async def fake_connect(self):
+        connected.set()
+
+    monkeypatch.setattr(lark.ws.client.Client, "_connect", fake_connect)
+
+    async def scenario():
+        # 실행 중인 루프 안에서 처음 import된 것과 같은 상태
+        monkeypatch.setattr(lark.ws.client, "loop", asyncio.get_running_loop())
+        receiver = WebSocketReceiver(lambda item: None, app_id="cli_test", app_secret="secret")
+        assert receiver.start()
+        return receiver
+
+    receiver = asyncio.run(scenario())
+
+    assert connected.wait(5)
+    assert receiver.is_alive()
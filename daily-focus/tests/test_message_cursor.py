@@ -0,0 +1,60 @@
+import pytest
+
+import lark_event_listener
+from lark_event_listener import MessageCursor
+
+NOW = 1_792_400_000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOW]
+    monkeypatch.setattr(lark_event_listener.time, "time", lambda: now[0])
+    return now
+
+
+def _msg(message_id, create_ms):
+    return {"message_id": message_id, "create_time": str(create_ms)}
+
+
+def test_ignores_messages_before_baseline(clock):
+    cursor = MessageCursor()
+
+    new = cursor.advance([_msg("old", NOW * 1000 - 1), _msg("a", NOW * 1000 + 10)])
+
+    assert [m["message_id"] for m in new] == ["a"]
+
+
+def test_same_second_messages_are_returned_once(clock):
+    cursor = MessageCursor()
+    first = [_msg("a", NOW * 1000 + 100)]
+    assert cursor.advance(first) == first
+
+    # start_time은 초 단위라 같은 초의 메시지가 다시 내려옴
+    assert cursor.start_time == str(NOW)
+    second = cursor.advance(first + [_msg("b", NOW * 1000 + 900)])
+
+    assert [m["message_id"] for m in second] == ["b"]
+
+
+def test_next_second_moves_cursor(clock):
+    cursor = MessageCursor()
+    cursor.advance([_msg("a", NOW * 1000 + 100)])
+
+    new = cursor.advance([_msg("a", NOW * 1000 + 100), _msg("c", (NOW + 1) * 1000)])
+
+    assert [m["message_id"] for m in new] == ["c"]
+    assert cursor.start_time == str(NOW + 1)
+
+
+def test_reset_in_same_second_keeps_seen_ids(clock):
+    cursor = MessageCursor()
+    cursor.advance([_msg("a", NOW * 1000 + 100)])
+
+    cursor.reset()
+    assert cursor.advance([_msg("a", NOW * 1000 + 100)]) == []
+
+    clock[0] = NOW + 5
+    cursor.reset()
+    assert cursor.advance([_msg("a", NOW * 1000 + 100)]) == []
+    assert cursor.start_time == str(NOW + 5)
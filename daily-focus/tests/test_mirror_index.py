@@ -0,0 +1,105 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from mirror_index import MirrorIndex, SCHEMA_VERSION
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = MirrorIndex(tmp_path / "mirror_index.db")
+    yield index
+    index.close()
+
+
+def test_same_event_on_two_dates_keeps_both_rows(index):
+    index.upsert("g1", "L2", "h2", "2026-10-21", "🔄 회의")
+    index.upsert("g1", "L3", "h3", "2026-10-20", "🔄 회의")
+
+    assert index.get("g1", "2026-10-21")["lark_event_id"] == "L2"
+    assert index.get("g1", "2026-10-20")["lark_event_id"] == "L3"
+
+
+def test_remove_only_touches_its_date(index):
+    index.upsert("g1", "L2", "h2", "2026-10-21")
+    index.upsert("g1", "L3", "h3", "2026-10-20")
+
+    index.remove("g1", "2026-10-21")
+
+    assert index.get("g1", "2026-10-21") is None
+    assert index.get("g1", "2026-10-20")["lark_event_id"] == "L3"
+
+
+def test_migrates_v1_index(tmp_path):
+    path = tmp_path / "mirror_index.db"
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE mirrors (
+            google_event_id TEXT PRIMARY KEY, lark_event_id TEXT NOT NULL,
+            content_hash TEXT NOT NULL, event_date TEXT NOT NULL,
+            summary TEXT, updated_at TEXT NOT NULL
+        );
+        INSERT INTO mirrors VALUES ('g1', 'L1', 'h1', '2026-10-21', 's', '2026-10-01T00:00:00');
+    """)
+    conn.commit()
+    conn.close()
+
+    index = MirrorIndex(path)
+    try:
+        assert index.get("g1", "2026-10-21")["lark_event_id"] == "L1"
+        index.upsert("g1", "L3", "h3", "2026-10-20")
+        assert len(index.for_date("2026-10-20")) == 1
+        assert len(index.for_date("2026-10-21")) == 1
+    finally:
+        index.close()
+
+    conn = sqlite3.connect(str(path))
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    conn.close()
+
+
+def test_event_moved_to_earlier_day_leaves_one_mirror(index, monkeypatch):
+    """10-21 → 10-20으로 옮겨진 이벤트: 날짜 순서대로 동기화해도 옛 미러가 남지 않음"""
+    gcal_sync = pytest.importorskip("gcal_sync")
+
+    created, deleted = [], []
+
+    def fake_create(calendar_id, token, summary, description, start_dt, end_dt):
+        created.append(summary)
+        return f"L{len(created) + 2}"
+
+    def fake_delete(event_id):
+        deleted.append(event_id)
+        return True
+
+    monkeypatch.setattr(gcal_sync, "create_mirrored_event", fake_create)
+    monkeypatch.setattr(gcal_sync, "delete_event", fake_delete)
+    monkeypatch.setattr(gcal_sync, "get_primary_calendar_id", lambda: "cal")
+    monkeypatch.setattr(gcal_sync, "_get_token", lambda: "tok")
+
+    # 지난 동기화: 10-21에 미러 L2
+    moved = {
+        "id": "g1", "summary": "회의", "html_link": "https://calendar/g1",
+        "start_dt": datetime(2026, 10, 21, 10), "end_dt": datetime(2026, 10, 21, 11),
+        "is_all_day": False,
+    }
+    old_hash = gcal_sync._payload_hash(gcal_sync._event_payload(moved))
+    index.upsert("g1", "L2", old_hash, "2026-10-21", "🔄 회의")
+    index.mark_date_indexed("2026-10-20")
+    index.mark_date_indexed("2026-10-21")
+
+    # 이번 동기화: 같은 이벤트가 10-20으로 이동
+    moved = dict(moved, start_dt=datetime(2026, 10, 20, 10), end_dt=datetime(2026, 10, 20, 11))
+    events_by_date = {"2026-10-20": [moved], "2026-10-21": []}
+
+    for day in (datetime(2026, 10, 20), datetime(2026, 10, 21)):
+        result = {"deleted": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": []}
+        gcal_sync._reconcile_mirrors(index, day, events_by_date[day.strftime("%Y-%m-%d")],
+                                     result, dry_run=False)
+        assert result["errors"] == []
+
+    assert created == ["회의"]
+    assert deleted == ["L2"]
+    assert [row["lark_event_id"] for row in index.for_date("2026-10-20")] == ["L3"]
+    assert index.for_date("2026-10-21") == []
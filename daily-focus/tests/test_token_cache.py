@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from token_cache import TokenHolder
+
+
+def _holder(results):
+    calls = []
+
+    def fetch(force):
+        calls.append(force)
+        return results.pop(0)
+
+    return TokenHolder("test", fetch), calls
+
+
+def test_valid_token_is_served_from_memory():
+    holder, calls = _holder([("t1", datetime.now() + timedelta(hours=2))])
+    try:
+        assert holder.get() == "t1"
+        assert holder.get() == "t1"
+        assert calls == [False]
+    finally:
+        holder._cancel_timer()
+
+
+def test_failed_fetch_clears_token_without_breaking_readers():
+    holder, calls = _holder([None, ("t2", datetime.now() + timedelta(hours=2))])
+    try:
+        assert holder.get() is None
+        assert holder._current is None
+        assert holder.get() == "t2"
+    finally:
+        holder._cancel_timer()
+
+
+def test_missing_expiry_is_not_valid():
+    assert TokenHolder._valid_token(("t", None)) is None
+    assert TokenHolder._valid_token(("t", datetime.now() - timedelta(seconds=1))) is None
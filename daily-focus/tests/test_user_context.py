@@ -0,0 +1,78 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+import lark_calendar
+from user_context import PerUser, UserContext, getenv, propagate, state_path, use
+
+
+def test_missing_user_token_does_not_fall_back_to_process_env(monkeypatch):
+    monkeypatch.setenv("LARK_USER_TOKEN", "process-token")
+    monkeypatch.setenv("LARK_APP_ID", "cli_app")
+    monkeypatch.setattr(lark_calendar, "get_valid_token", lambda: None)
+    user = UserContext("bob", {"LARK_CHAT_ID": "oc_bob", "LARK_USER_TOKEN": ""})
+
+    with use(user):
+        assert getenv("LARK_USER_TOKEN") is None
+        assert lark_calendar._get_token() is None
+        assert getenv("LARK_APP_ID") == "cli_app"
+
+    assert getenv("LARK_USER_TOKEN") == "process-token"
+
+
+def test_state_path_is_per_user(tmp_path):
+    alice = UserContext("alice", state_dir=tmp_path / "alice")
+    path = Path("/somewhere/focus_blocks.json")
+
+    with use(alice):
+        assert state_path(path) == tmp_path / "alice" / "focus_blocks.json"
+    assert state_path(path) == path
+
+
+def test_per_user_values_are_isolated():
+    counter = PerUser(dict)
+    alice, bob = UserContext("alice"), UserContext("bob")
+
+    with use(alice):
+        counter.get()["n"] = 1
+    with use(bob):
+        assert counter.get() == {}
+    with use(alice):
+        assert counter.get() == {"n": 1}
+    assert counter.get() == {}
+
+
+def test_propagate_carries_user_into_thread():
+    seen = []
+    with use(UserContext("alice", {"LARK_CHAT_ID": "oc_alice"})):
+        thread = threading.Thread(target=propagate(lambda: seen.append(getenv("LARK_CHAT_ID"))))
+    thread.start()
+    thread.join()
+
+    assert seen == ["oc_alice"]
+
+
+@pytest.fixture
+def multi_user_flow():
+    # nightly_flow → scope_analyzer는 AI 클라이언트가 없으면 import 시 종료한다
+    try:
+        import multi_user_flow
+    except (ImportError, SystemExit):
+        pytest.skip("nightly_flow 의존성(AI 클라이언트/API 키)이 없음")
+    return multi_user_flow
+
+
+def test_roster_rejects_entries_without_credentials(multi_user_flow, tmp_path, monkeypatch):
+    monkeypatch.setenv("CAROL_REFRESH", "r-carol")
+    monkeypatch.delenv("DAVE_REFRESH", raising=False)
+    roster = tmp_path / "users.json"
+    roster.write_text(json.dumps({"users": [
+        {"id": "alice", "chat_id": "oc_a", "open_id": "ou_a", "refresh_token": "r-alice"},
+        {"id": "bob", "chat_id": "oc_b", "refresh_token": "r-bob"},
+        {"id": "carol", "chat_id": "oc_c", "open_id": "ou_c", "refresh_token_env": "CAROL_REFRESH"},
+        {"id": "dave", "chat_id": "oc_d", "open_id": "ou_d", "refresh_token_env": "DAVE_REFRESH"},
+    ]}))
+
+    assert [entry["id"] for entry in multi_user_flow.load_roster(roster)] == ["alice", "carol"]